@@ -0,0 +1,62 @@
+"""
+Benchmark of BatchGames (batch.py) against playing the same number
+of random games one at a time, on the 11x11 board of bot.cmd and
+the classic 4-player board (20x20).
+
+Reports the time taken by 1000 games played as one batch, as 1000
+sequential Blokus games (bench_playouts.random_playout) and as 1000
+playout.playout calls.
+
+Run from the repository root:
+
+    python benchmarks/bench_batch.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from blokus import Blokus
+from bot import BOARDS
+from playout import playout
+from vectorized import HAVE_NUMPY
+from bench_playouts import random_playout
+
+GAMES = 1000
+
+
+def main() -> None:
+    if not HAVE_NUMPY:
+        print("NumPy is not installed")
+        return
+    from batch import BatchGames
+
+    print("layout    | batch s | Blokus s | playout s | speedup")
+    for name in ["bot", "classic-4"]:
+        num_players, size, starts = BOARDS[name]
+        start = time.perf_counter()
+        BatchGames(GAMES, num_players, size, starts, seed=0).play_out()
+        batch = time.perf_counter() - start
+
+        rng = random.Random(0)
+        start = time.perf_counter()
+        for _ in range(GAMES):
+            random_playout(Blokus(num_players, size, starts), rng)
+        sequential = time.perf_counter() - start
+
+        bk = Blokus(num_players, size, starts)
+        start = time.perf_counter()
+        for _ in range(GAMES):
+            playout(bk, rng)
+        fast = time.perf_counter() - start
+
+        print(
+            f"{name:9} | {batch:7.2f} | {sequential:8.2f} | {fast:9.2f}"
+            f" | {sequential / batch:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
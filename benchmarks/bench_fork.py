@@ -0,0 +1,59 @@
+"""
+Benchmark of Blokus.fork against copy.deepcopy.
+
+Plays a seeded random classic 4-player game (20x20) for 40 turns,
+then reports the time and memory taken to branch the position,
+and the time taken by the first move made in the branch (which
+is when a fork copies the containers it changes).
+
+Run from the repository root:
+
+    python benchmarks/bench_fork.py
+"""
+import copy
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from blokus import Blokus
+
+
+def main() -> None:
+    rng = random.Random(0)
+    bk = Blokus(4, 20, {(0, 0), (19, 19), (0, 19), (19, 0)})
+    for _ in range(40):
+        moves = sorted(bk.legal_moves(), key=lambda move: move.encode())
+        if moves:
+            bk.maybe_place(rng.choice(moves))
+        else:
+            bk.retire()
+    move = min(bk.legal_moves(), key=lambda move: move.encode())
+
+    runs = 1000
+    print("method   | branch us | bytes | first move us")
+    for name, branch in [("deepcopy", copy.deepcopy), ("fork", Blokus.fork)]:
+        start = time.perf_counter()
+        for _ in range(runs):
+            branch(bk)
+        branch_us = (time.perf_counter() - start) * 1e6 / runs
+
+        tracemalloc.start()
+        game = branch(bk)
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        games = [branch(bk) for _ in range(runs)]
+        start = time.perf_counter()
+        for game in games:
+            game.maybe_place(move)
+        move_us = (time.perf_counter() - start) * 1e6 / runs
+
+        print(f"{name:8} | {branch_us:9.1f} | {size:5} | {move_us:13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark comparing the corner-frontier move generator with an
+exhaustive scan of every anchor on the board, and with the NumPy
+generator (when NumPy is installed).
+
+Plays a seeded random classic 4-player game (20x20) and, every
+few turns, reports how many candidate placements each generator
+tries and how long each takes to find all legal moves.
+
+Run from the repository root:
+
+    python benchmarks/bench_movegen.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from blokus import Blokus
+from vectorized import HAVE_NUMPY
+
+
+def legal_count(bk: Blokus, candidates: list) -> int:
+    player = bk.curr_player
+    return sum(1 for c in candidates if bk._legal_mask(player, c[3]))
+
+
+def main() -> None:
+    rng = random.Random(0)
+    bk = Blokus(4, 20, {(0, 0), (19, 19), (0, 19), (19, 0)})
+    print(
+        " turn | scan cands | front cands | ratio | scan ms | front ms"
+        " | numpy ms | moves"
+    )
+    turn = 0
+    while not bk.game_over and turn <= 48:
+        player = bk.curr_player
+        if turn % 8 == 0:
+            start = time.perf_counter()
+            scan = list(bk._scan_candidates(player))
+            scan_moves = legal_count(bk, scan)
+            scan_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            frontier = list(bk._frontier_candidates(player))
+            frontier_moves = legal_count(bk, frontier)
+            frontier_ms = (time.perf_counter() - start) * 1000
+
+            numpy_ms = "     -"
+            if HAVE_NUMPY:
+                start = time.perf_counter()
+                numpy_moves = len(bk._vectorized_moves(player))
+                numpy_ms = f"{(time.perf_counter() - start) * 1000:6.1f}"
+                assert numpy_moves == frontier_moves
+
+            assert scan_moves == frontier_moves
+            ratio = len(scan) / max(len(frontier), 1)
+            print(
+                f" {turn:4} | {len(scan):10} | {len(frontier):11} | {ratio:5.1f}"
+                f" | {scan_ms:7.1f} | {frontier_ms:8.1f} | {numpy_ms:>8}"
+                f" | {frontier_moves}"
+            )
+
+        moves = list(bk.available_moves())
+        if moves:
+            bk.maybe_place(rng.choice(moves))
+        else:
+            bk.retire()
+        turn += 1
+
+
+if __name__ == "__main__":
+    main()
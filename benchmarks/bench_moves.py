@@ -0,0 +1,74 @@
+"""
+Benchmark of the memory and time needed to generate the full move
+set as Piece objects (available_moves) versus Move values
+(legal_moves), and the time needed to just count them
+(count_available_moves).
+
+Run from the repository root:
+
+    python benchmarks/bench_moves.py
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from blokus import Blokus
+from vectorized import HAVE_NUMPY
+
+
+def measure(generate) -> tuple[int, float, float]:
+    """
+    Returns the number of moves generated, the bytes allocated per
+    move while they are all alive, and the time taken in ms.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    moves = generate()
+    elapsed = (time.perf_counter() - start) * 1000
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(moves), size / max(len(moves), 1), elapsed
+
+
+def main() -> None:
+    rng = random.Random(3)
+    bk = Blokus(4, 20, {(0, 0), (19, 19), (0, 19), (19, 0)})
+    for _ in range(16):
+        bk.maybe_place(rng.choice(sorted(bk.legal_moves(), key=lambda m: m.encode())))
+
+    print("generator        | moves | bytes/move |    ms")
+    for name, generate in [
+        ("available_moves", bk.available_moves),
+        ("legal_moves", bk.legal_moves),
+    ]:
+        count, per_move, elapsed = measure(generate)
+        print(f"{name:16} | {count:5} | {per_move:10.0f} | {elapsed:5.1f}")
+
+    print()
+    print("counting                       |    ms | speedup")
+    runs = 20
+    for vectorized in [False, True] if HAVE_NUMPY else [False]:
+        bk.vectorized = vectorized
+        mode = "numpy" if vectorized else "bits"
+        # Fill the per-cell placement tables before timing
+        expected = len(bk.available_moves())
+        bk.count_available_moves()
+        start = time.perf_counter()
+        for _ in range(runs):
+            assert len(bk.available_moves()) == expected
+        baseline = (time.perf_counter() - start) * 1000 / runs
+        name = f"len(available_moves()) ({mode})"
+        print(f"{name:30} | {baseline:5.2f} |    1.0x")
+        start = time.perf_counter()
+        for _ in range(runs):
+            assert bk.count_available_moves() == expected
+        elapsed = (time.perf_counter() - start) * 1000 / runs
+        name = f"count_available_moves ({mode})"
+        print(f"{name:30} | {elapsed:5.2f} | {baseline / elapsed:6.1f}x")
+
+if __name__ == "__main__":
+    main()
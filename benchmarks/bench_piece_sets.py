@@ -0,0 +1,74 @@
+"""
+Measurement of how many duplicate placements value-based Piece
+equality removes from sets of moves.
+
+Plays seeded random games on the standard boards and, every few
+turns, builds every legal Piece for the current player the way
+the original available_moves did: each shape at each anchor, in
+each combination of flips and rotations. It reports how many
+pieces that makes (the size of the set when pieces compared by
+identity) against the size of the set now that equal placements
+collapse.
+
+Run from the repository root:
+
+    python benchmarks/bench_piece_sets.py
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from piece import Piece
+from blokus import Blokus
+
+BOARDS = {
+    "duo": (2, 14, {(4, 4), (9, 9)}),
+    "classic-4": (4, 20, {(0, 0), (0, 19), (19, 0), (19, 19)}),
+}
+
+
+def transformed_pieces(bk: Blokus) -> list[Piece]:
+    """
+    Returns every legal piece of the current player, in every
+    flip and rotation at every anchor, including duplicates.
+    """
+    pieces = []
+    for kind in bk.remaining_shapes(bk.curr_player):
+        for face_up in [True, False]:
+            for rotation in range(4):
+                for r in range(bk.size):
+                    for c in range(bk.size):
+                        piece = Piece(bk.shapes[kind], face_up, rotation)
+                        piece.set_anchor((r, c))
+                        if bk.legal_to_place(piece):
+                            pieces.append(piece)
+    return pieces
+
+
+def main() -> None:
+    for name, (players, size, starts) in BOARDS.items():
+        rng = random.Random(0)
+        bk = Blokus(players, size, starts)
+        print(f"{name}")
+        print(" turn | pieces | distinct | ratio")
+        turn = 0
+        while not bk.game_over and turn <= 24:
+            if turn % 6 == 0:
+                pieces = transformed_pieces(bk)
+                distinct = len(set(pieces))
+                assert distinct == bk.count_available_moves()
+                ratio = len(pieces) / max(distinct, 1)
+                print(f" {turn:4} | {len(pieces):6} | {distinct:8} | {ratio:5.2f}")
+            moves = sorted(bk.legal_moves(), key=lambda move: move.encode())
+            if moves:
+                bk.maybe_place(rng.choice(moves))
+            else:
+                bk.retire()
+            turn += 1
+        print()
+
+
+if __name__ == "__main__":
+    main()
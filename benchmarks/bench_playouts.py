@@ -0,0 +1,77 @@
+"""
+Benchmark of random playouts: playout.playout against
+random_playout (which uses the public Blokus methods), from
+the start of a duo game (2 players, 14x14) and of classic games
+(20x20) with 2 and 4 players.
+
+Reports the playouts per second of each, and the average number
+of turns per playout.
+
+Run from the repository root:
+
+    python benchmarks/bench_playouts.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from blokus import Blokus
+from bot import BOARDS
+from playout import playout
+
+LAYOUTS = ["bot", "duo", "classic-2", "classic-4"]
+
+# Seconds spent measuring each routine on each layout
+SECONDS = 3.0
+
+
+def random_playout(game: Blokus, rng: random.Random) -> None:
+    """
+    Play the game to the end with uniformly random legal moves,
+    retiring players who have none, using only the public Blokus
+    methods (the game is modified).
+    """
+    while not game.game_over:
+        moves = game.legal_move_list()
+        if moves:
+            game.maybe_place(rng.choice(moves))
+        else:
+            game.retire()
+
+
+def rate(run) -> float:
+    """
+    Returns the number of times run can be called per second.
+    """
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < SECONDS:
+        run()
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def main() -> None:
+    print("layout    | turns | playout/s | random_playout/s | speedup")
+    for name in LAYOUTS:
+        num_players, size, starts = BOARDS[name]
+        bk = Blokus(num_players, size, starts)
+        rng = random.Random(0)
+        record: list = []
+        for _ in range(20):
+            playout(bk, rng, record)
+        turns = len(record) / 20
+
+        fast = rate(lambda: playout(bk, rng))
+        slow = rate(lambda: random_playout(bk.fork(), rng))
+        print(
+            f"{name:9} | {turns:5.1f} | {fast:9.1f} | {slow:16.1f}"
+            f" | {fast / slow:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Benchmark for the shared shape registry.
+
+Compares the cost of one access to Blokus.shapes against
+re-parsing all 21 string definitions (what the property used
+to do on every access), and against reading the registry
+directly, as the engine's hot paths now do.
+
+Run from the repository root:
+
+    python benchmarks/bench_shapes.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import shape_definitions
+from piece import Shape
+from blokus import Blokus
+from orientations import SHAPES
+
+NUMBER = 2000
+
+
+def parse_all() -> dict:
+    return {
+        kind: Shape.from_string(kind, string)
+        for kind, string in shape_definitions.definitions.items()
+    }
+
+
+def main() -> None:
+    bk = Blokus(2, 14, {(4, 4), (9, 9)})
+    timings = {
+        "re-parse all definitions": timeit.timeit(parse_all, number=NUMBER),
+        "Blokus.shapes (copies)": timeit.timeit(lambda: bk.shapes, number=NUMBER),
+        "SHAPES[kind] lookup x21": timeit.timeit(
+            lambda: [SHAPES[kind] for kind in SHAPES], number=NUMBER
+        ),
+    }
+    baseline = timings["re-parse all definitions"]
+    for name, total in timings.items():
+        per_call = total / NUMBER * 1e6
+        print(f"{name:28} | {per_call:8.2f} us/call | {baseline / total:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
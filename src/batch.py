@@ -0,0 +1,364 @@
+"""
+Many random Blokus games played at once with NumPy.
+
+BatchGames keeps K independent games (all with the same players,
+board size and start positions) as arrays: the boards as one
+(K x size x size) array of player numbers (0 for an empty cell),
+and the players' remaining shapes, squares left and turns as
+arrays indexed by game and player. Each step plays one turn in
+every unfinished game at the same time:
+
+  - The cells each player to move may not cover (occupied, or
+    sharing an edge with one of their own pieces) and the cells
+    they may attach to (touching a corner of one of their own
+    pieces, or a free start position before their first move)
+    are found with shifted copies of the boards.
+  - The legality of every placement of every orientation in every
+    game is then one matrix product, as in
+    vectorized.legal_placements: a placement is legal if it covers
+    no blocked cell and at least one attach cell.
+  - Each game plays a uniformly random legal move (all
+    orientations), or retires the player if there is none.
+
+The rules are those of Blokus, so the games are the same as those
+played by playout.playout, one at a time.
+
+NumPy is required; if it is not installed (see vectorized.py),
+creating a BatchGames raises ImportError.
+"""
+from functools import lru_cache
+from typing import Any, Optional
+
+from blokus import Blokus
+from move import Move
+from piece import Point
+from shape_definitions import ShapeKind
+from orientations import ORIENTATIONS, SHAPE_SIZES
+from vectorized import ATTACH, FOOTPRINT, HAVE_NUMPY, BoolArray
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+# np.ndarray of integers when NumPy is installed
+IntArray = Any
+
+# The most games whose legal moves are worked out in one matrix
+# product, to bound the memory used on large boards
+CHUNK = 256
+
+KINDS: list[ShapeKind] = list(ORIENTATIONS)
+
+
+class _Tables:
+    """
+    One row per orientation of every shape, in ORIENTATIONS order:
+    its shape number (position in KINDS), orientation index, the
+    offsets of its squares from the top-left of its box (padded to
+    FOOTPRINT squares by repeating the first one), min_row and
+    min_col, and its flattened FOOTPRINT x FOOTPRINT footprint.
+    """
+
+    kinds: IntArray
+    indexes: list[int]
+    squares: IntArray
+    min_rows: IntArray
+    min_cols: IntArray
+    footprints: IntArray
+    sizes: IntArray
+
+    def __init__(self) -> None:
+        kinds, indexes, squares, min_rows, min_cols, footprints = [], [], [], [], [], []
+        for number, (kind, orientations) in enumerate(ORIENTATIONS.items()):
+            for index, o in enumerate(orientations):
+                kinds.append(number)
+                indexes.append(index)
+                boxed = [(r - o.min_row, c - o.min_col) for r, c in o.squares]
+                boxed += boxed[:1] * (FOOTPRINT - len(boxed))
+                squares.append(boxed)
+                min_rows.append(o.min_row)
+                min_cols.append(o.min_col)
+                footprint = np.zeros(FOOTPRINT * FOOTPRINT, dtype=np.float32)
+                for r, c in boxed:
+                    footprint[r * FOOTPRINT + c] = 1
+                footprints.append(footprint)
+        self.kinds = np.array(kinds)
+        self.indexes = indexes
+        self.squares = np.array(squares)
+        self.min_rows = np.array(min_rows)
+        self.min_cols = np.array(min_cols)
+        self.footprints = np.stack(footprints)
+        self.sizes = np.array([SHAPE_SIZES[kind] for kind in KINDS])
+
+
+@lru_cache(maxsize=None)
+def _tables() -> _Tables:
+    """
+    Returns the orientation tables, built on first use.
+    """
+    return _Tables()
+
+
+class BatchGames:
+    """
+    K games of Blokus with the same players, board size and start
+    positions, played together with uniformly random moves.
+
+    Players are numbered from 1, so the player axis of the arrays
+    has num_players + 1 entries, of which entry 0 is unused.
+    """
+
+    num_games: int
+    num_players: int
+    size: int
+    boards: IntArray
+    curr_player: IntArray
+    active: BoolArray
+    shapes_left: BoolArray
+    squares_left: IntArray
+    last_one: BoolArray
+    history: Optional[list[tuple[IntArray, IntArray, IntArray, IntArray]]]
+    _start: BoolArray
+    _rng: Any
+
+    def __init__(
+        self,
+        num_games: int,
+        num_players: int,
+        size: int,
+        start_positions: set[Point],
+        seed: Optional[int] = None,
+        record: bool = False,
+    ) -> None:
+        """
+        Constructor
+        Inputs:
+            num_games [int]: the number of games (K)
+            num_players, size, start_positions: as for Blokus
+            seed [Optional[int]]: the seed of the random moves
+            record [bool]: whether to keep the moves played, for
+                moves()
+
+        Raises ImportError if NumPy is not installed, and
+        ValueError for the same arguments as Blokus, or if
+        num_games is less than 1.
+        """
+        if not HAVE_NUMPY:
+            raise ImportError("BatchGames needs NumPy")
+        if num_games < 1:
+            raise ValueError("Need at least one game.")
+        # Checks the other arguments
+        Blokus(num_players, size, start_positions)
+
+        self.num_games = num_games
+        self.num_players = num_players
+        self.size = size
+        players = num_players + 1
+        self.boards = np.zeros((num_games, size, size), dtype=np.int8)
+        self.curr_player = np.ones(num_games, dtype=np.int64)
+        self.active = np.ones((num_games, players), dtype=bool)
+        self.active[:, 0] = False
+        self.shapes_left = np.ones((num_games, players, len(KINDS)), dtype=bool)
+        self.squares_left = np.full(
+            (num_games, players), int(_tables().sizes.sum()), dtype=np.int64
+        )
+        self.last_one = np.zeros((num_games, players), dtype=bool)
+        self.history = [] if record else None
+        self._start = np.zeros((size, size), dtype=bool)
+        # Like Blokus, ignore start positions just off the board
+        for r, c in start_positions:
+            if r < size and c < size:
+                self._start[r, c] = True
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def done(self) -> BoolArray:
+        """
+        Returns the (K,) array of which games are over.
+        """
+        return ~self.active.any(axis=1)
+
+    def _cells(self, games: IntArray) -> tuple[BoolArray, BoolArray]:
+        """
+        Returns the (k x size x size) arrays of the cells that the
+        player to move in each of the given games may not cover,
+        and of the cells they may attach to.
+        """
+        boards = self.boards[games]
+        players = self.curr_player[games]
+        occupied = boards != 0
+        own = np.pad(boards == players[:, None, None], ((0, 0), (1, 1), (1, 1)))
+        inner = own[:, 1:-1, 1:-1]
+        edges = own[:, :-2, 1:-1] | own[:, 2:, 1:-1] | own[:, 1:-1, :-2] | own[:, 1:-1, 2:]
+        corners = own[:, :-2, :-2] | own[:, :-2, 2:] | own[:, 2:, :-2] | own[:, 2:, 2:]
+        blocked = occupied | edges
+        attach = corners & ~blocked
+        first = ~inner.any(axis=(1, 2))
+        attach[first] = self._start & ~occupied[first]
+        return blocked, attach
+
+    def _legal(self, games: IntArray) -> BoolArray:
+        """
+        Returns the (k x size*size x orientations) array of whether
+        each placement of each orientation (by the top-left cell of
+        its box) is legal for the player to move in each of the
+        games.
+        """
+        tables = _tables()
+        size = self.size
+        blocked, attach = self._cells(games)
+        k = len(games)
+        # Cells off the board count as blocked
+        padded = np.ones(
+            (k, size + FOOTPRINT - 1, size + FOOTPRINT - 1), dtype=np.float32
+        )
+        padded[:, :size, :size] = blocked + attach * np.float32(ATTACH)
+        # windows[g, i, j, dr, dc] is padded[g, i + dr, j + dc]
+        windows = np.lib.stride_tricks.as_strided(
+            padded,
+            (k, size, size, FOOTPRINT, FOOTPRINT),
+            padded.strides + padded.strides[1:],
+        ).reshape(k * size * size, FOOTPRINT * FOOTPRINT)
+        # Each entry is the number of blocked cells a placement covers
+        # plus ATTACH times the number of attach cells it covers
+        covered = (windows @ tables.footprints.T).reshape(k, size * size, -1)
+        legal = (covered > 0) & (covered < 1)
+        left = self.shapes_left[games, self.curr_player[games]][:, tables.kinds]
+        legal &= left[:, None, :]
+        return legal
+
+    def legal_masks(self) -> BoolArray:
+        """
+        Returns the (K x orientations x size x size) array whose
+        entry [g, o, i, j] is True if the player to move in game g
+        may place orientation o (numbered in ORIENTATIONS order)
+        with the top-left of its box at row i and column j. Every
+        entry is False for finished games.
+        """
+        size = self.size
+        masks = np.zeros(
+            (self.num_games, len(_tables().kinds), size, size), dtype=bool
+        )
+        games = (~self.done).nonzero()[0]
+        for start in range(0, len(games), CHUNK):
+            chunk = games[start : start + CHUNK]
+            legal = self._legal(chunk).transpose(0, 2, 1)
+            masks[chunk] = legal.reshape(len(chunk), -1, size, size)
+        return masks
+
+    def step(self) -> None:
+        """
+        Play one turn of every unfinished game: a uniformly random
+        legal move of the player to move, or their retirement if
+        they have none.
+        """
+        games = (~self.done).nonzero()[0]
+        for start in range(0, len(games), CHUNK):
+            self._step(games[start : start + CHUNK])
+
+    def _step(self, games: IntArray) -> None:
+        """
+        Play one turn of the given unfinished games.
+        """
+        tables = _tables()
+        size = self.size
+        players = self.curr_player[games]
+        legal = self._legal(games)
+        per_game = legal[0].size
+        # The legal placements of all the games, in game order
+        found = np.flatnonzero(legal)
+        counts = np.bincount(found // per_game, minlength=len(games))
+        firsts = np.cumsum(counts) - counts
+        picks = firsts + (self._rng.random(len(games)) * counts).astype(np.int64)
+
+        moving = counts > 0
+        chosen = found[picks[moving]] % per_game
+        cells, rows = np.divmod(chosen, len(tables.kinds))
+        tops, lefts = np.divmod(cells, size)
+        placed, placers = games[moving], players[moving]
+        squares = tables.squares[rows]
+        self.boards[
+            placed[:, None],
+            tops[:, None] + squares[:, :, 0],
+            lefts[:, None] + squares[:, :, 1],
+        ] = placers[:, None]
+        kinds = tables.kinds[rows]
+        self.shapes_left[placed, placers, kinds] = False
+        self.squares_left[placed, placers] -= tables.sizes[kinds]
+        self.last_one[placed, placers] = kinds == KINDS.index(ShapeKind.ONE)
+
+        # Players leave the game when they retire or have placed
+        # every shape
+        finished = ~moving
+        finished[moving] = ~self.shapes_left[placed, placers].any(axis=1)
+        self.active[games[finished], players[finished]] = False
+
+        if self.history is not None:
+            all_rows = np.full(len(games), -1)
+            all_tops = np.zeros(len(games), dtype=np.int64)
+            all_lefts = np.zeros(len(games), dtype=np.int64)
+            all_rows[moving], all_tops[moving], all_lefts[moving] = rows, tops, lefts
+            self.history.append((games, all_rows, all_tops, all_lefts))
+        self._advance(games)
+
+    def _advance(self, games: IntArray) -> None:
+        """
+        Pass the turn in each of the given games to the next active
+        player after the current one (0 if there is none).
+        """
+        n = self.num_players
+        current = self.curr_player[games]
+        following = np.zeros(len(games), dtype=np.int64)
+        for offset in range(n, 0, -1):
+            candidate = (current - 1 + offset) % n + 1
+            following = np.where(self.active[games, candidate], candidate, following)
+        self.curr_player[games] = following
+
+    def play_out(self) -> IntArray:
+        """
+        Play every game to the end.
+        Returns [IntArray]: the final scores, as for scores()
+        """
+        while not self.done.all():
+            self.step()
+        return self.scores()
+
+    def scores(self) -> IntArray:
+        """
+        Returns the (K x num_players + 1) array of each player's
+        score in each game (see Blokus.get_score), with 0 in column 0.
+        """
+        scores = -self.squares_left
+        finished = ~self.shapes_left.any(axis=2)
+        scores += 15 * finished + 5 * (finished & self.last_one)
+        scores[:, 0] = 0
+        return scores
+
+    def moves(self, game: int) -> list[Optional[Move]]:
+        """
+        Returns the turns played so far in one game, in order: the
+        Move placed, or None for a retirement.
+
+        Raises ValueError if the games were not created with
+        record=True.
+        """
+        if self.history is None:
+            raise ValueError("Moves were not recorded")
+        tables = _tables()
+        played: list[Optional[Move]] = []
+        for games, rows, tops, lefts in self.history:
+            found = (games == game).nonzero()[0]
+            if len(found) == 0:
+                continue
+            i = found[0]
+            row = int(rows[i])
+            if row < 0:
+                played.append(None)
+                continue
+            anchor = (
+                int(tops[i] - tables.min_rows[row]),
+                int(lefts[i] - tables.min_cols[row]),
+            )
+            played.append(Move(KINDS[tables.kinds[row]], tables.indexes[row], anchor))
+        return played
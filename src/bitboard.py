@@ -0,0 +1,168 @@
+"""
+Bitboard helpers for Blokus.
+
+A set of board cells is represented as a Python int, with one
+bit per cell. Each row of a (size x size) board is padded with
+one extra, always-empty column, so that a board row is
+width = size + 1 bits wide. The padding column keeps shifted
+masks from wrapping around from the end of one row into the
+start of the next: anything that lands in it is discarded by
+AND-ing with the board mask.
+
+The cell (r, c) is bit r * width + c.
+"""
+import threading
+from functools import lru_cache
+from typing import Iterator
+
+from shape_definitions import ShapeKind
+from piece import Point
+from orientations import ORIENTATIONS
+
+
+def board_mask(size: int) -> int:
+    """
+    Returns the mask of every cell on a (size x size) board,
+    leaving out the padding column.
+    """
+    width = size + 1
+    row = (1 << size) - 1
+    mask = 0
+    for r in range(size):
+        mask |= row << (r * width)
+    return mask
+
+
+def points_mask(points: list[Point] | set[Point], width: int) -> int:
+    """
+    Returns the mask of a collection of cells, all of which
+    must be on the board.
+    """
+    mask = 0
+    for r, c in points:
+        mask |= 1 << (r * width + c)
+    return mask
+
+
+def iter_points(mask: int, width: int) -> Iterator[Point]:
+    """
+    Yields the (row, col) of every cell in a mask, from the
+    lowest bit to the highest.
+    """
+    while mask:
+        low = mask & -mask
+        yield divmod(low.bit_length() - 1, width)
+        mask ^= low
+
+
+def edge_neighbors(mask: int, width: int, board: int) -> int:
+    """
+    Returns the cells that share an edge with some cell of mask,
+    but are not themselves in mask.
+    """
+    spread = (mask << 1) | (mask >> 1) | (mask << width) | (mask >> width)
+    return spread & board & ~mask
+
+
+def corner_neighbors(mask: int, width: int, board: int) -> int:
+    """
+    Returns the cells that touch some cell of mask diagonally.
+    The result may overlap mask and its edge neighbors.
+    """
+    spread = (
+        (mask << (width + 1))
+        | (mask << (width - 1))
+        | (mask >> (width - 1))
+        | (mask >> (width + 1))
+    )
+    return spread & board
+
+
+@lru_cache(maxsize=None)
+def orientation_masks(width: int) -> dict[ShapeKind, tuple[int, ...]]:
+    """
+    Returns, for every orientation in ORIENTATIONS, the mask of
+    its squares when its topmost row and leftmost column are at
+    (0, 0). A piece in orientation o anchored at (r, c) covers
+
+        mask << ((r + o.min_row) * width + (c + o.min_col))
+
+    The result is computed once per board width.
+    """
+    masks: dict[ShapeKind, tuple[int, ...]] = {}
+    for kind, orientations in ORIENTATIONS.items():
+        masks[kind] = tuple(
+            points_mask(
+                [(r - o.min_row, c - o.min_col) for r, c in o.squares], width
+            )
+            for o in orientations
+        )
+    return masks
+
+
+# The tables of placement_table, by board size, and the lock under
+# which they are made and filled in (move generation can run in
+# several threads, see bot.py)
+_PLACEMENTS: dict[int, list[list[tuple[int, ...]]]] = {}
+_PLACEMENTS_LOCK = threading.Lock()
+
+
+def placement_table(size: int) -> list[list[tuple[int, ...]]]:
+    """
+    Returns, for every cell of a (size x size) board (by bitboard
+    position), the masks of the placements of each shape (numbered
+    by position in ORIENTATIONS) that cover the cell and stay on
+    the board. An entry is empty until cell_placements has worked
+    it out, so read entries as
+
+        table[cell] or cell_placements(size, cell)
+    """
+    table = _PLACEMENTS.get(size)
+    if table is None:
+        with _PLACEMENTS_LOCK:
+            table = _PLACEMENTS.get(size)
+            if table is None:
+                table = [[] for _ in range(size * (size + 1))]
+                _PLACEMENTS[size] = table
+    return table
+
+
+def cell_placements(size: int, cell: int) -> list[tuple[int, ...]]:
+    """
+    Returns the entry of placement_table(size) for one cell, working
+    it out the first time it is needed. The entry is built in full
+    before it is stored, so other threads never see part of it.
+    """
+    table = placement_table(size)
+    found = table[cell]
+    if found:
+        return found
+    with _PLACEMENTS_LOCK:
+        found = table[cell]
+        if found:
+            return found
+        found = []
+        width = size + 1
+        tr, tc = divmod(cell, width)
+        for orientations in ORIENTATIONS.values():
+            masks = []
+            for o in orientations:
+                for r, c in o.squares:
+                    top = tr - r + o.min_row
+                    left = tc - c + o.min_col
+                    if (
+                        top < 0
+                        or left < 0
+                        or top + o.max_row - o.min_row >= size
+                        or left + o.max_col - o.min_col >= size
+                    ):
+                        continue
+                    mask = 0
+                    for sr, sc in o.squares:
+                        mask |= 1 << (
+                            (top + sr - o.min_row) * width + left + sc - o.min_col
+                        )
+                    masks.append(mask)
+            found.append(tuple(masks))
+        table[cell] = found
+        return found
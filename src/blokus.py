@@ -1,26 +1,172 @@
-from typing import Optional
+from typing import Iterator, Literal, Optional, overload
 from shape_definitions import ShapeKind
 from piece import Point, Shape, Piece
 from base import BlokusBase, Grid
+from orientations import (
+    SHAPES,
+    SHAPE_SIZES,
+    TOTAL_SQUARES,
+    ORIENTATIONS,
+    anchor_range,
+    locate,
+)
+from move import Move
+from movecache import CacheKey, MoveCache
+from zobrist import ZobristKeys, zobrist_keys
+from bitboard import (
+    board_mask,
+    points_mask,
+    iter_points,
+    orientation_masks,
+    placement_table,
+    cell_placements,
+)
+from vectorized import (
+    HAVE_NUMPY,
+    BoolArray,
+    mask_array,
+    legal_anchors,
+    legal_placements,
+    count_placements,
+)
 
-import shape_definitions
 import piece
 
+# A candidate placement: the shape, the index of its orientation in
+# ORIENTATIONS, the anchor, and the bitboard of the cells it covers.
+Candidate = tuple[ShapeKind, int, Point, int]
+
+# The shapes in the order of ORIENTATIONS, which numbers the entries
+# of bitboard.placement_table
+_KINDS: list[ShapeKind] = list(ORIENTATIONS)
+
+class _UndoRecord:
+    """
+    What Blokus.undo needs to take back one placement (or, when
+    kind is None, one retirement): the turn order before the move
+    and the previous bitboards of the cells that may change.
+    """
+
+    __slots__ = (
+        "player",
+        "kind",
+        "curr_player",
+        "active",
+        "done",
+        "zobrist",
+        "last_move",
+        "forbidden",
+        "corners",
+    )
+
+    player: int
+    kind: Optional[ShapeKind]
+    curr_player: int
+    active: tuple[int, ...]
+    done: int
+    zobrist: int
+    last_move: Optional[ShapeKind]
+    forbidden: int
+    corners: dict[int, int]
+
+    def __init__(
+        self,
+        player: int,
+        kind: Optional[ShapeKind],
+        curr_player: int,
+        active: tuple[int, ...],
+        done: int,
+        zobrist: int,
+    ) -> None:
+        self.player = player
+        self.kind = kind
+        self.curr_player = curr_player
+        self.active = active
+        self.done = done
+        self.zobrist = zobrist
+        self.last_move = None
+        self.forbidden = 0
+        self.corners = {}
+
+
 class Blokus(BlokusBase):
     """
     Blokus class for Blokus game logic.
+
+    The board is stored as bitboards (see bitboard.py) rather
+    than as a Grid: per-player occupancy masks, their union,
+    and for each player the cells that are forbidden to them
+    (edge-adjacent to their own pieces) and the cells their
+    next piece can attach to (diagonal to their own pieces,
+    not forbidden and not occupied). The grid property is
+    rebuilt from the masks when it is read after a change.
+
+    A game can be forked (see fork) cheaply: the fork shares its
+    containers with the original, and whichever game changes first
+    copies just the containers it is about to modify.
     """
 
+    __slots__ = (
+        "_num_players",
+        "_size",
+        "_start_positions",
+        "_shapes_placed",
+        "_retired_players",
+        "_shapes_left",
+        "_width",
+        "_board",
+        "_start_mask",
+        "_occupied",
+        "_union",
+        "_forbidden",
+        "_corners",
+        "_placements",
+        "_grid_cache",
+        "_curr_player",
+        "_active",
+        "_done",
+        "_num_moves",
+        "_last_moves",
+        "_squares_left",
+        "_winners",
+        "_history",
+        "_keys",
+        "_hash",
+        "_shared",
+        "_shared_players",
+        "vectorized",
+        "move_cache",
+    )
+
     _num_players: int
     _size: int
     _start_positions: set[Point]
     _shapes_placed: dict[int, set[ShapeKind]]
     _retired_players: set[int]
     _shapes_left: dict[int,set[ShapeKind]]
-    _grid: Grid
+    _width: int
+    _board: int
+    _start_mask: int
+    _occupied: dict[int, int]
+    _union: int
+    _forbidden: dict[int, int]
+    _corners: dict[int, int]
+    _placements: dict[tuple[int, ShapeKind], int]
+    _grid_cache: Optional[Grid]
     _curr_player: int
+    _active: list[int]
+    _done: int
     _num_moves: int
     _last_moves: dict[int, ShapeKind|None]
+    _squares_left: dict[int, int]
+    _winners: Optional[list[int]]
+    _history: list[_UndoRecord]
+    _keys: ZobristKeys
+    _hash: int
+    _shared: bool
+    _shared_players: int
+    vectorized: bool
+    move_cache: Optional[MoveCache]
 
     def __init__(
         self,
@@ -58,17 +204,110 @@ class Blokus(BlokusBase):
             self._shapes_placed[i+1] = set()
             
         self._retired_players = set()
-        self._grid = [[None] * size for _ in range(size)]
+
+        self._width = size + 1
+        self._board = board_mask(size)
+        self._start_mask = points_mask(
+            [(r, c) for r, c in self._start_positions if r < size and c < size],
+            self._width,
+        )
+        self._union = 0
+        self._occupied = {}
+        self._forbidden = {}
+        self._corners = {}
+        for player in range(1, self._num_players + 1):
+            self._occupied[player] = 0
+            self._forbidden[player] = 0
+            self._corners[player] = 0
+        self._placements = {}
+        self._grid_cache = None
 
         self._curr_player = 1
 
+        # Players who still get turns, in turn order, and the number
+        # of players who have retired or played all their pieces.
+        self._active = list(range(1, self._num_players + 1))
+        self._done = 0
+
         self._num_moves = 0
 
         self._shapes_left = {}
         self._last_moves = {}
+        self._squares_left = {}
         for player in range(1, self._num_players + 1):
-            self._shapes_left[player] = set(self.shapes.keys())
+            self._shapes_left[player] = set(SHAPES.keys())
             self._last_moves[player] = None
+            self._squares_left[player] = TOTAL_SQUARES
+
+        self._winners = None
+        self._history = []
+
+        self._keys = zobrist_keys(size)
+        self._hash = self._keys.initial_hash(self._num_players)
+
+        # Whether the containers are shared with a fork, and the
+        # players whose shape sets are, as bits 1 << player
+        self._shared = False
+        self._shared_players = 0
+
+        # Generate moves with NumPy (see vectorized.py) if possible
+        self.vectorized = HAVE_NUMPY
+
+        # A cache of generated moves to consult (see movecache.py),
+        # shared with forks
+        self.move_cache = None
+
+    def fork(self) -> "Blokus":
+        """
+        Returns a new game in the same position, which can be played
+        independently of this one (including undoing moves made
+        before the fork). Nothing is copied up front: the two games
+        share their containers, and each copies a container the first
+        time it modifies it, so forking takes a few microseconds.
+        """
+        game = Blokus.__new__(Blokus)
+        for name in Blokus.__slots__:
+            setattr(game, name, getattr(self, name))
+        self._shared = game._shared = True
+        everyone = (1 << (self._num_players + 1)) - 2
+        self._shared_players = game._shared_players = everyone
+        return game
+
+    def snapshot(self) -> "Blokus":
+        """
+        Returns a fork of the game (see fork) to keep as a record of
+        the current position, which stays the same however this game
+        continues.
+        """
+        return self.fork()
+
+    def _unshare(self) -> None:
+        """
+        Copy the containers shared with a fork that every move
+        changes. The per-player sets are copied by _own_sets.
+        """
+        self._retired_players = set(self._retired_players)
+        self._shapes_placed = dict(self._shapes_placed)
+        self._shapes_left = dict(self._shapes_left)
+        self._occupied = dict(self._occupied)
+        self._forbidden = dict(self._forbidden)
+        self._corners = dict(self._corners)
+        self._placements = dict(self._placements)
+        self._active = list(self._active)
+        self._last_moves = dict(self._last_moves)
+        self._squares_left = dict(self._squares_left)
+        self._history = list(self._history)
+        self._shared = False
+
+    def _own_sets(self, player: int) -> None:
+        """
+        Copy the given player's sets of shapes if they are
+        shared with a fork. _unshare must have been called first.
+        """
+        if self._shared_players >> player & 1:
+            self._shared_players ^= 1 << player
+            self._shapes_placed[player] = set(self._shapes_placed[player])
+            self._shapes_left[player] = set(self._shapes_left[player])
 
     @property
     def shapes(self) -> dict[ShapeKind, Shape]:
@@ -84,12 +323,12 @@ class Blokus(BlokusBase):
         origin at the middle (third) square.
 
         See shape_definitions.py for more details.
+
+        The shapes are copies of the shared registry in
+        orientations.SHAPES (which is parsed once per process),
+        so callers are free to transform them.
         """
-        shapes = {}
-        for kind, string in shape_definitions.definitions.items():
-            working_shape = Shape.from_string(kind, string)
-            shapes[kind] = working_shape
-        return shapes
+        return {kind: shape.copy() for kind, shape in SHAPES.items()}
 
     @property
     def size(self) -> int:
@@ -123,7 +362,7 @@ class Blokus(BlokusBase):
         before playing all of their pieces. If the game is over,
         this property will not return a meaningful value.
         """
-        if self.game_over:
+        if self._done == self._num_players:
             return 0
         
         return self._curr_player
@@ -147,7 +386,13 @@ class Blokus(BlokusBase):
         of that piece. If no played piece occupies this square,
         then the Cell is None.
         """
-        return self._grid
+        if self._grid_cache is None:
+            grid: Grid = [[None] * self._size for _ in range(self._size)]
+            for (player, kind), mask in self._placements.items():
+                for r, c in iter_points(mask, self._width):
+                    grid[r][c] = (player, kind)
+            self._grid_cache = grid
+        return self._grid_cache
 
     @property
     def game_over(self) -> bool:
@@ -156,41 +401,37 @@ class Blokus(BlokusBase):
         when every player is either retired or has played all
         their pieces.
         """
-        leftovers = set()
-        players_done: list[int] = []
-        players_done += list(self._retired_players)
+        return self._done == self._num_players
 
-        for i in range(1,self.num_players+1):
-            if i not in self._retired_players:
-                leftovers.add(i)
-            
-        for leftover in leftovers:
-            if self._shapes_left[leftover]:
-                return False
-            else:
-                players_done.append(leftover)
-        if len(players_done) == self.num_players:
-            return True
-        
-        return False
+    @property
+    def position_hash(self) -> int:
+        """
+        Returns a 64-bit Zobrist hash of the current position: the
+        owner of every occupied cell, the shapes each player has
+        left, who has retired and who is to move. It is updated
+        incrementally by maybe_place, retire and undo, so reading
+        it is free; see zobrist.py for details.
+        """
+        return self._hash
 
     @property
     def winners(self) -> Optional[list[int]]:
         """
         Returns the (one or more) players who have the highest
         score. Returns None if the game is not over.
+
+        The result is computed once, the first time it is
+        requested after the game ends, and cached.
         """
-        win: list[int] = []
-        for player in range(1, self.num_players + 1):
-            check_score = self.get_score(player)
-            if win == []:
-                win.append(player)
-            elif check_score > self.get_score(win[0]):
-                win.pop(0)
-                win.append(player)
-            elif check_score == self.get_score(win[0]):
-                win.append(player)
-        return win
+        if self._winners is None:
+            if not self.game_over:
+                return None
+            scores: dict[int, int] = {}
+            for player in range(1, self.num_players + 1):
+                scores[player] = self.get_score(player)
+            best: int = max(scores.values())
+            self._winners = [p for p, score in scores.items() if score == best]
+        return list(self._winners)
     #
     # METHODS
     #
@@ -264,13 +505,12 @@ class Blokus(BlokusBase):
         if self.any_wall_collisions(piece):
             return True
         
-        for r, c in piece.squares():
-            if self._grid[r][c] is not None:
-                return True
+        if points_mask(piece.squares(), self._width) & self._union:
+            return True
         
         return False
 
-    def legal_to_place(self, piece: Piece) -> bool:
+    def legal_to_place(self, piece: Piece | Move) -> bool:
         """
         If the current player has not already played
         this shape, this method returns a boolean
@@ -284,12 +524,18 @@ class Blokus(BlokusBase):
          - the piece shares one or more corners but no edges
            with the player's previously played pieces.
 
+        The piece may also be given as a Move.
+
         Raises ValueError if the player has already
         played a piece with this shape.
 
         Raises ValueError if the anchor of the piece
         is None.
         """
+        if isinstance(piece, Move):
+            if piece.kind in self._shapes_placed[self.curr_player]:
+                raise ValueError("Piece already placed")
+            return self._legal_squares(self._curr_player, piece.squares())
         
         if piece.shape.kind in self._shapes_placed[self.curr_player]:
             raise ValueError("Piece already placed")
@@ -299,36 +545,43 @@ class Blokus(BlokusBase):
         
         if self.any_collisions(piece):
             return False
-        
-        if self._shapes_placed[self._curr_player] == set(): # checks start pos
-            in_start: bool = False
-            for square in piece.squares():
-                if square in self.start_positions:
-                    return True
-            if not in_start:
-                return False        
-
-        piece_cardinals: set[Point] = piece.cardinal_neighbors(self.size)
-        piece_intercardinals: set[Point] = piece.intercardinal_neighbors(self.size)
-
-        # piece can't have adjacent edge with piece already played by current player
-        for point in piece_cardinals: 
-            r, c = point
-            if self._grid[r][c]:
-                if self._grid[r][c]:
-                    if self._grid[r][c][0] == self.curr_player:
-                        return False
-        
-        # piece has to share corner with previously placed piece
-        for point in piece_intercardinals: 
-            r, c = point
-            if self._grid[r][c]:
-                if self._grid[r][c][0] == self.curr_player:
-                    return True
-    
-        return False
 
-    def maybe_place(self, piece: Piece) -> bool:
+        return self._legal_squares(self._curr_player, piece.squares())
+
+    def _legal_squares(self, player: int, squares: list[Point]) -> bool:
+        """
+        Check whether the given player may cover exactly these squares
+        with their next piece, without raising any exceptions. Shared by
+        legal_to_place and the move generators, which pass in squares
+        computed from the precomputed orientation table.
+        Inputs:
+            player [int]: the player who would place the piece
+            squares [list[Point]]: the squares the piece would cover
+        Returns [bool]: True if the placement is legal, False otherwise
+        """
+        size = self._size
+        for r, c in squares:
+            if r < 0 or c < 0 or r >= size or c >= size:
+                return False
+        return self._legal_mask(player, points_mask(squares, self._width))
+
+    def _legal_mask(self, player: int, mask: int) -> bool:
+        """
+        Check whether the given player may cover exactly the on-board
+        cells in mask with their next piece.
+        Inputs:
+            player [int]: the player who would place the piece
+            mask [int]: the bitboard of the cells the piece would cover
+        Returns [bool]: True if the placement is legal, False otherwise
+        """
+        if mask & self._union:
+            return False
+        if not self._shapes_placed[player]: # checks start pos
+            return mask & self._start_mask != 0
+        # no edges shared with own pieces, at least one corner shared
+        return not mask & self._forbidden[player] and mask & self._corners[player] != 0
+
+    def maybe_place(self, piece: Piece | Move) -> bool:
         """
         If the piece is legal to place, this method
         places the piece on the board, updates the
@@ -343,12 +596,20 @@ class Blokus(BlokusBase):
         who have not retired and have remaining pieces
         should still get their turns.
 
+        The piece may also be given as a Move, which skips
+        building and locating its squares.
+
         Raises ValueError if the player has already
         played a piece with this shape.
 
         Raises ValueError if the anchor of the piece
         is None.
         """
+        if isinstance(piece, Move):
+            if not self.legal_to_place(piece):
+                return False
+            self._play(self._curr_player, piece.kind, piece.orientation, piece.anchor)
+            return True
         
         if piece.shape.kind in self._shapes_placed[self.curr_player]:
             raise ValueError("Piece already placed")
@@ -359,20 +620,140 @@ class Blokus(BlokusBase):
         if not self.legal_to_place(piece):
             return False
         
-        for r, c in piece.squares():
-            self._grid[r][c] = (self.curr_player, piece.shape.kind)
+        kind = piece.shape.kind
+        located = locate(kind, piece.squares())
+        assert located is not None
+        index, anchor = located
+        self._play(self._curr_player, kind, index, anchor)
         
+        return True
+
+    def _play(
+        self, player: int, kind: ShapeKind, index: int, anchor: Point
+    ) -> None:
+        """
+        Place the given player's shape, in orientation
+        ORIENTATIONS[kind][index], at anchor (which must be legal),
+        update the game state and pass the turn on. An undo record
+        is pushed onto the move stack.
+
+        Each player's forbidden cells (edge-adjacent to their pieces)
+        and live corner cells (diagonal to their pieces, neither
+        forbidden to them nor occupied) are kept as bitboards, and
+        updated here in O(piece size) from the orientation's
+        precomputed neighbor offsets: the new piece's cells stop
+        being corners for everyone, its edge cells become forbidden
+        to (and stop being corners for) its owner, and its free
+        diagonal cells become new corners for its owner. The
+        previous bitboards are recorded for undo.
+        """
+        size = self._size
+        width = self._width
+        orientation = ORIENTATIONS[kind][index]
+        ar, ac = anchor
+        if self._shared:
+            self._unshare()
+        if self._shared_players:
+            self._own_sets(player)
+
+        record = _UndoRecord(
+            player,
+            kind,
+            self._curr_player,
+            tuple(self._active),
+            self._done,
+            self._hash,
+        )
+        record.last_move = self._last_moves[player]
+        record.forbidden = self._forbidden[player]
+        record.corners = dict(self._corners)
+        self._history.append(record)
+
+        squares = [(ar + dr, ac + dc) for dr, dc in orientation.squares]
+        mask = points_mask(squares, width)
+        self._placements[(player, kind)] = mask
+        self._occupied[player] |= mask
+        self._union |= mask
+        for other in self._corners:
+            if self._corners[other] & mask:
+                self._corners[other] &= ~mask
+
+        edges = 0
+        for dr, dc in orientation.edges:
+            r, c = ar + dr, ac + dc
+            if 0 <= r < size and 0 <= c < size:
+                edges |= 1 << (r * width + c)
+        self._forbidden[player] |= edges
+        self._corners[player] &= ~edges
+        corners = 0
+        for dr, dc in orientation.corners:
+            r, c = ar + dr, ac + dc
+            if 0 <= r < size and 0 <= c < size:
+                corners |= 1 << (r * width + c)
+        self._corners[player] |= corners & ~(self._union | self._forbidden[player])
+        self._grid_cache = None
+
         # Update current player status and board
         self._num_moves += 1
-        self._shapes_placed[self.curr_player].add(piece.shape.kind)
-        self._last_moves[self.curr_player] = piece.shape.kind
-        self._shapes_left[self.curr_player].remove(piece.shape.kind)
+        self._shapes_placed[player].add(kind)
+        self._last_moves[player] = kind
+        self._shapes_left[player].remove(kind)
+        self._squares_left[player] -= SHAPE_SIZES[kind]
+
+        keys = self._keys
+        cell_keys = keys.cells[player]
+        h = self._hash ^ keys.shapes[(player, kind)]
+        for r, c in squares:
+            h ^= cell_keys[r * width + c]
+        self._hash = h
 
         # Move to next player
-        if ((self._curr_player % self.num_players) + 1) not in self._retired_players:
-            self._curr_player = (self._curr_player % self.num_players) + 1
-        
-        return True
+        self._advance(not self._shapes_left[player])
+
+    def undo(self) -> None:
+        """
+        Take back the most recent call to maybe_place or retire that
+        changed the game, restoring the board, the pieces and scores of
+        the player involved, the turn order, retirements and all of the
+        incremental caches, in O(piece size).
+
+        Together with maybe_place, this lets a search explore many
+        positions on a single Blokus object instead of copying it.
+
+        Raises ValueError if there is nothing to undo.
+        """
+        if not self._history:
+            raise ValueError("No moves to undo.")
+
+        if self._shared:
+            self._unshare()
+        record = self._history.pop()
+        player = record.player
+        if self._shared_players:
+            self._own_sets(player)
+        self._curr_player = record.curr_player
+        self._active = list(record.active)
+        self._done = record.done
+        self._hash = record.zobrist
+        self._winners = None
+
+        kind = record.kind
+        if kind is None:
+            self._retired_players.discard(player)
+            return
+
+        mask = self._placements.pop((player, kind))
+        self._occupied[player] &= ~mask
+        self._union &= ~mask
+        self._forbidden[player] = record.forbidden
+        self._corners.update(record.corners)
+        self._grid_cache = None
+
+        self._num_moves -= 1
+        self._shapes_placed[player].discard(kind)
+        self._last_moves[player] = record.last_move
+        self._shapes_left[player].add(kind)
+        self._squares_left[player] += SHAPE_SIZES[kind]
 
     def retire(self) -> None:
         """
@@ -380,10 +761,45 @@ class Blokus(BlokusBase):
         may choose to retire. This player does not get any more
         turns; they are skipped over during subsequent gameplay.
         """
-        self._retired_players.add(self.curr_player)
-        
-        if self._num_players - len(self.retired_players) > 0:
-            self._curr_player = (self.curr_player % self.num_players) + 1
+        if self.game_over:
+            return
+
+        if self._shared:
+            self._unshare()
+        self._history.append(
+            _UndoRecord(
+                self._curr_player,
+                None,
+                self._curr_player,
+                tuple(self._active),
+                self._done,
+                self._hash,
+            )
+        )
+        self._retired_players.add(self._curr_player)
+        self._hash ^= self._keys.retired[self._curr_player]
+        self._advance(True)
+
+    def _advance(self, leaving: bool) -> None:
+        """
+        Pass the turn to the next active player in the ring. If the
+        current player is leaving the game (because they retired or
+        played their last piece), they are first removed from the
+        ring, so they are never handed the turn again.
+        Inputs:
+            leaving [bool]: whether the current player is leaving
+        """
+        ring = self._active
+        i = ring.index(self._curr_player)
+        self._hash ^= self._keys.to_move[self._curr_player]
+        if leaving:
+            ring.pop(i)
+            self._done += 1
+            if ring:
+                self._curr_player = ring[i % len(ring)]
+        else:
+            self._curr_player = ring[(i + 1) % len(ring)]
+        self._hash ^= self._keys.to_move[self.curr_player]
 
     def get_score(self, player: int) -> int:
         """
@@ -391,12 +807,8 @@ class Blokus(BlokusBase):
         can be computed at any time during gameplay or at the
         completion of a game.
         """
-        score: int = 0
-        for shape in self._shapes_left[player]:
-            str = shape_definitions.definitions[shape]
-            working_shape = Shape.from_string(shape, str)
-            score -= len(working_shape.squares)
-        
+        score: int = -self._squares_left[player]
+
         if not self._shapes_left[player]:
             score += 15
             if self._last_moves[player] == ShapeKind.ONE:
@@ -416,44 +828,359 @@ class Blokus(BlokusBase):
         (because they may differ in location and orientation).
         """
         
-        avail_moves: set[Piece] = set()
- 
-        for shapekind in self._shapes_left[self._curr_player]:
-            for x in range(self._size):
-                for y in range(self._size):
-                    one = Piece(self.shapes[shapekind])
-                    one.set_anchor((y, x))
-                    if self.legal_to_place(one):
-                        avail_moves.add(one)
-
-                    if self.shapes[shapekind].can_be_transformed: # does transforming change the squares?
-                        two = Piece(self.shapes[shapekind])
-                        two.set_anchor((y, x))
-                        two.flip_horizontally()
-                        two1 = Piece(self.shapes[shapekind])
-                        two1.set_anchor((y, x))
-                        if set(two.squares()) != set(two1.squares()): # does flipping horizontally change the squares?
-                            if self.legal_to_place(two):
-                                avail_moves.add(two)
-
-                        three = Piece(self.shapes[shapekind])
-                        three.set_anchor((y, x))
-                        three.rotate_right()
-                        three1 = Piece(self.shapes[shapekind])
-                        three1.set_anchor((y, x))
-                        if set(three.squares()) != set(three1.squares()): # does rotating right change the squares?
-                            if self.legal_to_place(three):
-                                avail_moves.add(three)
-
-                        four = Piece(self.shapes[shapekind])
-                        four.set_anchor((y, x))
-                        four.rotate_left()
-                        four1 = Piece(self.shapes[shapekind])
-                        four1.set_anchor((y, x))
-                        if set(four.squares()) != set(four1.squares()): # does rotating left change the squares?
-                            if self.legal_to_place(four):
-                                avail_moves.add(four)
-        return avail_moves
+        return {move.to_piece() for move in self.legal_moves()}
+
+    def legal_moves(self) -> set[Move]:
+        """
+        Returns the same moves as available_moves, as compact Move
+        values rather than Pieces. This is much cheaper, since no
+        Piece (and no copy of a Shape) is built for each move.
+
+        Uses the NumPy move generator if the vectorized attribute
+        is True, and the bitboard one otherwise. If the move_cache
+        attribute is set, the moves are looked up in that cache
+        first (see legal_move_list).
+        """
+        player = self._curr_player
+        if self.move_cache is not None:
+            return set(self._cached_moves(player))
+        if self.vectorized:
+            return self._vectorized_moves(player)
+        return {
+            Move(kind, index, anchor)
+            for kind, index, anchor, mask in self._frontier_candidates(player)
+            if self._legal_mask(player, mask)
+        }
+
+    def iter_available_moves(self, order: Optional[str] = None) -> Iterator[Piece]:
+        """
+        Yields the moves in available_moves one at a time, only
+        generating each one when it is asked for, so a caller who
+        needs just a few moves can stop early. The game must not
+        change while the moves are being iterated over.
+        Inputs:
+            order [Optional[str]]: "largest" to yield the moves with
+                the largest shapes first, "smallest" for the smallest
+                shapes first, or None for the order in which the
+                shapes are defined
+        Returns [Iterator[Piece]]: the available moves
+
+        Raises ValueError if the order is not one of these.
+        """
+        for move in self._iter_moves(self._curr_player, order):
+            yield move.to_piece()
+
+    def has_any_move(self, player: Optional[int] = None) -> bool:
+        """
+        Check whether a player has any move available, stopping at
+        the first one found.
+        Inputs:
+            player [Optional[int]]: the player to check (the current
+                player if None)
+        Returns [bool]: True if the player could place a piece if it
+            were their turn, False otherwise
+
+        Raises ValueError if there is no such player.
+        """
+        if player is None:
+            player = self._curr_player
+        if player not in self._shapes_left:
+            raise ValueError(f"No such player: {player}")
+        # Any cell a piece can attach to is free and not forbidden,
+        # so the one-square shape fits wherever any shape does
+        if ShapeKind.ONE in self._shapes_left[player]:
+            return bool(self._attachment_cells(player))
+        return next(self._iter_moves(player, "smallest"), None) is not None
+
+    def _iter_moves(self, player: int, order: Optional[str]) -> Iterator[Move]:
+        """
+        Yields the legal moves of the given player as Moves, in the
+        given order (see iter_available_moves).
+        """
+        shapes_left = self._shapes_left[player]
+        kinds = [kind for kind in ORIENTATIONS if kind in shapes_left]
+        if order == "largest":
+            kinds.sort(key=lambda kind: -SHAPE_SIZES[kind])
+        elif order == "smallest":
+            kinds.sort(key=lambda kind: SHAPE_SIZES[kind])
+        elif order is not None:
+            raise ValueError(f"Unknown move order: {order}")
+        for kind, index, anchor, mask in self._frontier_candidates(player, kinds):
+            if self._legal_mask(player, mask):
+                yield Move(kind, index, anchor)
+
+    @overload
+    def count_available_moves(
+        self, player: Optional[int] = None, by_shape: Literal[False] = False
+    ) -> int: ...
+
+    @overload
+    def count_available_moves(
+        self, player: Optional[int], by_shape: Literal[True]
+    ) -> dict[ShapeKind, int]: ...
+
+    @overload
+    def count_available_moves(
+        self, player: Optional[int] = None, *, by_shape: Literal[True]
+    ) -> dict[ShapeKind, int]: ...
+
+    def count_available_moves(
+        self, player: Optional[int] = None, by_shape: bool = False
+    ) -> int | dict[ShapeKind, int]:
+        """
+        Count the moves available to a player, without building
+        the moves themselves. The count for the current player is
+        len(available_moves()); for any other player, it is the
+        number of moves they would have if it were their turn.
+        Without NumPy, the placements covering each cell are looked
+        up in bitboard.placement_table, so no candidate is built
+        or checked twice.
+        Inputs:
+            player [Optional[int]]: the player whose moves to count
+                (the current player if None)
+            by_shape [bool]: whether to break the count down by shape
+        Returns [int | dict[ShapeKind, int]]: the number of moves, or
+            if by_shape is True, the number of moves with each of the
+            player's remaining shapes
+
+        Raises ValueError if there is no such player.
+        """
+        if player is None:
+            player = self._curr_player
+        if player not in self._shapes_left:
+            raise ValueError(f"No such player: {player}")
+
+        counts: dict[ShapeKind, int] = {kind: 0 for kind in self._shapes_left[player]}
+        # Counting is cheaper than listing the moves to cache, so
+        # only a cache hit is used
+        cached = None
+        if self.move_cache is not None:
+            cached = self.move_cache.get(self._cache_key(player))
+        if cached is not None:
+            for move in cached:
+                counts[move.kind] += 1
+        elif self.vectorized:
+            blocked, attach = self._player_arrays(player)
+            if attach.any():
+                counts.update(
+                    count_placements(self._shapes_left[player], blocked, attach)
+                )
+        else:
+            blocked, attach = self._player_masks(player)
+            numbers = [k for k, kind in enumerate(_KINDS) if kind in counts]
+            table = placement_table(self._size)
+            # Placements found from several attachment cells are
+            # counted once
+            found: dict[int, int] = {}
+            while attach:
+                low = attach & -attach
+                attach ^= low
+                cell = low.bit_length() - 1
+                placements = table[cell] or cell_placements(self._size, cell)
+                for k in numbers:
+                    for mask in placements[k]:
+                        if not mask & blocked:
+                            found[mask] = k
+            for k in found.values():
+                counts[_KINDS[k]] += 1
+        if by_shape:
+            return counts
+        return sum(counts.values())
+
+    def legal_anchor_mask(
+        self, kind: ShapeKind, orientation: int, player: int
+    ) -> BoolArray:
+        """
+        Returns a (size x size) NumPy boolean array telling, for
+        every position on the board at once, whether the given
+        player may place the given shape there in orientation
+        ORIENTATIONS[kind][orientation]. Entry [i, j] is for the
+        placement whose topmost row is i and leftmost column is j,
+        so its anchor is (i - o.min_row, j - o.min_col), where o
+        is the orientation. The array is all False if the player
+        has already played the shape.
+
+        Raises ValueError if the player or orientation is invalid.
+
+        Raises ImportError if NumPy is not installed.
+        """
+        if not HAVE_NUMPY:
+            raise ImportError("legal_anchor_mask requires NumPy")
+        if player not in self._shapes_left:
+            raise ValueError(f"No such player: {player}")
+        if not 0 <= orientation < len(ORIENTATIONS[kind]):
+            raise ValueError(f"{kind} has no orientation {orientation}")
+        blocked, attach = self._player_arrays(player)
+        if kind not in self._shapes_left[player]:
+            attach[:] = False
+        return legal_anchors(ORIENTATIONS[kind][orientation], blocked, attach)
+
+    def _player_masks(self, player: int) -> tuple[int, int]:
+        """
+        Returns the bitboards of the cells the given player may not
+        cover (occupied, or edge-adjacent to their own pieces) and
+        of the cells their next piece must cover one of.
+        """
+        if not self._shapes_placed[player]:
+            return self._union, self._start_mask & ~self._union
+        return self._union | self._forbidden[player], self._corners[player]
+
+    def _player_arrays(self, player: int) -> tuple[BoolArray, BoolArray]:
+        """
+        Returns _player_masks as NumPy arrays.
+        """
+        blocked, attach = self._player_masks(player)
+        return mask_array(blocked, self._size), mask_array(attach, self._size)
+
+    def _vectorized_moves(self, player: int) -> set[Move]:
+        """
+        Returns the legal moves of the given player, computed with
+        legal_placements for all of their orientations at once
+        instead of one candidate placement at a time.
+        """
+        blocked, attach = self._player_arrays(player)
+        if not attach.any():
+            return set()
+        return {
+            Move(kind, index, (r, c))
+            for kind, index, r, c in legal_placements(
+                self._shapes_left[player], blocked, attach
+            )
+        }
+
+    def legal_move_list(self, player: Optional[int] = None) -> list[Move]:
+        """
+        Returns the moves a player has, like legal_moves, but as a
+        list in an order that depends only on the position (not on
+        the order of a set, which can change from one process to
+        the next), for choosing moves with a seeded random number
+        generator.
+        Inputs:
+            player [Optional[int]]: the player whose moves to list
+                (the current player if None)
+        Returns [list[Move]]: the moves
+
+        If the move_cache attribute is set, the moves are looked up
+        there by position hash, start positions, player and move
+        generator, and stored there if they are not found.
+
+        Raises ValueError if there is no such player.
+        """
+        if player is None:
+            player = self._curr_player
+        if player not in self._shapes_left:
+            raise ValueError(f"No such player: {player}")
+        if self.move_cache is not None:
+            return list(self._cached_moves(player))
+        return self._generate_moves(player)
+
+    def _cached_moves(self, player: int) -> tuple[Move, ...]:
+        """
+        Returns the moves of the given player from move_cache,
+        generating and storing them if they are not there.
+        """
+        assert self.move_cache is not None
+        key = self._cache_key(player)
+        moves = self.move_cache.get(key)
+        if moves is None:
+            moves = tuple(self._generate_moves(player))
+            self.move_cache.put(key, moves)
+        return moves
+
+    def _cache_key(self, player: int) -> CacheKey:
+        """
+        Returns the key of the given player's moves in move_cache.
+        The position hash does not cover the start positions, which
+        decide a player's first moves, so they are part of the key,
+        and so is the move generator, which decides the order of
+        the moves.
+        """
+        return (self._hash, self._start_mask, player, self.vectorized)
+
+    def _generate_moves(self, player: int) -> list[Move]:
+        """
+        Returns the moves of the given player, in the order of
+        legal_move_list.
+        """
+        if self.vectorized:
+            blocked, attach = self._player_arrays(player)
+            return [
+                Move(kind, index, (r, c))
+                for kind, index, r, c in legal_placements(
+                    self._shapes_left[player], blocked, attach
+                )
+            ]
+        return list(self._iter_moves(player, None))
+
+    def _attachment_cells(self, player: int) -> list[Point]:
+        """
+        Returns the cells that any legal next piece of the given
+        player must cover at least one of: the free start positions
+        before their first move, and their live corner cells after.
+        """
+        if not self._shapes_placed[player]:
+            mask = self._start_mask & ~self._union
+            return list(iter_points(mask, self._width))
+        return list(iter_points(self._corners[player], self._width))
+
+    def _frontier_candidates(
+        self, player: int, kinds: Optional[list[ShapeKind]] = None
+    ) -> Iterator[Candidate]:
+        """
+        Yields each placement of the given player's remaining shapes
+        (or just of the given kinds, in that order) that stays on the
+        board and covers one of their attachment cells, exactly once.
+        Every legal move is among these, so this is all that move
+        generation needs to check, and it is far fewer than the
+        placements tried by _scan_candidates.
+        """
+        targets = self._attachment_cells(player)
+        if not targets:
+            return
+        size = self._size
+        width = self._width
+        masks = orientation_masks(width)
+        if kinds is None:
+            kinds = list(self._shapes_left[player])
+        for kind in kinds:
+            for index, orientation in enumerate(ORIENTATIONS[kind]):
+                base = masks[kind][index]
+                seen: set[Point] = set()
+                for tr, tc in targets:
+                    for dr, dc in orientation.squares:
+                        r = tr - dr
+                        c = tc - dc
+                        top = r + orientation.min_row
+                        left = c + orientation.min_col
+                        if (
+                            top < 0
+                            or left < 0
+                            or r + orientation.max_row >= size
+                            or c + orientation.max_col >= size
+                            or (r, c) in seen
+                        ):
+                            continue
+                        seen.add((r, c))
+                        yield kind, index, (r, c), base << (top * width + left)
+
+    def _scan_candidates(self, player: int) -> Iterator[Candidate]:
+        """
+        Yields every placement of the given player's remaining shapes
+        that stays on the board. This is the exhaustive search that
+        move generation used before _frontier_candidates, kept as a
+        reference for tests and benchmarks.
+        """
+        width = self._width
+        masks = orientation_masks(width)
+        for kind in self._shapes_left[player]:
+            for index, orientation in enumerate(ORIENTATIONS[kind]):
+                base = masks[kind][index]
+                rows, cols = anchor_range(orientation, self._size)
+                for r in rows:
+                    for c in cols:
+                        shift = (r + orientation.min_row) * width
+                        shift += c + orientation.min_col
+                        yield kind, index, (r, c), base << shift
     
     def fake_available_moves(self) -> set[Piece]:
         """
@@ -477,9 +1204,9 @@ class Blokus(BlokusBase):
  
         for shapekind in self._shapes_left[self._curr_player]:
             for empty_square in empty_squares:
-                maybe_piece: Piece = Piece(self.shapes[shapekind])
+                maybe_piece: Piece = Piece(SHAPES[shapekind])
                 maybe_piece.set_anchor(empty_square)
-                if self.legal_to_place(maybe_piece) and piece not in avail_moves:
+                if self.legal_to_place(maybe_piece):
                     avail_moves.add(maybe_piece)
 
         return avail_moves
@@ -0,0 +1,156 @@
+"""
+Opening books: the best first moves on the standard boards.
+
+Every game on a given board starts from the same empty position,
+so the first few moves that a search bot would choose can be
+worked out once, offline (see build_book.py), and looked up
+instead of searched for.
+
+A book maps the key of a position to the move to play there. The
+key of a position is its Zobrist hash (see zobrist.py) combined
+with a key for the board's layout: the number of players, the
+size and the start positions. Positions reached by playing the
+same moves in a different order share a key, while equal-looking
+positions on different layouts (for instance, the empty board of
+a two-player and of a four-player classic game) do not.
+
+Books are stored as a small binary file, which is memory-mapped
+rather than read in, and searched by open addressing: a header
+
+    MAGIC, number of slots (a power of two), number of entries
+
+followed by the slots, each holding a 64-bit key and a 32-bit
+move (as packed by Move.encode, or EMPTY). A key is looked for in
+slot key % slots and the slots after it, up to the first empty
+one. Books are built at most half full, so lookups take O(1) time
+on average.
+"""
+import hashlib
+import mmap
+import os
+import struct
+from functools import lru_cache
+from typing import Optional
+
+from blokus import Blokus
+from move import Move
+
+MAGIC = b"BLOKBOOK"
+
+# The file header and the format of each slot
+HEADER = struct.Struct("<8sII")
+SLOT = struct.Struct("<QI")
+
+# The move of an empty slot
+EMPTY = 0xFFFFFFFF
+
+# The book that bots use by default, built by build_book.py
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "openings.book")
+
+
+def layout_key(game: Blokus) -> int:
+    """
+    Returns a 64-bit key for the layout of a game's board: its
+    number of players, size and start positions.
+    """
+    layout = f"{game.num_players}:{game.size}:{sorted(game.start_positions)}"
+    digest = hashlib.blake2b(layout.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def book_key(game: Blokus) -> int:
+    """
+    Returns the key of the current position of a game in a book.
+    """
+    return game.position_hash ^ layout_key(game)
+
+
+def write_book(path: str, entries: dict[int, Move]) -> None:
+    """
+    Write a book file.
+    Inputs:
+        path [str]: the file to write
+        entries [dict[int, Move]]: the move for each position key
+    """
+    slots = 1
+    while slots < 2 * len(entries) or slots < 2:
+        slots *= 2
+    table: list[tuple[int, int]] = [(0, EMPTY)] * slots
+    for key in sorted(entries):
+        index = key & (slots - 1)
+        while table[index][1] != EMPTY:
+            index = (index + 1) & (slots - 1)
+        table[index] = (key, entries[key].encode())
+
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, slots, len(entries)))
+        for key, code in table:
+            file.write(SLOT.pack(key, code))
+
+
+class OpeningBook:
+    """
+    A book file, memory-mapped for lookups.
+    """
+
+    _file: mmap.mmap
+    _slots: int
+    _entries: int
+
+    def __init__(self, path: str) -> None:
+        """
+        Open a book file written by write_book.
+
+        Raises ValueError if the file is not a book.
+        """
+        with open(path, "rb") as file:
+            self._file = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._file) < HEADER.size:
+            raise ValueError(f"{path} is not an opening book")
+        magic, self._slots, self._entries = HEADER.unpack_from(self._file)
+        if magic != MAGIC or len(self._file) != HEADER.size + self._slots * SLOT.size:
+            raise ValueError(f"{path} is not an opening book")
+
+    def __len__(self) -> int:
+        return self._entries
+
+    def lookup(self, key: int) -> Optional[Move]:
+        """
+        Returns the move stored for a position key, if any.
+        """
+        mask = self._slots - 1
+        index = key & mask
+        while True:
+            stored, code = SLOT.unpack_from(self._file, HEADER.size + index * SLOT.size)
+            if code == EMPTY:
+                return None
+            if stored == key:
+                return Move.decode(code)
+            index = (index + 1) & mask
+
+    def move(self, game: Blokus) -> Optional[Move]:
+        """
+        Returns the book move for the current position of a game, if
+        the book has one and it is legal.
+        """
+        move = self.lookup(book_key(game))
+        if move is None or not game.legal_to_place(move):
+            return None
+        return move
+
+    def close(self) -> None:
+        """
+        Unmap the file.
+        """
+        self._file.close()
+
+
+@lru_cache(maxsize=None)
+def default_book() -> Optional[OpeningBook]:
+    """
+    Returns the book at BOOK_PATH, opened the first time it is
+    needed, or None if there is no such file.
+    """
+    if not os.path.exists(BOOK_PATH):
+        return None
+    return OpeningBook(BOOK_PATH)
@@ -1,10 +1,45 @@
 import sys,random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Optional
 from piece import Point, Piece, Shape, ShapeKind
 from blokus import Blokus
+from move import Move
+from book import OpeningBook, default_book
+from endgame import EndgameSolver
+from mcts import MCTS
+from movecache import MoveCache
+from search import Search
 import click
 
 # Classes that represent players with different strategies
 
+class BestMove:
+    """
+    The best move that a player has found so far while thinking
+    against a deadline (see Player.think). The player offers moves
+    to it from its own thread, and the driver of the game takes the
+    latest one when time is up.
+    """
+
+    move: Optional[Move]
+    offers: int
+
+    def __init__(self) -> None:
+        self.move = None
+        self.offers = 0
+
+    def offer(self, move: Optional[Move]) -> None:
+        """
+        Make a move the best one so far (ignoring None).
+        """
+        if move is not None:
+            self.move = move
+            self.offers += 1
+
+
 class Player:
 
     """
@@ -12,12 +47,65 @@ class Player:
     S (satisfactory), or U (unsatisfactory) strategy.
     """
 
+    # Names of the keyword arguments (settings such as a time limit)
+    # that the constructor accepts beyond those of Player
+    OPTIONS: tuple[str, ...] = ()
+
     _bot_game: Blokus
     _player: int
-
-    def __init__(self, bot_game: Blokus, player: int):
+    _rng: random.Random
+    _book: Optional[OpeningBook] = None
+    _book_moves: int = 0
+    _thinking: Optional[threading.Thread] = None
+
+    def __init__(
+        self, bot_game: Blokus, player: int, rng: Optional[random.Random] = None
+    ):
+        """
+        Constructor
+        Inputs:
+            bot_game [Blokus]: the game to play in
+            player [int]: the player to play as
+            rng [Optional[random.Random]]: the source of any random
+                choices, for reproducible games (a new, unseeded one
+                if None)
+        """
         self._bot_game = bot_game
         self._player = player
+        self._rng = rng if rng is not None else random.Random()
+
+    def stats(self) -> dict[str, float]:
+        """
+        Returns statistics about the work done by the player so far,
+        such as the number of playouts, by name (none by default).
+        Players whose statistics are counted while they think should
+        call finish_thinking first.
+        """
+        return {}
+
+    def finish_thinking(self) -> None:
+        """
+        Wait for the player's last thread of thought (see timed_move)
+        to stop, so that it no longer changes their statistics.
+        """
+        if self._thinking is not None:
+            self._thinking.join()
+
+    def book_move(self, game: Optional[Blokus] = None) -> Optional[Move]:
+        """
+        Look the current position up in the player's opening book
+        (see book.py), if it has one.
+        Inputs:
+            game [Optional[Blokus]]: the game to look up (the
+                player's game if None)
+        Returns [Optional[Move]]: the book move, if there is one
+        """
+        if self._book is None:
+            return None
+        move: Optional[Move] = self._book.move(game or self._bot_game)
+        if move is not None:
+            self._book_moves += 1
+        return move
 
     @ property
     def retired(self) -> bool:
@@ -38,19 +126,107 @@ class Player:
         """
         raise NotImplementedError
 
-    def make_move(self) -> None:
+    def make_move(self, budget: Optional[float] = None) -> None:
         """
         Make a move using a piece that was determined by a specific strategy.
+        Does nothing if it is not this player's turn.
+        Inputs:
+            budget [Optional[float]]: if given, the most seconds the
+                player may take (see timed_move)
         Returns [None]
         """
+        if self._bot_game.curr_player != self._player:
+            return
         if not self.retired:
-            avail_moves: set[Piece] = self._bot_game.fake_available_moves()
-            if avail_moves == set():
+            if not self._bot_game.has_any_move():
                 self._bot_game.retire()
+            elif budget is not None:
+                self._bot_game.maybe_place(self.timed_move(budget))
             else:
-                move: Piece = self.strategy(avail_moves)
+                move: Piece = self.choose_move()
                 self._bot_game.maybe_place(move)
 
+    def think(self, game: Blokus, deadline: float, best: BestMove) -> None:
+        """
+        Look for a move until a deadline, offering each move that is
+        better than the ones before to best as soon as it is found.
+        The move offered last when the deadline passes is played,
+        whether or not think has returned by then.
+        By default, this offers the move that the strategy chooses
+        among all the available moves.
+        Inputs:
+            game [Blokus]: a copy of the player's game, at a position
+                where they have a move, that they may change
+            deadline [float]: the time.perf_counter() value by which
+                to offer a move
+            best [BestMove]: where to offer moves
+        Returns [None]
+        """
+        best.offer(Move.from_piece(self.strategy(game.available_moves())))
+
+    def timed_move(
+        self, budget: float, wait: Optional[Callable[[], None]] = None
+    ) -> Move:
+        """
+        Let the player think about the current position (see think)
+        in another thread, for at most the given number of seconds,
+        and take the last move it offered. If it has offered none,
+        take the first legal move. The thread is left to stop on its
+        own; if it is still running at the player's next move, that
+        move's budget is spent waiting for it first.
+        Inputs:
+            budget [float]: the most seconds the player may take
+            wait [Optional[Callable[[], None]]]: if given, called
+                about every 50 ms while waiting (for instance, to
+                keep a GUI responsive)
+        Returns [Move]: the move to play
+        """
+        deadline: float = time.perf_counter() + budget
+        best: BestMove = BestMove()
+        # A player thinks about one position at a time, so first let
+        # it finish thinking about its last move if it overran
+        previous: Optional[threading.Thread] = self._thinking
+        if previous is None or not self._wait(previous, deadline, wait):
+            self._thinking = threading.Thread(
+                target=self.think,
+                args=(self._bot_game.fork(), deadline, best),
+                daemon=True,
+            )
+            self._thinking.start()
+            self._wait(self._thinking, deadline, wait)
+        move: Optional[Move] = best.move
+        if move is None:
+            move = self._bot_game.legal_move_list()[0]
+        return move
+
+    @staticmethod
+    def _wait(
+        thread: threading.Thread,
+        deadline: float,
+        wait: Optional[Callable[[], None]],
+    ) -> bool:
+        """
+        Wait for a thread to finish, until a deadline at the latest,
+        calling wait (if given) about every 50 ms.
+        Returns [bool]: True if the thread is still running
+        """
+        while thread.is_alive():
+            left: float = deadline - time.perf_counter()
+            if left <= 0:
+                return True
+            thread.join(min(left, 0.05) if wait is not None else left)
+            if wait is not None:
+                wait()
+        return False
+
+    def choose_move(self) -> Piece:
+        """
+        Choose a piece to place, when at least one move is available.
+        By default, this applies the strategy to every available move.
+        Returns [Piece]: the piece to play
+        """
+        return self.strategy(self._bot_game.available_moves())
+
 class NBot(Player):
 
     """
@@ -58,15 +234,31 @@ class NBot(Player):
     pieces to play.
     """
 
-    def __init__(self, bot_game: Blokus, player: int):
-        super().__init__(bot_game, player)
+    def __init__(
+        self, bot_game: Blokus, player: int, rng: Optional[random.Random] = None
+    ):
+        super().__init__(bot_game, player, rng)
 
     def strategy(self, avail_moves: set[Piece]) -> Piece:
-        rand: Piece = random.choice(list(avail_moves))
+        # Sets of pieces have no fixed order, so sort them for the
+        # choice to depend only on the random number generator
+        pieces: list[Piece] = sorted(
+            avail_moves, key=lambda piece: Move.from_piece(piece).encode()
+        )
+        rand: Piece = self._rng.choice(pieces)
         return rand
+
+    def choose_move(self) -> Piece:
+        """
+        Choose a move at random, as strategy does, without building a
+        Piece for every available move.
+        Returns [Piece]: the piece to play
+        """
+        moves: list[Move] = sorted(self._bot_game.legal_moves(), key=Move.encode)
+        return self._rng.choice(moves).to_piece()
     
-    def make_move(self) -> None:
-        super().make_move()
+    def make_move(self, budget: Optional[float] = None) -> None:
+        super().make_move(budget)
     
 
 class SBot(Player):
@@ -75,12 +267,22 @@ class SBot(Player):
     piece possible.
     """
 
-    def __init__(self, bot_game: Blokus, player: int):
-        super().__init__(bot_game, player)
+    def __init__(
+        self, bot_game: Blokus, player: int, rng: Optional[random.Random] = None
+    ):
+        super().__init__(bot_game, player, rng)
     
     def strategy(self, avail_moves: set[Piece]) -> Piece:
         return self.biggest_piece(avail_moves)
 
+    def choose_move(self) -> Piece:
+        """
+        Take the first move with the largest shape possible, without
+        generating the moves with smaller shapes.
+        Returns [Piece]: the piece to play
+        """
+        return next(self._bot_game.iter_available_moves(order="largest"))
+
     def biggest_piece(self, avail_moves: set[Piece]) -> Piece:
         """
         Find a piece with the largest size out of the available pieces.
@@ -95,8 +297,8 @@ class SBot(Player):
         max_size: int = max(shape_sizes)
         return shape_sizes[max_size]
     
-    def make_move(self) -> None:
-        super().make_move()
+    def make_move(self, budget: Optional[float] = None) -> None:
+        super().make_move(budget)
 
 class UBot(Player):
 
@@ -105,12 +307,22 @@ class UBot(Player):
     piece possible at every turn.
     """
 
-    def __init__(self, bot_game: Blokus, player: int):
-        super().__init__(bot_game, player)
+    def __init__(
+        self, bot_game: Blokus, player: int, rng: Optional[random.Random] = None
+    ):
+        super().__init__(bot_game, player, rng)
     
     def strategy(self, avail_moves: set[Piece]) -> Piece:
         return self.smallest_piece(avail_moves)
 
+    def choose_move(self) -> Piece:
+        """
+        Take the first move with the smallest shape possible, without
+        generating the moves with larger shapes.
+        Returns [Piece]: the piece to play
+        """
+        return next(self._bot_game.iter_available_moves(order="smallest"))
+
     def smallest_piece(self, avail_moves: set[Piece]) -> Piece:
         """
         Find a piece with the smallest size out of the available pieces.
@@ -125,8 +337,508 @@ class UBot(Player):
         min_size: int = min(shape_sizes)
         return shape_sizes[min_size]
     
-    def make_move(self) -> None:
-        super().make_move()
+    def make_move(self, budget: Optional[float] = None) -> None:
+        super().make_move(budget)
+
+class MCTSBot(Player):
+    """
+    A Blokus player that chooses moves by Monte Carlo Tree Search
+    (see mcts.py), within a time limit or a number of playouts per
+    move, reusing the search tree from one move to the next.
+    """
+
+    OPTIONS = ("time_limit", "playouts", "book")
+
+    # The budget per move when neither limit is given (a move with a
+    # deadline, see think, is searched until the deadline instead)
+    DEFAULT_PLAYOUTS = 100
+
+    _search: MCTS
+    _time_limit: Optional[float]
+    _playouts: Optional[int]
+
+    def __init__(
+        self,
+        bot_game: Blokus,
+        player: int,
+        rng: Optional[random.Random] = None,
+        time_limit: Optional[float] = None,
+        playouts: Optional[int] = None,
+        book: bool = True,
+    ):
+        """
+        Constructor
+        Inputs:
+            bot_game, player, rng: as for Player
+            time_limit [Optional[float]]: seconds to search per move
+            playouts [Optional[int]]: playouts to run per move
+            book [bool]: whether to play opening book moves
+        """
+        super().__init__(bot_game, player, rng)
+        self._time_limit = time_limit
+        self._playouts = playouts
+        self._search = MCTS(self._rng)
+        if book:
+            self._book = default_book()
+
+    def strategy(self, avail_moves: set[Piece]) -> Piece:
+        piece: Piece = self.choose_move()
+        assert piece in avail_moves
+        return piece
+
+    def choose_move(self) -> Piece:
+        """
+        Play the book move, if there is one, or else search for the
+        most promising move.
+        Returns [Piece]: the piece to play
+        """
+        move: Optional[Move] = self.book_move()
+        if move is None:
+            playouts: Optional[int] = self._playouts
+            if self._time_limit is None and playouts is None:
+                playouts = self.DEFAULT_PLAYOUTS
+            move = self._search.search(self._bot_game, self._time_limit, playouts)
+        assert move is not None
+        return move.to_piece()
+
+    def think(self, game: Blokus, deadline: float, best: BestMove) -> None:
+        """
+        Offer the book move, if there is one, or else search until
+        the deadline (or for the number of playouts, if one was
+        given), offering the most visited move every so often.
+        """
+        move: Optional[Move] = self.book_move(game)
+        if move is None:
+            move = self._search.search(
+                game,
+                max(0.0, deadline - time.perf_counter()),
+                self._playouts,
+                best.offer,
+            )
+        best.offer(move)
+
+    def stats(self) -> dict[str, float]:
+        self.finish_thinking()
+        return {
+            "playouts": self._search.playouts,
+            "seconds": self._search.seconds,
+            "book_moves": self._book_moves,
+        }
+
+
+class SearchBot(Player):
+    """
+    A Blokus player that chooses moves by iterative-deepening
+    alpha-beta search (see search.py), within a time limit per move.
+    With more than two players it assumes that everyone else plays
+    against it ("paranoid"), unless told to use the max-n rule.
+    """
+
+    OPTIONS = ("time_limit", "max_depth", "rule", "book")
+
+    # The time limit per move when none is given
+    DEFAULT_TIME_LIMIT = 0.5
+
+    _search: Search
+    _time_limit: float
+    _max_depth: Optional[int]
+
+    def __init__(
+        self,
+        bot_game: Blokus,
+        player: int,
+        rng: Optional[random.Random] = None,
+        time_limit: Optional[float] = None,
+        max_depth: Optional[int] = None,
+        rule: str = "paranoid",
+        book: bool = True,
+    ):
+        """
+        Constructor
+        Inputs:
+            bot_game, player, rng: as for Player
+            time_limit [Optional[float]]: seconds to search per move
+            max_depth [Optional[int]]: the deepest search to run
+            rule [str]: "paranoid" or "maxn" (see search.Search)
+            book [bool]: whether to play opening book moves
+        """
+        super().__init__(bot_game, player, rng)
+        self._time_limit = (
+            time_limit if time_limit is not None else self.DEFAULT_TIME_LIMIT
+        )
+        self._max_depth = max_depth
+        self._search = Search(rule)
+        if book:
+            self._book = default_book()
+
+    def strategy(self, avail_moves: set[Piece]) -> Piece:
+        moves: list[Move] = sorted(
+            (Move.from_piece(piece) for piece in avail_moves), key=Move.encode
+        )
+        move: Optional[Move] = self.book_move()
+        if move is None or move not in moves:
+            move = self._search.search(
+                self._bot_game, self._time_limit, self._max_depth, moves
+            )
+        assert move is not None
+        return move.to_piece()
+
+    def choose_move(self) -> Piece:
+        """
+        Play the book move, if there is one, or else search for the
+        best move, without building a Piece for every available move.
+        Returns [Piece]: the piece to play
+        """
+        move: Optional[Move] = self.book_move()
+        if move is None:
+            move = self._search.search(
+                self._bot_game, self._time_limit, self._max_depth
+            )
+        assert move is not None
+        return move.to_piece()
+
+    def think(self, game: Blokus, deadline: float, best: BestMove) -> None:
+        """
+        Offer the book move, if there is one, or else search until
+        the deadline, offering each better move as it is found.
+        """
+        move: Optional[Move] = self.book_move(game)
+        if move is None:
+            move = self._search.search(
+                game,
+                deadline - time.perf_counter(),
+                self._max_depth,
+                report=best.offer,
+            )
+        best.offer(move)
+
+    def stats(self) -> dict[str, float]:
+        self.finish_thinking()
+        return {
+            "nodes": self._search.nodes,
+            "cutoffs": self._search.cutoffs,
+            "table_hits": self._search.table_hits,
+            "seconds": self._search.seconds,
+            "book_moves": self._book_moves,
+        }
+
+
+class EndgamePlayer(Player):
+    """
+    A mixin that makes a player of any strategy play perfectly over
+    the last few plies of the game, by solving the rest of the game
+    exactly (see endgame.py) once few enough moves seem to be left.
+    Use with_endgame to add it to a strategy.
+    """
+
+    OPTIONS = ("endgame_plies", "endgame_nodes")
+
+    # The plies left (at most) and the size of search at which the
+    # solver takes over, when not given
+    DEFAULT_PLIES = 6
+    DEFAULT_NODES = 20000
+
+    _solver: EndgameSolver
+    _endgame_plies: int
+
+    def __init__(
+        self,
+        bot_game: Blokus,
+        player: int,
+        rng: Optional[random.Random] = None,
+        endgame_plies: Optional[int] = None,
+        endgame_nodes: Optional[int] = None,
+        **options: Any,
+    ):
+        """
+        Constructor
+        Inputs:
+            bot_game, player, rng: as for Player
+            endgame_plies [Optional[int]]: try to solve the game when
+                at most this many plies seem to be left
+            endgame_nodes [Optional[int]]: the most positions one
+                attempt to solve the game may visit
+            options: the settings of the strategy it is mixed into
+        """
+        super().__init__(bot_game, player, rng, **options)
+        self._endgame_plies = (
+            endgame_plies if endgame_plies is not None else self.DEFAULT_PLIES
+        )
+        self._solver = EndgameSolver(
+            endgame_nodes if endgame_nodes is not None else self.DEFAULT_NODES
+        )
+
+    def plies_left(self, game: Optional[Blokus] = None) -> int:
+        """
+        Estimate how many plies are left in a game (the player's game
+        if None): the number of shapes that the players still in
+        could place right now.
+        """
+        game = game or self._bot_game
+        plies: int = 0
+        for player in range(1, game.num_players + 1):
+            if player not in game.retired_players:
+                counts = game.count_available_moves(player, by_shape=True)
+                plies += sum(1 for count in counts.values() if count)
+        return plies
+
+    def choose_move(self) -> Piece:
+        """
+        Play the move that the endgame solver finds, if few enough
+        plies are left and it can solve the game, or else the move
+        of the strategy.
+        Returns [Piece]: the piece to play
+        """
+        if self.plies_left() <= self._endgame_plies:
+            result = self._solver.solve(self._bot_game)
+            if result is not None and result[0] is not None:
+                return result[0].to_piece()
+        return super().choose_move()
+
+    def think(self, game: Blokus, deadline: float, best: BestMove) -> None:
+        """
+        Offer the move that the endgame solver finds, as choose_move
+        does, or else think as the strategy does.
+        """
+        if self.plies_left(game) <= self._endgame_plies:
+            result = self._solver.solve(game)
+            if result is not None and result[0] is not None:
+                best.offer(result[0])
+                return
+        super().think(game, deadline, best)
+
+    def stats(self) -> dict[str, float]:
+        self.finish_thinking()
+        return {
+            **super().stats(),
+            "endgame_solved": self._solver.solved,
+            "endgame_abandoned": self._solver.abandoned,
+        }
+
+
+def with_endgame(bot: type[Player]) -> type[Player]:
+    """
+    Returns a strategy that plays like the given one, except that it
+    solves the endgame exactly (see EndgamePlayer).
+    Inputs:
+        bot [type[Player]]: the class of the players of the strategy
+    Returns [type[Player]]: the class of the new strategy's players,
+        which also accepts the EndgamePlayer settings
+    """
+    return type(
+        f"Endgame{bot.__name__}",
+        (EndgamePlayer, bot),
+        {"OPTIONS": EndgamePlayer.OPTIONS + bot.OPTIONS},
+    )
+
+
+# Strategies that can be chosen on the command line and in
+# tournaments, by name
+
+BOTS: dict[str, type[Player]] = {}
+
+
+def register_bot(name: str, bot: type[Player]) -> None:
+    """
+    Make a strategy available under the given name.
+    Inputs:
+        name [str]: the name of the strategy
+        bot [type[Player]]: the class of the players using it, which
+            must accept the same arguments as the Player constructor
+
+    Raises ValueError if the name is already taken.
+    """
+    if name in BOTS:
+        raise ValueError(f"There is already a bot called {name}")
+    BOTS[name] = bot
+
+
+register_bot("N", NBot)
+register_bot("S", SBot)
+register_bot("U", UBot)
+register_bot("M", MCTSBot)
+register_bot("A", SearchBot)
+register_bot("E", with_endgame(SearchBot))
+
+# Boards that games can be played on: the number of players, the
+# size and the start positions (the same as in gui.py, apart from
+# the original 11x11 board used by cmd)
+
+BOARDS: dict[str, tuple[int, int, set[Point]]] = {
+    "bot": (2, 11, {(0, 0), (10, 10)}),
+    "duo": (2, 14, {(3, 3), (8, 8)}),
+    "classic-2": (2, 20, {(0, 0), (19, 19), (0, 19), (19, 0)}),
+    "classic-3": (3, 20, {(0, 0), (19, 19), (0, 19), (19, 0)}),
+    "classic-4": (4, 20, {(0, 0), (19, 19), (0, 19), (19, 0)}),
+}
+
+
+def game_seed(seed: int, game: int) -> int:
+    """
+    Derive the seed of one game of a simulation from the seed of
+    the whole simulation, so that every game is reproducible on its
+    own, whichever process plays it.
+    Inputs:
+        seed [int]: the seed of the simulation
+        game [int]: the number of the game
+    Returns [int]: the seed of the game
+    """
+    return random.Random(f"{seed}-{game}").getrandbits(64)
+
+
+def play_game(player1: str, player2: str, seed: int) -> Optional[list[int]]:
+    """
+    Play one game between two bots on the 11x11 two-player board.
+    Inputs:
+        player1 [str]: the strategy of the first player ("S", "N" or "U")
+        player2 [str]: the strategy of the second player
+        seed [int]: the seed of the game
+    Returns [Optional[list[int]]]: the winners of the game
+    """
+    return play_seated_game([player1, player2], "bot", seed)
+
+
+def make_bot(
+    name: str,
+    bot_game: Blokus,
+    player: int,
+    rng: random.Random,
+    settings: Optional[dict[str, Any]] = None,
+) -> Player:
+    """
+    Create a player using a registered strategy.
+    Inputs:
+        name [str]: the name of the strategy
+        bot_game [Blokus]: the game to play in
+        player [int]: the player to play as
+        rng [random.Random]: the source of any random choices
+        settings [Optional[dict[str, Any]]]: keyword arguments for
+            the players of any strategy that accepts them (see
+            Player.OPTIONS); others, and those set to None, are
+            left out
+    Returns [Player]: the new player
+    """
+    bot: type[Player] = BOTS[name]
+    options: dict[str, Any] = {
+        key: value
+        for key, value in (settings or {}).items()
+        if key in bot.OPTIONS and value is not None
+    }
+    return bot(bot_game, player, rng, **options)
+
+
+@lru_cache(maxsize=None)
+def process_move_cache(max_entries: int) -> MoveCache:
+    """
+    Returns the move cache (see movecache.py) with the given number
+    of entries that is shared by every game played in this process.
+    """
+    return MoveCache(max_entries)
+
+
+def play_seated_game(
+    seats: list[str],
+    board: str,
+    seed: int,
+    settings: Optional[dict[str, Any]] = None,
+) -> Optional[list[int]]:
+    """
+    Play one game between bots on one of the BOARDS.
+    Inputs:
+        seats [list[str]]: the strategy of each player, in turn order
+        board [str]: the name of the board
+        seed [int]: the seed of the game
+        settings [Optional[dict[str, Any]]]: settings for the bots
+            (see make_bot), "move_time": if given, the most
+            seconds a bot may take per move (see Player.timed_move),
+            and "move_cache": if given, the number of entries of a
+            cache of generated moves for the game to consult (see
+            process_move_cache)
+    Returns [Optional[list[int]]]: the winners of the game
+
+    Raises ValueError if there is not one strategy per player.
+    """
+    return run_game(seats, board, seed, settings)[0]
+
+
+def run_game(
+    seats: list[str],
+    board: str,
+    seed: int,
+    settings: Optional[dict[str, Any]] = None,
+) -> tuple[Optional[list[int]], list[dict[str, float]]]:
+    """
+    Play one game as play_seated_game does, and also return the
+    statistics of each player (see Player.stats), in seat order.
+    """
+    num_players, size, start_positions = BOARDS[board]
+    if len(seats) != num_players:
+        raise ValueError(f"{board} needs {num_players} players")
+    rng: random.Random = random.Random(seed)
+    bot_game: Blokus = Blokus(num_players, size, start_positions)
+    bots: list[Player] = [
+        make_bot(name, bot_game, player, rng, settings)
+        for player, name in enumerate(seats, 1)
+    ]
+    budget: Optional[float] = (settings or {}).get("move_time")
+    cache_entries: Optional[int] = (settings or {}).get("move_cache")
+    if cache_entries:
+        bot_game.move_cache = process_move_cache(cache_entries)
+
+    while not bot_game.game_over:
+        for bot in bots:
+            bot.make_move(budget)
+    return bot_game.winners, [bot.stats() for bot in bots]
+
+
+def play_games(
+    player1: str,
+    player2: str,
+    num_games: int,
+    seed: int,
+    workers: int = 1,
+    settings: Optional[dict[str, Any]] = None,
+    stats: Optional[list[dict[str, float]]] = None,
+) -> list[Optional[list[int]]]:
+    """
+    Play a number of games between two bots, spread over a pool of
+    worker processes. Game i is played with game_seed(seed, i), so
+    the results depend only on the seed, not on the number of workers
+    (unless a bot is given a time limit).
+    Inputs:
+        player1 [str]: the strategy of the first player
+        player2 [str]: the strategy of the second player
+        num_games [int]: the number of games to play
+        seed [int]: the seed of the simulation
+        workers [int]: the number of processes to play games in
+        settings [Optional[dict[str, Any]]]: settings for the bots
+            (see make_bot)
+        stats [Optional[list[dict[str, float]]]]: if given, the
+            statistics of each player, summed over all games, are
+            added to this list
+    Returns [list[Optional[list[int]]]]: the winners of each game
+    """
+    seeds: list[int] = [game_seed(seed, i) for i in range(num_games)]
+    seats: list[list[str]] = [[player1, player2]] * num_games
+    boards: list[str] = ["bot"] * num_games
+    every: list[Optional[dict[str, Any]]] = [settings] * num_games
+    if workers <= 1:
+        games = list(map(run_game, seats, boards, seeds, every))
+    else:
+        chunksize: int = max(1, num_games // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            games = list(
+                pool.map(run_game, seats, boards, seeds, every, chunksize=chunksize)
+            )
+
+    if stats is not None:
+        totals: list[dict[str, float]] = [{}, {}]
+        for _, game_stats in games:
+            for total, player_stats in zip(totals, game_stats):
+                for key, value in player_stats.items():
+                    total[key] = total.get(key, 0) + value
+        stats.extend(totals)
+    return [winners for winners, _ in games]
 
 # Set up command line interface
 
@@ -135,47 +847,81 @@ class UBot(Player):
               type=int,
               default=20)
 @click.option("-1", "--player1",
-              type=click.Choice(["S", "N", "U"]),
+              type=click.Choice(list(BOTS)),
               default="N")
 @click.option("-2", "--player2",
-              type=click.Choice(["S", "N", "U"]),
+              type=click.Choice(list(BOTS)),
               required=True)
+@click.option("-w", "--workers",
+              type=click.IntRange(min=1),
+              default=1,
+              help="Number of processes to play games in")
+@click.option("-s", "--seed",
+              type=int,
+              default=None,
+              help="Seed that makes the results reproducible")
+@click.option("-t", "--time-limit",
+              type=float,
+              default=None,
+              help="Seconds per move for search bots")
+@click.option("-p", "--playouts",
+              type=click.IntRange(min=1),
+              default=None,
+              help="Playouts per move for search bots")
+@click.option("-d", "--max-depth",
+              type=click.IntRange(min=1),
+              default=None,
+              help="Deepest search for alpha-beta bots")
+@click.option("-m", "--move-time",
+              type=click.FloatRange(min=0, min_open=True),
+              default=None,
+              help="Most seconds a bot may take per move, enforced by the driver")
+@click.option("-c", "--move-cache",
+              type=click.IntRange(min=1),
+              default=None,
+              help="Entries in a cache of generated moves for each process")
+@click.option("--book/--no-book",
+              default=True,
+              help="Whether search bots play opening book moves")
 
 # Simulate games
-def cmd(num_games: int, player1: str, player2: str) -> None:
+def cmd(
+    num_games: int,
+    player1: str,
+    player2: str,
+    workers: int,
+    seed: Optional[int],
+    time_limit: Optional[float],
+    playouts: Optional[int],
+    max_depth: Optional[int],
+    move_time: Optional[float],
+    move_cache: Optional[int],
+    book: bool,
+) -> None:
 
     one_wins: int = 0
     two_wins: int = 0
     ties: int = 0
 
-    for i in range(num_games):
-
-        start_positions: set[Point] = set([(0,0),(10,10)])
-
-        bot_game: Blokus = Blokus(2, 11, start_positions)
-
-        if player1 == "S":
-            bot1: SBot = SBot(bot_game, 1)
-        elif player1 == "N":
-            bot1: NBot = NBot(bot_game, 1)
-        else:
-            bot1: UBot = UBot(bot_game, 1)
-
-        if player2 == "S":
-            bot2: SBot = SBot(bot_game, 2)
-        elif player2 == "N":
-            bot2: NBot = NBot(bot_game, 2)
-        else:
-            bot2: UBot = UBot(bot_game, 2) 
-
-        while not bot_game.game_over:
-            bot1.make_move()
-            bot2.make_move()
-                
-        if bot_game.winners is not None:
-            if len(bot_game.winners) > 1:
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+
+    settings: dict[str, Any] = {
+        "time_limit": time_limit,
+        "playouts": playouts,
+        "max_depth": max_depth,
+        "book": book,
+        "move_time": move_time,
+        "move_cache": move_cache,
+    }
+    stats: list[dict[str, float]] = []
+    for winners in play_games(
+        player1, player2, num_games, seed, workers, settings, stats
+    ):
+        if winners is not None:
+            if len(winners) > 1:
                 ties += 1
-            elif bot_game.winners[0] == 1:
+            elif winners[0] == 1:
                 one_wins += 1
             else:
                 two_wins += 1
@@ -183,8 +929,22 @@ def cmd(num_games: int, player1: str, player2: str) -> None:
     print(f"Bot 1 ({player1}) Wins |  {one_wins/num_games*100:.2f} %")
     print(f"Bot 2 ({player2}) Wins |  {two_wins/num_games*100:.2f} %")
     print(f"Ties       |  {ties/num_games*100:.2f} %")
+    for i, (name, player_stats) in enumerate(zip([player1, player2], stats), 1):
+        seconds: float = player_stats.get("seconds", 0)
+        if seconds and "playouts" in player_stats:
+            rate = player_stats["playouts"] / seconds
+            print(f"Bot {i} ({name}) |  {rate:.0f} playouts/s")
+        if seconds and "nodes" in player_stats:
+            rate = player_stats["nodes"] / seconds
+            cutoffs = player_stats["cutoffs"]
+            print(f"Bot {i} ({name}) |  {rate:.0f} nodes/s, {cutoffs:.0f} cutoffs")
+    if move_cache is not None and workers == 1:
+        # With more workers, the caches are in the worker processes
+        cache = process_move_cache(move_cache).stats()
+        print(
+            f"Move cache |  {cache['hits']} hits, {cache['misses']} misses,"
+            f" {cache['evictions']} evictions"
+        )
 
 if __name__ == "__main__":
     cmd()
-
-
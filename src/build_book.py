@@ -0,0 +1,114 @@
+"""
+Build the opening book used by the search bots (see book.py).
+
+For each standard layout (the boards in bot.BOARDS, which include
+the 11x11 board of bot.cmd and the duo and classic presets of the
+GUI, plus the GUI's one-player mono board), every position reached
+in fewer than --plies plies from the empty board is searched with
+search.Search, and the move it finds is stored in the book.
+
+Run from the src directory, for example:
+
+    python build_book.py --plies 2 --time-limit 0.25
+"""
+import time
+from typing import Optional
+
+import click
+
+from blokus import Blokus
+from book import BOOK_PATH, book_key, write_book
+from bot import BOARDS
+from move import Move
+from piece import Point
+from search import Search
+
+LAYOUTS: dict[str, tuple[int, int, set[Point]]] = {
+    **BOARDS,
+    "mono": (1, 11, {(4, 4)}),
+}
+
+
+def build_entries(
+    layout: tuple[int, int, set[Point]],
+    plies: int,
+    time_limit: float,
+    max_depth: Optional[int] = None,
+) -> dict[int, Move]:
+    """
+    Search every position of a layout within the first few plies.
+    Inputs:
+        layout [tuple[int, int, set[Point]]]: the number of players,
+            size and start positions of the board
+        plies [int]: positions reached in fewer plies than this
+            are searched
+        time_limit [float]: the time limit of each search
+        max_depth [Optional[int]]: the deepest search to run
+    Returns [dict[int, Move]]: the move found for each position,
+        by book key
+    """
+    num_players, size, start_positions = layout
+    entries: dict[int, Move] = {}
+    level: list[Blokus] = [Blokus(num_players, size, start_positions)]
+    search = Search()
+    for ply in range(plies):
+        following: list[Blokus] = []
+        for game in level:
+            key = book_key(game)
+            if key in entries or game.game_over:
+                continue
+            moves = game.legal_move_list()
+            if not moves:
+                continue
+            move = search.search(game, time_limit, max_depth, moves)
+            assert move is not None
+            entries[key] = move
+            if ply + 1 < plies:
+                for child_move in moves:
+                    child = game.fork()
+                    child.maybe_place(child_move)
+                    following.append(child)
+        level = following
+    return entries
+
+
+@click.command()
+@click.option("--layout", "layouts",
+              type=click.Choice(list(LAYOUTS)),
+              multiple=True,
+              help="Layout to include (all of them by default)")
+@click.option("--plies",
+              type=click.IntRange(min=1),
+              default=2,
+              help="Number of plies from the start that the book covers")
+@click.option("-t", "--time-limit",
+              type=float,
+              default=0.25,
+              help="Seconds to search each position")
+@click.option("-d", "--max-depth",
+              type=click.IntRange(min=1),
+              default=None,
+              help="Deepest search for each position")
+@click.option("-o", "--output",
+              type=click.Path(dir_okay=False),
+              default=BOOK_PATH,
+              help="The book file to write")
+def cmd(
+    layouts: tuple[str, ...],
+    plies: int,
+    time_limit: float,
+    max_depth: Optional[int],
+    output: str,
+) -> None:
+    entries: dict[int, Move] = {}
+    for name in layouts or LAYOUTS:
+        start = time.perf_counter()
+        found = build_entries(LAYOUTS[name], plies, time_limit, max_depth)
+        entries.update(found)
+        print(f"{name:10} | {len(found):5} positions | {time.perf_counter() - start:.0f} s")
+    write_book(output, entries)
+    print(f"Wrote {len(entries)} positions to {output}")
+
+
+if __name__ == "__main__":
+    cmd()
@@ -0,0 +1,170 @@
+"""
+Exact endgame solving for Blokus.
+
+Near the end of a game the players have few moves left, so the
+rest of the game tree is small enough to search completely. The
+solver does so with alpha-beta search, to find the move that
+maximizes the final margin of the player to move: their score
+(see Blokus.get_score) minus the best score among the others,
+assuming that every other player plays against them. Positions
+reached more than once (by playing the same moves in another
+order) are only searched once, by remembering results by
+position hash.
+
+A search that visits more than a given number of positions is
+abandoned, so the solver can be tried cheaply at every move and
+only takes over once the endgame is small enough.
+"""
+from typing import Optional
+
+from blokus import Blokus
+from move import Move
+from search import bound_kind, settles
+
+
+class _NodeLimit(Exception):
+    """
+    Raised inside the solver when it has visited too many positions.
+    """
+
+
+class EndgameSolver:
+    """
+    A solver that gives up on searches larger than a node limit,
+    with statistics about the work done so far across all searches.
+    """
+
+    node_limit: int
+    solved: int
+    abandoned: int
+    nodes: int
+    _count: int
+    _root: int
+    _memo: dict[int, tuple[int, int]]
+
+    def __init__(self, node_limit: int = 20000) -> None:
+        """
+        Constructor
+        Inputs:
+            node_limit [int]: the most positions one search may visit
+        """
+        self.node_limit = node_limit
+        self.solved = 0
+        self.abandoned = 0
+        self.nodes = 0
+        self._count = 0
+        self._root = 0
+        self._memo = {}
+
+    def solve(self, game: Blokus) -> Optional[tuple[Optional[Move], int]]:
+        """
+        Search the rest of the game from its current position (which
+        is not changed).
+        Inputs:
+            game [Blokus]: the game to solve
+        Returns [Optional[tuple[Optional[Move], int]]]: None if the
+            search was abandoned, and otherwise the best move (None
+            if the player to move must retire) and the final margin
+            it leads to
+
+        Raises ValueError if the game is over.
+        """
+        if game.game_over:
+            raise ValueError("Game is over")
+        self._root = game.curr_player
+        self._count = 0
+        self._memo = {}
+        board = game.fork()
+        try:
+            moves = board.legal_move_list()
+            if not moves:
+                board.retire()
+                result: tuple[Optional[Move], int] = (None, self._value(board))
+            else:
+                result = self._solve_root(board, moves)
+        except _NodeLimit:
+            self.abandoned += 1
+            return None
+        finally:
+            self.nodes += self._count
+            self._memo = {}
+        self.solved += 1
+        return result
+
+    def _solve_root(self, game: Blokus, moves: list[Move]) -> tuple[Move, int]:
+        """
+        Returns the best of the moves and its margin.
+        """
+        best = moves[0]
+        best_value = None
+        for move in sorted(moves, key=lambda move: -move.size):
+            game.maybe_place(move)
+            alpha = best_value if best_value is not None else -(1 << 30)
+            value = self._alphabeta(game, alpha, 1 << 30)
+            game.undo()
+            if best_value is None or value > best_value:
+                best, best_value = move, value
+        assert best_value is not None
+        return best, best_value
+
+    def _value(self, game: Blokus) -> int:
+        """
+        Returns the exact margin of the position for the root player.
+        """
+        return self._alphabeta(game, -(1 << 30), 1 << 30)
+
+    def _margin(self, game: Blokus) -> int:
+        """
+        Returns the root player's score minus the best of the other
+        players' scores.
+        """
+        others = [
+            game.get_score(player)
+            for player in range(1, game.num_players + 1)
+            if player != self._root
+        ]
+        return game.get_score(self._root) - max(others, default=0)
+
+    def _alphabeta(self, game: Blokus, alpha: int, beta: int) -> int:
+        """
+        Returns the margin of the position for the root player, if
+        it lies between alpha and beta (otherwise a bound on it).
+        """
+        self._count += 1
+        if self._count > self.node_limit:
+            raise _NodeLimit
+        if game.game_over:
+            return self._margin(game)
+
+        key = game.position_hash
+        remembered = self._memo.get(key)
+        if remembered is not None:
+            value, kind = remembered
+            if settles(value, kind, alpha, beta):
+                return value
+
+        moves = game.legal_move_list()
+        if not moves:
+            game.retire()
+            value = self._alphabeta(game, alpha, beta)
+            game.undo()
+            return value
+
+        maximizing = game.curr_player == self._root
+        original_alpha, original_beta = alpha, beta
+        best = -(1 << 30) if maximizing else 1 << 30
+        for move in sorted(moves, key=lambda move: -move.size):
+            game.maybe_place(move)
+            value = self._alphabeta(game, alpha, beta)
+            game.undo()
+            if maximizing:
+                best = max(best, value)
+                alpha = max(alpha, value)
+            else:
+                best = min(best, value)
+                beta = min(beta, value)
+            if alpha >= beta:
+                break
+
+        self._memo[key] = (best, bound_kind(best, original_alpha, original_beta))
+        return best
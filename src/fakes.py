@@ -8,6 +8,7 @@ from typing import Optional
 from shape_definitions import ShapeKind
 from piece import Point, Shape, Piece
 from base import BlokusBase, Grid
+from orientations import SHAPES
 
 import shape_definitions
 import piece
@@ -318,7 +319,7 @@ class BlokusFake(BlokusBase):
 
         self._shapes_left = {}
         for player in range(1, self._num_players + 1):
-            self._shapes_left[player] = set(self.shapes.keys())
+            self._shapes_left[player] = set(SHAPES.keys())
         
     #
     # PROPERTIES
@@ -338,12 +339,12 @@ class BlokusFake(BlokusBase):
         origin at the middle (third) square.
 
         See shape_definitions.py for more details.
+
+        The shapes are copies of the shared registry in
+        orientations.SHAPES (which is parsed once per process),
+        so callers are free to transform them.
         """
-        shapes = {}
-        for kind, string in shape_definitions.definitions.items():
-            working_shape = Shape.from_string(kind, string)
-            shapes[kind] = working_shape
-        return shapes
+        return {kind: shape.copy() for kind, shape in SHAPES.items()}
 
     @property
     def size(self) -> int:
@@ -609,9 +610,7 @@ class BlokusFake(BlokusBase):
         """
         score: int = 0
         for shape in self._shapes_left[player]:
-            str = shape_definitions.definitions[shape]
-            working_shape = Shape.from_string(shape, str)
-            score -= len(working_shape.squares)
+            score -= len(SHAPES[shape].squares)
         return score
 
     def available_moves(self) -> set[Piece]:
@@ -638,7 +637,7 @@ class BlokusFake(BlokusBase):
  
         for shapekind in self._shapes_left[self._curr_player]:
             for empty_square in empty_squares:
-                maybe_piece: Piece = Piece(self.shapes[shapekind])
+                maybe_piece: Piece = Piece(SHAPES[shapekind])
                 maybe_piece.set_anchor(empty_square)
                 if self.legal_to_place(maybe_piece) and piece not in avail_moves:
                     avail_moves.add(maybe_piece)
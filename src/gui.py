@@ -3,9 +3,11 @@ import sys
 import random
 import click
 from typing import Any
-from shape_definitions import ShapeKind, definitions
-from piece import Point, Shape, Piece
+from shape_definitions import ShapeKind
+from piece import Point, Piece
 from blokus import Blokus
+from bot import BOTS, Player, make_bot
+from orientations import SHAPES, ORIENTATIONS, orientation_index, orientation_piece
 
 import pygame
 import pygame.gfxdraw
@@ -20,13 +22,19 @@ FONT_SIZE: int = 0
 FONT_SPACING: int = 0
 players: int = 0
 start_positions: set[Point] = set()
+bot_seats: dict[int, str] = {}
+MOVE_TIME: float = 1.0
 
 @click.command()
 @click.option('--game', type=str)
 @click.option('--num-players', '-n', default=2, type=int)
 @click.option('--size', '-s', default=14, type=int)
 @click.option('--start-position', '-p', multiple=True, nargs=2, type=(int, int))
-def assign_specs(game, num_players, size, start_position) -> None:
+@click.option('--bot', '-b', multiple=True, type=(int, click.Choice(list(BOTS))),
+              help='A player number and the bot strategy that plays it')
+@click.option('--move-time', '-t', default=1.0, type=click.FloatRange(min=0, min_open=True),
+              help='Most seconds a bot may take per move')
+def assign_specs(game, num_players, size, start_position, bot, move_time) -> None:
     """
         Uses the click library to assign the specifications of the board given
         by the command line.
@@ -36,8 +44,13 @@ def assign_specs(game, num_players, size, start_position) -> None:
             num_players: int
             size: int
             start_position: tuple(int, int)
+            bot: tuple(tuple(int, String))
+            move_time: float
     """
-    global SCREEN_SIZE, FONT_SIZE, players, start_positions, last_anchor
+    global SCREEN_SIZE, FONT_SIZE, players, start_positions, last_anchor, MOVE_TIME
+    for player, name in bot:
+        bot_seats[player] = name
+    MOVE_TIME = move_time
     if game == "duo":
         SCREEN_SIZE = 14
         FONT_SIZE = 20
@@ -97,6 +110,11 @@ player_font = pygame.font.Font(None, size=SQUARE_SIZE)
 pygame.display.set_caption("Blokus")
 
 board: Blokus = Blokus(players, SCREEN_SIZE, start_positions)
+bots: dict[int, Player] = {
+    player: make_bot(name, board, player, random.Random())
+    for player, name in bot_seats.items()
+    if 1 <= player <= players
+}
 
 piece_colors: list[Color] = [(135, 81, 176), (156, 36, 54), (56, 177, 181), (57, 135, 65)]
 player_colors: dict[int, Color] = {}
@@ -123,7 +141,7 @@ def draw_piece_bank(selected_piece: Piece) -> None:
         player_color: Color = player_colors[player]
 
         y_counter: int = 0
-        for shape in board.shapes:
+        for shape in SHAPES:
             shape_string = shape.value
             text_y_coord = (SQUARE_SIZE * 1.3) + (y_counter * FONT_SPACING) + (y_counter * FONT_SIZE)
             if shape == selected_piece.shape.kind and player == board.curr_player:
@@ -189,10 +207,11 @@ def update_board(selected_piece: Piece) -> None:
         pygame.gfxdraw.filled_circle(SCREEN, c, r, rad, START_POSITION_COLOR)
     
     #updates the already placed pieces
-    for r in range(len(board._grid)):
-        for c in range(len(board._grid)):
-            if board._grid[r][c] is not None:
-                player, kind = board._grid[r][c]
+    grid = board.grid
+    for r in range(len(grid)):
+        for c in range(len(grid)):
+            if grid[r][c] is not None:
+                player, kind = grid[r][c]
                 piece_color = player_colors[player]
                 piece_rect = pygame.Rect(c * SQUARE_SIZE,  r * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE)
                 pygame.draw.rect(SCREEN, piece_color, piece_rect)
@@ -214,7 +233,7 @@ def update_board(selected_piece: Piece) -> None:
     #updates surrounding cells
     for r in range(0, SCREEN_SIZE):
         for c in range(0, SCREEN_SIZE):
-            if (r, c) not in selected_piece_coords and (r, c) not in start_positions and board._grid[r][c] is None:
+            if (r, c) not in selected_piece_coords and (r, c) not in start_positions and grid[r][c] is None:
                 rect = pygame.Rect(c * SQUARE_SIZE,  r * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE)
                 pygame.draw.rect(SCREEN, SQUARE_COLOR, rect)
                 pygame.gfxdraw.rectangle(SCREEN, rect, SCREEN_COLOR)
@@ -228,11 +247,27 @@ def game_loop(piece_anchor: Point) -> None:
     """
     run: bool = True
 
+    if board.curr_player in bots:
+        # The bot thinks in another thread, for at most MOVE_TIME
+        # seconds, while the window keeps handling events
+        if board.has_any_move():
+            move = bots[board.curr_player].timed_move(MOVE_TIME, pygame.event.pump)
+            board.maybe_place(move)
+        else:
+            board.retire()
+        hidden_piece: Piece = Piece(SHAPES[ShapeKind.ONE])
+        hidden_piece.set_anchor((SCREEN_SIZE, SCREEN_SIZE))
+        update_board(hidden_piece)
+        pygame.display.update()
+        if not board.game_over:
+            game_loop(piece_anchor)
+            return
+
     if board.curr_player > 0: 
         current_player = board.curr_player
         pieces_left: list[ShapeKind] = board.remaining_shapes(current_player)
         random_shapekind: ShapeKind = random.choice(pieces_left)
-        current_piece: Piece = Piece(Shape.from_string(random_shapekind, definitions[random_shapekind]))
+        current_piece: Piece = Piece(SHAPES[random_shapekind])
         piece_anchor: Point = piece_anchor
         current_piece.set_anchor(piece_anchor)
         r, c = current_piece.anchor
@@ -251,87 +286,87 @@ def game_loop(piece_anchor: Point) -> None:
                     pygame.display.quit()
                 if event.key == pygame.K_1:
                     if ShapeKind.ONE in board.remaining_shapes(current_player):
-                        current_piece = Piece(Shape.from_string(ShapeKind.ONE, definitions[ShapeKind.ONE]))
+                        current_piece = Piece(SHAPES[ShapeKind.ONE])
                         current_piece.set_anchor(piece_anchor)
                 if event.key == pygame.K_2:
                     if ShapeKind.TWO in board.remaining_shapes(current_player):
-                        current_piece = Piece(Shape.from_string(ShapeKind.TWO, definitions[ShapeKind.TWO]))
+                        current_piece = Piece(SHAPES[ShapeKind.TWO])
                         current_piece.set_anchor(piece_anchor)
                 if event.key == pygame.K_3:
                     if ShapeKind.THREE in board.remaining_shapes(current_player):
-                        current_piece = Piece(Shape.from_string(ShapeKind.THREE, definitions[ShapeKind.THREE]))
+                        current_piece = Piece(SHAPES[ShapeKind.THREE])
                         current_piece.set_anchor(piece_anchor)
                 if event.key == pygame.K_4:
                     if ShapeKind.FOUR in board.remaining_shapes(current_player):
-                        current_piece = Piece(Shape.from_string(ShapeKind.FOUR, definitions[ShapeKind.FOUR]))
+                        current_piece = Piece(SHAPES[ShapeKind.FOUR])
                         current_piece.set_anchor(piece_anchor)
                 if event.key == pygame.K_5:
                     if ShapeKind.FIVE in board.remaining_shapes(current_player):
-                        current_piece = Piece(Shape.from_string(ShapeKind.FIVE, definitions[ShapeKind.FIVE]))
+                        current_piece = Piece(SHAPES[ShapeKind.FIVE])
                         current_piece.set_anchor(piece_anchor)
                 if event.key == pygame.K_7:
                     if ShapeKind.SEVEN in board.remaining_shapes(current_player):
-                        current_piece = Piece(Shape.from_string(ShapeKind.SEVEN, definitions[ShapeKind.SEVEN]))
+                        current_piece = Piece(SHAPES[ShapeKind.SEVEN])
                         current_piece.set_anchor(piece_anchor)
                 if event.key == pygame.K_a:
                     if ShapeKind.A in board.remaining_shapes(current_player):
-                        current_piece = Piece(Shape.from_string(ShapeKind.A, definitions[ShapeKind.A]))
+                        current_piece = Piece(SHAPES[ShapeKind.A])
                         current_piece.set_anchor(piece_anchor)
                 if event.key == pygame.K_c:
                     if ShapeKind.C in board.remaining_shapes(current_player):
-                        current_piece = Piece(Shape.from_string(ShapeKind.C, definitions[ShapeKind.C]))
+                        current_piece = Piece(SHAPES[ShapeKind.C])
                         current_piece.set_anchor(piece_anchor)
                 if event.key == pygame.K_f:
                     if ShapeKind.F in board.remaining_shapes(current_player):
-                        current_piece = Piece(Shape.from_string(ShapeKind.F, definitions[ShapeKind.F]))
+                        current_piece = Piece(SHAPES[ShapeKind.F])
                         current_piece.set_anchor(piece_anchor)
                 if event.key == pygame.K_s:
                     if ShapeKind.S in board.remaining_shapes(current_player):
-                        current_piece = Piece(Shape.from_string(ShapeKind.S, definitions[ShapeKind.S]))
+                        current_piece = Piece(SHAPES[ShapeKind.S])
                         current_piece.set_anchor(piece_anchor)
                 if event.key == pygame.K_l: 
                     if ShapeKind.L in board.remaining_shapes(current_player):
-                        current_piece = Piece(Shape.from_string(ShapeKind.L, definitions[ShapeKind.L]))
+                        current_piece = Piece(SHAPES[ShapeKind.L])
                         current_piece.set_anchor(piece_anchor)
                 if event.key == pygame.K_n: 
                     if ShapeKind.N in board.remaining_shapes(current_player):
-                        current_piece = Piece(Shape.from_string(ShapeKind.N, definitions[ShapeKind.N]))
+                        current_piece = Piece(SHAPES[ShapeKind.N])
                         current_piece.set_anchor(piece_anchor)
                 if event.key == pygame.K_o: 
                     if ShapeKind.LETTER_O in board.remaining_shapes(current_player):
-                        current_piece = Piece(Shape.from_string(ShapeKind.LETTER_O, definitions[ShapeKind.LETTER_O]))
+                        current_piece = Piece(SHAPES[ShapeKind.LETTER_O])
                         current_piece.set_anchor(piece_anchor)
                 if event.key == pygame.K_p: 
                     if ShapeKind.P in board.remaining_shapes(current_player):
-                        current_piece = Piece(Shape.from_string(ShapeKind.P, definitions[ShapeKind.P]))
+                        current_piece = Piece(SHAPES[ShapeKind.P])
                         current_piece.set_anchor(piece_anchor)
                 if event.key == pygame.K_t: 
                     if ShapeKind.T in board.remaining_shapes(current_player):
-                        current_piece = Piece(Shape.from_string(ShapeKind.T, definitions[ShapeKind.T]))
+                        current_piece = Piece(SHAPES[ShapeKind.T])
                         current_piece.set_anchor(piece_anchor)
                 if event.key == pygame.K_u: 
                     if ShapeKind.U in board.remaining_shapes(current_player):
-                        current_piece = Piece(Shape.from_string(ShapeKind.U, definitions[ShapeKind.U]))
+                        current_piece = Piece(SHAPES[ShapeKind.U])
                         current_piece.set_anchor(piece_anchor)
                 if event.key == pygame.K_v: 
                     if ShapeKind.V in board.remaining_shapes(current_player):
-                        current_piece = Piece(Shape.from_string(ShapeKind.V, definitions[ShapeKind.V]))
+                        current_piece = Piece(SHAPES[ShapeKind.V])
                         current_piece.set_anchor(piece_anchor)
                 if event.key == pygame.K_w: 
                     if ShapeKind.W in board.remaining_shapes(current_player):
-                        current_piece = Piece(Shape.from_string(ShapeKind.W, definitions[ShapeKind.W]))
+                        current_piece = Piece(SHAPES[ShapeKind.W])
                         current_piece.set_anchor(piece_anchor)
                 if event.key == pygame.K_x: 
                     if ShapeKind.X in board.remaining_shapes(current_player):
-                        current_piece = Piece(Shape.from_string(ShapeKind.X, definitions[ShapeKind.X]))
+                        current_piece = Piece(SHAPES[ShapeKind.X])
                         current_piece.set_anchor(piece_anchor) 
                 if event.key == pygame.K_y: 
                     if ShapeKind.Y in board.remaining_shapes(current_player):
-                        current_piece = Piece(Shape.from_string(ShapeKind.Y, definitions[ShapeKind.Y]))
+                        current_piece = Piece(SHAPES[ShapeKind.Y])
                         current_piece.set_anchor(piece_anchor) 
                 if event.key == pygame.K_z: 
                     if ShapeKind.Z in board.remaining_shapes(current_player):
-                        current_piece = Piece(Shape.from_string(ShapeKind.Z, definitions[ShapeKind.Z]))
+                        current_piece = Piece(SHAPES[ShapeKind.Z])
                         current_piece.set_anchor(piece_anchor)
                 if event.key == pygame.K_UP:
                     current_piece.set_anchor((r - 1, c))
@@ -375,6 +410,13 @@ def game_loop(piece_anchor: Point) -> None:
                     current_piece.rotate_left()
                 if event.key == pygame.K_SPACE:
                     current_piece.flip_horizontally()
+                if event.key == pygame.K_TAB:
+                    kind = current_piece.shape.kind
+                    index = orientation_index(kind, current_piece.shape.squares)
+                    if index is None:
+                        index = -1
+                    index = (index + 1) % len(ORIENTATIONS[kind])
+                    current_piece = orientation_piece(kind, index, (r, c))
                 if event.key == pygame.K_q:
                     board.retire()
                 if event.key == pygame.K_RETURN:
@@ -401,7 +443,7 @@ def game_loop(piece_anchor: Point) -> None:
             else:
                 winners_text = player_font.render(f'the winner is player {winners}!', False, (0, 0, 0))
             SCREEN.blit(winners_text, (((SCREEN_SIZE * SQUARE_SIZE)) // 2 - (((SCREEN_SIZE * SQUARE_SIZE)) // 4), (((SCREEN_SIZE * SQUARE_SIZE)) // 2)))
-            current_piece = Piece(Shape.from_string(ShapeKind.ONE, definitions[ShapeKind.ONE]))
+            current_piece = Piece(SHAPES[ShapeKind.ONE])
             current_piece.set_anchor((SCREEN_SIZE // 2, SCREEN_SIZE // 2))
             pygame.display.update() 
 
@@ -0,0 +1,252 @@
+"""
+Monte Carlo Tree Search for Blokus.
+
+MCTS grows a tree of positions from the current one. Each
+iteration walks down the tree choosing children with the UCT rule,
+adds one new child, plays the game from there to the end with
+uniformly random moves (see playout.py), and credits the result to every node on
+the path. The move played is the most visited child of the root.
+
+Games with more than two players are handled by keeping a reward
+per player in every node: a player choosing a move looks at their
+own reward. A game's reward is 1 for a sole winner, shared equally
+between tied winners.
+
+The tree is kept between searches, so the part of it below the
+position reached when the search is next called is reused.
+"""
+import math
+import random
+import time
+from typing import Callable, Optional
+
+from blokus import Blokus
+from move import Move
+from playout import playout
+
+# How much UCT favors rarely visited children over good ones
+EXPLORATION = 1.4
+
+# Number of iterations between reports of the best move so far
+REPORT_EVERY = 32
+
+
+class Node:
+    """
+    A position in the search tree, reached by playing move (None
+    for a retirement) in the position of its parent.
+    """
+
+    __slots__ = (
+        "move",
+        "parent",
+        "children",
+        "untried",
+        "player",
+        "position_hash",
+        "visits",
+        "rewards",
+    )
+
+    move: Optional[Move]
+    parent: Optional["Node"]
+    children: list["Node"]
+    untried: list[Optional[Move]]
+    player: int
+    position_hash: int
+    visits: int
+    rewards: list[float]
+
+    def __init__(
+        self,
+        move: Optional[Move],
+        parent: Optional["Node"],
+        game: Blokus,
+        rng: random.Random,
+    ) -> None:
+        """
+        Create the node for the current position of game. Its moves
+        are tried largest shape first (in random order within a size),
+        since those are usually the best ones in Blokus.
+        """
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.player = game.curr_player
+        self.position_hash = game.position_hash
+        self.visits = 0
+        self.rewards = [0.0] * (game.num_players + 1)
+        if game.game_over:
+            self.untried = []
+            return
+        moves = game.legal_move_list()
+        if not moves:
+            self.untried = [None]
+            return
+        rng.shuffle(moves)
+        # Popped from the end, so the largest shapes go last
+        moves.sort(key=lambda move: move.size)
+        self.untried = list(moves)
+
+    def best_child(self, exploration: float) -> "Node":
+        """
+        Returns the child with the highest UCT value for the player
+        choosing a move here.
+        """
+        log_visits = math.log(self.visits)
+        player = self.player
+
+        def uct(child: Node) -> float:
+            mean = child.rewards[player] / child.visits
+            return mean + exploration * math.sqrt(log_visits / child.visits)
+
+        return max(self.children, key=uct)
+
+
+def play(game: Blokus, move: Optional[Move]) -> None:
+    """
+    Play a move of the search tree (None for a retirement).
+    """
+    if move is None:
+        game.retire()
+    else:
+        game.maybe_place(move)
+
+
+def score_rewards(scores: list[int]) -> list[float]:
+    """
+    Returns the reward of each player given their final scores
+    (indexed by player number, as returned by playout.playout):
+    the players with the highest score share a reward of 1.
+    """
+    best = max(scores[1:])
+    winners = [p for p in range(1, len(scores)) if scores[p] == best]
+    result = [0.0] * len(scores)
+    for winner in winners:
+        result[winner] = 1 / len(winners)
+    return result
+
+
+class MCTS:
+    """
+    A UCT search that keeps its tree from one search to the next.
+    """
+
+    _rng: random.Random
+    _exploration: float
+    _root: Optional[Node]
+    playouts: int
+    seconds: float
+
+    def __init__(
+        self, rng: Optional[random.Random] = None, exploration: float = EXPLORATION
+    ) -> None:
+        """
+        Constructor
+        Inputs:
+            rng [Optional[random.Random]]: the source of random moves
+            exploration [float]: the UCT exploration constant
+        """
+        self._rng = rng if rng is not None else random.Random()
+        self._exploration = exploration
+        self._root = None
+        self.playouts = 0
+        self.seconds = 0.0
+
+    def search(
+        self,
+        game: Blokus,
+        time_limit: Optional[float] = None,
+        playouts: Optional[int] = None,
+        report: Optional[Callable[[Optional[Move]], None]] = None,
+    ) -> Optional[Move]:
+        """
+        Search from the current position of the game (which is not
+        changed) until the time limit has passed or the given number
+        of playouts have been played, whichever comes first.
+        Inputs:
+            game [Blokus]: the game to search
+            time_limit [Optional[float]]: the time limit in seconds
+            playouts [Optional[int]]: the number of playouts
+            report [Optional[Callable[[Optional[Move]], None]]]:
+                called with the most visited move so far every
+                REPORT_EVERY iterations
+        Returns [Optional[Move]]: the most visited move, or None if
+            the player to move has no moves and must retire
+
+        Raises ValueError if neither limit is given, or if the game
+        is over.
+        """
+        if time_limit is None and playouts is None:
+            raise ValueError("Need a time limit or a number of playouts")
+        if game.game_over:
+            raise ValueError("Game is over")
+
+        start = time.perf_counter()
+        deadline = None if time_limit is None else start + time_limit
+        root = self._reuse(game)
+        base = game.fork()
+        done = 0
+        while playouts is None or done < playouts:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            self._iterate(root, base.fork())
+            done += 1
+            if report is not None and done % REPORT_EVERY == 0:
+                report(self._most_visited(root))
+        self.playouts += done
+        self.seconds += time.perf_counter() - start
+        return self._most_visited(root)
+
+    def _most_visited(self, root: Node) -> Optional[Move]:
+        """
+        Returns the move of the most visited child of the root (or
+        the first move to try, if it has no children yet).
+        """
+        if not root.children:
+            return root.untried[-1]
+        return max(root.children, key=lambda child: child.visits).move
+
+    def _reuse(self, game: Blokus) -> Node:
+        """
+        Returns the node of the current position of the game, made
+        the new root: a node of the existing tree if the position
+        is among the first few plies below the old root, and a new
+        node otherwise.
+        """
+        if self._root is not None:
+            target = game.position_hash
+            level = [self._root]
+            for _ in range(game.num_players + 2):
+                for node in level:
+                    if node.position_hash == target:
+                        node.parent = None
+                        self._root = node
+                        return node
+                level = [child for node in level for child in node.children]
+        self._root = Node(None, None, game, self._rng)
+        return self._root
+
+    def _iterate(self, root: Node, game: Blokus) -> None:
+        """
+        Run one iteration of the search on game, a copy of the root
+        position: select, expand, play out and back up.
+        """
+        node = root
+        while not node.untried and node.children:
+            node = node.best_child(self._exploration)
+            play(game, node.move)
+        if node.untried:
+            move = node.untried.pop()
+            play(game, move)
+            child = Node(move, node, game, self._rng)
+            node.children.append(child)
+            node = child
+
+        result = score_rewards(playout(game, self._rng))
+        current: Optional[Node] = node
+        while current is not None:
+            current.visits += 1
+            for player, reward in enumerate(result):
+                current.rewards[player] += reward
+            current = current.parent
@@ -0,0 +1,132 @@
+"""
+Compact, immutable Blokus moves.
+
+A Piece owns a private, transformable copy of its Shape, which
+makes it a heavy way to describe a candidate move. A Move just
+names a shape, one of its precomputed orientations (an index
+into orientations.ORIENTATIONS[kind]) and an anchor. Moves are
+hashable and compare by value, so equal placements collapse in
+a set, and they can be converted to a Piece when one is needed.
+"""
+from typing import Optional
+
+from shape_definitions import ShapeKind
+from piece import Point, Piece
+from orientations import ORIENTATIONS, SHAPE_SIZES, locate, orientation_piece
+
+# Moves can also be packed into a single non-negative int (see
+# Move.encode): 5 bits for the shape, 3 for the orientation and
+# 8 each for the anchor's row and column (offset by ANCHOR_OFFSET,
+# since an anchor can lie just outside the board).
+_KINDS: list[ShapeKind] = list(ShapeKind)
+_KIND_INDEX: dict[ShapeKind, int] = {kind: i for i, kind in enumerate(_KINDS)}
+ANCHOR_OFFSET = 2
+
+
+class Move:
+    """
+    A placement of a shape: kind, orientation (an index into
+    ORIENTATIONS[kind]) and anchor. Moves are immutable.
+    """
+
+    __slots__ = ("kind", "orientation", "anchor")
+
+    kind: ShapeKind
+    orientation: int
+    anchor: Point
+
+    def __init__(self, kind: ShapeKind, orientation: int, anchor: Point) -> None:
+        """
+        Constructor
+
+        Raises ValueError if the shape has no such orientation.
+        """
+        if not 0 <= orientation < len(ORIENTATIONS[kind]):
+            raise ValueError(f"{kind} has no orientation {orientation}")
+        object.__setattr__(self, "kind", kind)
+        object.__setattr__(self, "orientation", orientation)
+        object.__setattr__(self, "anchor", anchor)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"Move attribute {name} is read-only")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Move):
+            return NotImplemented
+        return (
+            self.kind is other.kind
+            and self.orientation == other.orientation
+            and self.anchor == other.anchor
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.kind, self.orientation, self.anchor))
+
+    def __repr__(self) -> str:
+        return f"Move({self.kind}, {self.orientation}, {self.anchor})"
+
+    def __reduce__(self) -> tuple[type, tuple[ShapeKind, int, Point]]:
+        return (Move, (self.kind, self.orientation, self.anchor))
+
+    @property
+    def size(self) -> int:
+        """
+        Returns the number of squares the move covers.
+        """
+        return SHAPE_SIZES[self.kind]
+
+    def squares(self) -> list[Point]:
+        """
+        Returns the list of points the move covers.
+        """
+        r, c = self.anchor
+        return [
+            (r + dr, c + dc)
+            for dr, dc in ORIENTATIONS[self.kind][self.orientation].squares
+        ]
+
+    def to_piece(self) -> Piece:
+        """
+        Returns a new Piece that covers the same squares.
+        """
+        return orientation_piece(self.kind, self.orientation, self.anchor)
+
+    @staticmethod
+    def from_piece(piece: Piece) -> "Move":
+        """
+        Returns the Move that covers the same squares as a Piece.
+
+        Raises ValueError if the anchor of the piece is None.
+        """
+        if piece.anchor is None:
+            raise ValueError("Piece has no anchor")
+        located: Optional[tuple[int, Point]] = locate(
+            piece.shape.kind, piece.squares()
+        )
+        assert located is not None
+        index, anchor = located
+        return Move(piece.shape.kind, index, anchor)
+
+    def encode(self) -> int:
+        """
+        Returns the move packed into a 24-bit int. The anchor must
+        be within a 254 x 254 board (give or take ANCHOR_OFFSET).
+        """
+        r, c = self.anchor
+        return (
+            _KIND_INDEX[self.kind] << 19
+            | self.orientation << 16
+            | (r + ANCHOR_OFFSET) << 8
+            | (c + ANCHOR_OFFSET)
+        )
+
+    @staticmethod
+    def decode(code: int) -> "Move":
+        """
+        Returns the Move packed into an int by Move.encode.
+        """
+        return Move(
+            _KINDS[code >> 19],
+            (code >> 16) & 0b111,
+            (((code >> 8) & 0xFF) - ANCHOR_OFFSET, (code & 0xFF) - ANCHOR_OFFSET),
+        )
@@ -0,0 +1,139 @@
+"""
+A bounded cache of generated moves.
+
+The same positions come up again and again in tournaments and
+analysis (openings, and the same moves played in another order),
+and generating a player's moves from scratch each time is the
+most expensive thing Blokus does. A MoveCache remembers the moves
+of recently seen positions, keyed by position hash (see zobrist.py),
+the start positions (which the hash does not cover, but which
+decide a player's first moves), the player and the move generator
+that listed the moves (see Blokus.vectorized), since the order of
+the moves depends on it.
+
+The cache is bounded both by its number of entries and by an
+estimate of the memory they take; when either bound is exceeded,
+the least recently used entries are evicted. Counters of hits,
+misses and evictions show how well a size suits a workload.
+A cache can be used from several threads (such as bots thinking
+on forks of a game past their deadline, see bot.py).
+
+A game consults a cache when its move_cache attribute is set (see
+Blokus), and its forks share the cache.
+"""
+import sys
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from shape_definitions import ShapeKind
+from move import Move
+
+# A position hash, the start positions as a bitboard, a player and
+# whether the moves were listed by the NumPy generator
+CacheKey = tuple[int, int, int, bool]
+
+# The memory taken by one Move, with its anchor
+MOVE_BYTES = sys.getsizeof(Move(ShapeKind.ONE, 0, (0, 0))) + sys.getsizeof((0, 0))
+
+
+def moves_bytes(moves: tuple[Move, ...]) -> int:
+    """
+    Returns an estimate of the memory taken by a cache entry.
+    """
+    return sys.getsizeof(moves) + len(moves) * MOVE_BYTES
+
+
+class MoveCache:
+    """
+    A least recently used cache of the moves of positions.
+    """
+
+    max_entries: int
+    max_bytes: int
+    bytes: int
+    hits: int
+    misses: int
+    evictions: int
+    _entries: OrderedDict[CacheKey, tuple[Move, ...]]
+    _lock: threading.Lock
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 << 20) -> None:
+        """
+        Constructor
+        Inputs:
+            max_entries [int]: the most entries to keep
+            max_bytes [int]: the most memory (as estimated by
+                moves_bytes) the entries may take
+
+        Raises ValueError if either bound is less than 1.
+        """
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("Cache bounds must be positive")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> Optional[tuple[Move, ...]]:
+        """
+        Returns the moves stored for a key (making it the most
+        recently used), or None if there are none.
+        """
+        with self._lock:
+            moves = self._entries.get(key)
+            if moves is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return moves
+
+    def put(self, key: CacheKey, moves: tuple[Move, ...]) -> None:
+        """
+        Store the moves for a key, evicting the least recently used
+        entries if the cache is then over either of its bounds. A
+        single entry larger than max_bytes is not stored.
+        """
+        size = moves_bytes(moves)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= moves_bytes(old)
+            self._entries[key] = moves
+            self.bytes += size
+            while (
+                len(self._entries) > self.max_entries or self.bytes > self.max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= moves_bytes(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Remove every entry (the counters are kept).
+        """
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns the counters and the current size of the cache.
+        """
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,207 @@
+"""
+Parsed shapes and precomputed orientations for the 21 Blokus shapes.
+
+The string definitions in shape_definitions.py are parsed
+exactly once per process into SHAPES, a registry of read-only
+shapes shared by every game, bot and GUI.
+
+Every shape can be flipped and rotated into at most eight
+orientations, but symmetric shapes (such as "1", "O", "X"
+and "5") have fewer distinct ones. This module enumerates
+each shape's orientations exactly once, when it is imported,
+and stores them as immutable tuples of square offsets so that
+move generation does not need to build and transform Piece
+objects just to find out which squares they cover.
+"""
+from typing import NamedTuple, Optional
+
+from shape_definitions import ShapeKind
+from piece import Point, Shape, FrozenShape, Piece
+
+import shape_definitions
+
+# The squares of an orientation, as (row, col) offsets from
+# the anchor of a piece in that orientation.
+#
+Offsets = tuple[Point, ...]
+
+
+class Orientation(NamedTuple):
+    """
+    One distinct orientation of a shape.
+
+    face_up and rotation are the Piece constructor arguments
+    that produce this orientation, and squares holds the
+    offsets of the resulting squares from the anchor. The
+    min/max fields bound those offsets, so callers can work
+    out which anchors keep the piece on the board.
+
+    edges holds the offsets of the cells that share an edge
+    with the piece, and corners those of the cells that touch
+    it only diagonally (the cells a later piece of the same
+    player could attach to).
+    """
+
+    kind: ShapeKind
+    face_up: bool
+    rotation: int
+    squares: Offsets
+    min_row: int
+    max_row: int
+    min_col: int
+    max_col: int
+    edges: Offsets
+    corners: Offsets
+
+
+# Offsets from a square to its cardinal (edge-sharing) and
+# intercardinal (corner-sharing) neighbors.
+CARDINAL_OFFSETS: Offsets = ((-1, 0), (1, 0), (0, -1), (0, 1))
+INTERCARDINAL_OFFSETS: Offsets = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+
+def normalize(squares: list[Point] | Offsets) -> frozenset[Point]:
+    """
+    Translate a collection of squares so that its topmost row
+    and leftmost column are both 0. Two collections of squares
+    cover the same cells up to translation exactly when their
+    normalized forms are equal.
+
+    Inputs:
+        squares [list[Point] | Offsets]: the squares to translate
+
+    Returns [frozenset[Point]]: the translated squares
+    """
+    min_r = min(r for r, _ in squares)
+    min_c = min(c for _, c in squares)
+    return frozenset((r - min_r, c - min_c) for r, c in squares)
+
+
+def _build_orientations(shape: Shape) -> tuple[Orientation, ...]:
+    """
+    Enumerate the distinct orientations of a shape, in the same
+    order as the Piece constructor arguments (face up before face
+    down, then zero to three right rotations). An orientation is
+    dropped when it covers the same cells, up to translation, as
+    one that was already found.
+    """
+    seen: set[frozenset[Point]] = set()
+    result: list[Orientation] = []
+    for face_up in (True, False):
+        for rotation in range(4):
+            squares = Piece(shape, face_up, rotation).shape.squares
+            key = normalize(squares)
+            if key in seen:
+                continue
+            seen.add(key)
+            offsets: Offsets = tuple(sorted(squares))
+            edges = {
+                (r + dr, c + dc)
+                for r, c in offsets
+                for dr, dc in CARDINAL_OFFSETS
+            } - set(offsets)
+            corners = {
+                (r + dr, c + dc)
+                for r, c in offsets
+                for dr, dc in INTERCARDINAL_OFFSETS
+            } - edges - set(offsets)
+            result.append(
+                Orientation(
+                    shape.kind,
+                    face_up,
+                    rotation,
+                    offsets,
+                    min(r for r, _ in offsets),
+                    max(r for r, _ in offsets),
+                    min(c for _, c in offsets),
+                    max(c for _, c in offsets),
+                    tuple(sorted(edges)),
+                    tuple(sorted(corners)),
+                )
+            )
+    return tuple(result)
+
+
+def _freeze(shape: Shape) -> FrozenShape:
+    """
+    Returns a read-only copy of a parsed shape.
+    """
+    return FrozenShape(
+        shape.kind, shape.origin, shape.can_be_transformed, shape.squares
+    )
+
+
+SHAPES: dict[ShapeKind, FrozenShape] = {
+    kind: _freeze(Shape.from_string(kind, definition))
+    for kind, definition in shape_definitions.definitions.items()
+}
+
+# Number of squares in each shape, and in a full set of shapes.
+SHAPE_SIZES: dict[ShapeKind, int] = {
+    kind: len(shape.squares) for kind, shape in SHAPES.items()
+}
+TOTAL_SQUARES: int = sum(SHAPE_SIZES.values())
+
+ORIENTATIONS: dict[ShapeKind, tuple[Orientation, ...]] = {
+    kind: _build_orientations(shape) for kind, shape in SHAPES.items()
+}
+
+# Normalized squares of each orientation, used to recognize
+# which orientation an arbitrary Piece is in.
+_NORMALIZED: dict[ShapeKind, tuple[frozenset[Point], ...]] = {
+    kind: tuple(normalize(o.squares) for o in orientations)
+    for kind, orientations in ORIENTATIONS.items()
+}
+
+
+def anchor_range(
+    orientation: Orientation, size: int
+) -> tuple[range, range]:
+    """
+    Returns the rows and columns at which a piece in the given
+    orientation can be anchored without any of its squares
+    colliding with a wall of a (size x size) board.
+    """
+    return (
+        range(-orientation.min_row, size - orientation.max_row),
+        range(-orientation.min_col, size - orientation.max_col),
+    )
+
+
+def orientation_index(kind: ShapeKind, squares: list[Point]) -> Optional[int]:
+    """
+    Returns the index into ORIENTATIONS[kind] of the orientation
+    that covers the same cells as squares, up to translation, or
+    None if squares is not an orientation of that shape.
+    """
+    key = normalize(squares)
+    for index, normalized in enumerate(_NORMALIZED[kind]):
+        if normalized == key:
+            return index
+    return None
+
+
+def locate(kind: ShapeKind, squares: list[Point]) -> Optional[tuple[int, Point]]:
+    """
+    Returns (index, anchor) such that a piece of the given shape
+    in orientation ORIENTATIONS[kind][index], anchored at anchor,
+    covers exactly the given squares, or None if there is none.
+    """
+    index = orientation_index(kind, squares)
+    if index is None:
+        return None
+    orientation = ORIENTATIONS[kind][index]
+    top = min(r for r, _ in squares)
+    left = min(c for _, c in squares)
+    return index, (top - orientation.min_row, left - orientation.min_col)
+
+
+def orientation_piece(kind: ShapeKind, index: int, anchor: Point) -> Piece:
+    """
+    Build a Piece of the given shape in orientation
+    ORIENTATIONS[kind][index], anchored at anchor.
+    """
+    orientation = ORIENTATIONS[kind][index]
+    piece = Piece(SHAPES[kind], orientation.face_up, orientation.rotation)
+    piece.set_anchor(anchor)
+    return piece
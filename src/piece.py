@@ -3,7 +3,6 @@ Blokus shapes and pieces.
 
 Modify only the methods marked as TODO.
 """
-import copy
 from typing import Optional
 
 from shape_definitions import ShapeKind
@@ -63,6 +62,16 @@ class Shape:
         self.can_be_transformed = can_be_transformed
         self.squares = squares
 
+    def copy(self) -> "Shape":
+        """
+        Returns an independent, transformable copy of the
+        shape. Since points are immutable tuples, copying
+        the list of squares is as good as a deep copy.
+        """
+        return Shape(
+            self.kind, self.origin, self.can_be_transformed, list(self.squares)
+        )
+
     def __str__(self) -> str:
         """
         Returns a complete string representation of the
@@ -173,6 +182,49 @@ class Shape:
         self.squares = new_squares
 
 
+class FrozenShape(Shape):
+    """
+    A read-only Shape, used for the shared registry of parsed
+    shapes (see orientations.SHAPES) so that no caller can
+    corrupt the definitions that every game relies on.
+
+    The squares are stored as a tuple, attributes cannot be
+    reassigned, and the in-place transformations raise a
+    TypeError. Use copy() to get a Shape that can be flipped
+    and rotated.
+    """
+
+    def __init__(
+        self,
+        kind: ShapeKind,
+        origin: Point,
+        can_be_transformed: bool,
+        squares: list[Point],
+    ) -> None:
+        """
+        Constructor
+        """
+        object.__setattr__(self, "kind", kind)
+        object.__setattr__(self, "origin", origin)
+        object.__setattr__(self, "can_be_transformed", can_be_transformed)
+        object.__setattr__(self, "squares", tuple(squares))
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"FrozenShape attribute {name} is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"FrozenShape attribute {name} is read-only")
+
+    def flip_horizontally(self) -> None:
+        raise TypeError("FrozenShape cannot be transformed; use copy()")
+
+    def rotate_left(self) -> None:
+        raise TypeError("FrozenShape cannot be transformed; use copy()")
+
+    def rotate_right(self) -> None:
+        raise TypeError("FrozenShape cannot be transformed; use copy()")
+
+
 class Piece:
     """
     A Piece takes a Shape and orients it on the board.
@@ -185,15 +237,17 @@ class Piece:
     the shape attribute in place. Therefore, it is important
     that each Piece object has its own deep copy of a
     Shape, so that transforming one Piece does not affect
-    other Pieces that have the same Shape.
+    other Pieces that have the same Shape (including the
+    read-only shapes of the shared registry).
     """
 
     shape: Shape
     anchor: Optional[Point]
+    _hash: Optional[int]
 
     def __init__(self, shape: Shape, face_up: bool = True, rotation: int = 0):
         """
-        Each Piece will get its own deep copy of the given shape
+        Each Piece will get its own copy of the given shape
         subject to initial transformations according to the arguments:
 
             face_up:  If false, the initial Shape will be flipped
@@ -202,12 +256,15 @@ class Piece:
                       times the shape should be right-rotated by
                       90 degrees.
         """
-        # Deep copy shape, so that it can be transformed in place
-        self.shape = copy.deepcopy(shape)
+        # Copy shape, so that it can be transformed in place
+        self.shape = shape.copy()
 
         # The anchor will be set by set_anchor
         self.anchor = None
 
+        # Computed by __hash__, and reset whenever the piece moves
+        self._hash = None
+
         # We choose to flip...
         if not face_up:
             self.shape.flip_horizontally()
@@ -216,11 +273,44 @@ class Piece:
         for _ in range(rotation % 4):
             self.shape.rotate_right()
 
+    def __eq__(self, other: object) -> bool:
+        """
+        Pieces are equal if they have the same kind of shape and
+        cover the same squares, however they were oriented and
+        anchored to get there. Pieces without an anchor are equal
+        if their shapes have the same squares.
+        """
+        if not isinstance(other, Piece):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        """
+        Hash consistent with __eq__, cached until the piece is
+        re-anchored or transformed. The anchor must be set with
+        set_anchor and the piece transformed with its own methods
+        (not those of its shape) for the cache to be reset.
+        """
+        if self._hash is None:
+            self._hash = hash(self._key())
+        return self._hash
+
+    def _key(self) -> tuple[ShapeKind, bool, frozenset[Point]]:
+        """
+        Returns the value that pieces are compared by: the kind of
+        shape, whether the piece is anchored, and the squares it
+        covers (or, without an anchor, the squares of its shape).
+        """
+        if self.anchor is None:
+            return (self.shape.kind, False, frozenset(self.shape.squares))
+        return (self.shape.kind, True, frozenset(self.squares()))
+
     def set_anchor(self, anchor: Point) -> None:
         """
         Set the anchor point.
         """
         self.anchor = anchor
+        self._hash = None
 
     def _check_anchor(self) -> None:
         """
@@ -237,6 +327,7 @@ class Piece:
         """
         self._check_anchor()
         self.shape.flip_horizontally()
+        self._hash = None
             
 
     def rotate_left(self) -> None:
@@ -246,6 +337,7 @@ class Piece:
         """
         self._check_anchor()
         self.shape.rotate_left()
+        self._hash = None
 
     def rotate_right(self) -> None:
         """
@@ -254,6 +346,7 @@ class Piece:
         """
         self._check_anchor()
         self.shape.rotate_right()
+        self._hash = None
 
     def squares(self) -> list[Point]:
         """
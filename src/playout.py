@@ -0,0 +1,214 @@
+"""
+Fast random playouts.
+
+A random playout plays a game to the end with uniformly random
+legal moves, which is the inner loop of sampling bots such as
+MCTS. Doing so with the public Blokus methods would generate every
+legal move from scratch at every turn; playout here reads the
+position's bitboards once and then plays on plain ints, keeping
+each player's set of legal moves up to date instead:
+
+  - A move is the bitboard of the cells it covers, which also
+    determines its shape.
+  - When a player places a piece, they gain the moves that cover
+    one of the piece's new corner cells (the only moves that can
+    have become legal).
+  - Moves that have become illegal (because they overlap a piece,
+    touch the edge of one of the player's own, or use a shape the
+    player has played) are not looked for; instead, a move is
+    drawn at random, and if it turns out to be illegal it is
+    dropped and another is drawn. This is still a uniformly random
+    choice among the legal moves, and each move is dropped at most
+    once.
+  - The placements of every shape covering each cell are worked
+    out once per board size, the first time the cell is used (see
+    bitboard.placement_table).
+
+The moves are the same as Blokus.legal_moves (all orientations),
+so the games are played by the same rules, but no Move objects,
+undo records or hashes are made along the way.
+"""
+import random
+from typing import Optional
+
+from blokus import Blokus
+from move import Move
+from shape_definitions import ShapeKind
+from orientations import ORIENTATIONS, SHAPE_SIZES, locate
+from bitboard import (
+    board_mask,
+    cell_placements,
+    corner_neighbors,
+    edge_neighbors,
+    iter_points,
+    placement_table,
+)
+
+# Shapes are numbered by their position in ORIENTATIONS, and the
+# shapes a player has left are kept as a bitmask of those numbers
+# (comparing ints is much faster than hashing ShapeKinds)
+KINDS: list[ShapeKind] = list(ORIENTATIONS)
+SIZES: list[int] = [SHAPE_SIZES[kind] for kind in KINDS]
+_KIND_NUMBERS: dict[ShapeKind, int] = {kind: i for i, kind in enumerate(KINDS)}
+
+
+class _Moves:
+    """
+    A player's moves: a list of placement masks and their shape
+    numbers, which may include moves that have become illegal, and
+    the position of each mask in the list.
+    """
+
+    __slots__ = ("masks", "kinds", "index")
+
+    masks: list[int]
+    kinds: list[int]
+    index: dict[int, int]
+
+    def __init__(self) -> None:
+        self.masks = []
+        self.kinds = []
+        self.index = {}
+
+    def add_at(self, cells: int, blocked: int, left: int, size: int) -> None:
+        """
+        Add every placement of the shapes in left (a bitmask of shape
+        numbers) that covers one of the given cells, stays on the
+        board and covers none of the blocked cells.
+        """
+        table = placement_table(size)
+        kinds = [k for k in range(len(KINDS)) if left >> k & 1]
+        masks = self.masks
+        numbers = self.kinds
+        index = self.index
+        while cells:
+            low = cells & -cells
+            cells ^= low
+            cell = low.bit_length() - 1
+            placements = table[cell] or cell_placements(size, cell)
+            for k in kinds:
+                for placed in placements[k]:
+                    if not placed & blocked and placed not in index:
+                        index[placed] = len(masks)
+                        masks.append(placed)
+                        numbers.append(k)
+
+    def draw(self, blocked: int, left: int, rng: random.Random) -> int:
+        """
+        Returns the position of a uniformly random legal move (one
+        with a shape in left that covers no blocked cell), or -1 if
+        there is none. Illegal moves drawn along the way are removed.
+        """
+        masks = self.masks
+        numbers = self.kinds
+        index = self.index
+        while masks:
+            i = int(rng.random() * len(masks))
+            placed = masks[i]
+            if left >> numbers[i] & 1 and not placed & blocked:
+                return i
+            last = len(masks) - 1
+            del index[placed]
+            if i != last:
+                masks[i] = masks[last]
+                numbers[i] = numbers[last]
+                index[masks[i]] = i
+            masks.pop()
+            numbers.pop()
+        return -1
+
+
+def playout(
+    game: Blokus,
+    rng: random.Random,
+    record: Optional[list[Optional[Move]]] = None,
+) -> list[int]:
+    """
+    Play a game from its current position to the end with uniformly
+    random legal moves, retiring players who have none. The game
+    itself is not changed.
+    Inputs:
+        game [Blokus]: the position to play out
+        rng [random.Random]: the source of the random moves
+        record [Optional[list[Optional[Move]]]]: if given, each move
+            played (None for a retirement) is appended to it
+    Returns [list[int]]: the final score of each player (see
+        Blokus.get_score), indexed by player number
+    """
+    size = game.size
+    width = size + 1
+    board = board_mask(size)
+    players = range(1, game.num_players + 1)
+
+    union = game._union
+    forbidden = dict(game._forbidden)
+    shapes_left = {
+        p: sum(1 << _KIND_NUMBERS[kind] for kind in game._shapes_left[p])
+        for p in players
+    }
+    squares_left = dict(game._squares_left)
+    last_moves = dict(game._last_moves)
+    started = {p: bool(game._shapes_placed[p]) for p in players}
+    ring = list(game._active)
+    if game.game_over:
+        ring = []
+
+    moves: dict[int, _Moves] = {}
+    for p in ring:
+        moves[p] = _Moves()
+        if started[p]:
+            attach = game._corners[p]
+        else:
+            attach = game._start_mask & ~union
+        moves[p].add_at(attach, union | forbidden[p], shapes_left[p], size)
+
+    i = ring.index(game.curr_player) if ring else 0
+    while ring:
+        player = ring[i]
+        left = shapes_left[player]
+        own = moves[player]
+        chosen = own.draw(union | forbidden[player], left, rng)
+        if chosen < 0:
+            if record is not None:
+                record.append(None)
+            ring.pop(i)
+            if ring:
+                i %= len(ring)
+            continue
+
+        placed = own.masks[chosen]
+        k = own.kinds[chosen]
+        kind = KINDS[k]
+        if record is not None:
+            located = locate(kind, list(iter_points(placed, width)))
+            assert located is not None
+            record.append(Move(kind, *located))
+        union |= placed
+        left ^= 1 << k
+        shapes_left[player] = left
+        squares_left[player] -= SIZES[k]
+        last_moves[player] = kind
+
+        forbidden[player] |= edge_neighbors(placed, width, board)
+        blocked = union | forbidden[player]
+        corners = corner_neighbors(placed, width, board) & ~blocked
+        if not started[player]:
+            # The first piece stops moves at the start positions
+            started[player] = True
+            own = moves[player] = _Moves()
+        own.add_at(corners, blocked, left, size)
+
+        if left:
+            i = (i + 1) % len(ring)
+        else:
+            ring.pop(i)
+            if ring:
+                i %= len(ring)
+    scores = [0] * (game.num_players + 1)
+    for p in players:
+        scores[p] = -squares_left[p]
+        if not shapes_left[p]:
+            scores[p] += 15
+            if last_moves[p] is ShapeKind.ONE:
+                scores[p] += 5
+    return scores
@@ -0,0 +1,367 @@
+"""
+Iterative-deepening game-tree search for Blokus.
+
+The search looks 1, 2, 3, ... plies ahead until a deadline, and
+plays the best move found by the deepest search that finished.
+Positions are scored by a static evaluation for every player:
+the squares they have placed (their score) plus a small bonus for
+each move still available to them (their mobility).
+
+With two players, or with more players and the "paranoid" rule,
+the search is alpha-beta minimax on the player to move's score
+minus the best score among the others: every other player is
+assumed to play against them. With the "maxn" rule, each player
+instead maximizes their own evaluation, which allows no cutoffs.
+
+Moves are tried best first: the best move found for the position
+by an earlier iteration (kept in the transposition table) and then
+the largest shapes. The transposition table has a fixed number of
+slots, indexed by the position's Zobrist hash.
+"""
+import time
+from typing import Callable, Optional
+
+from blokus import Blokus
+from move import Move
+
+# The value of one available move, relative to one placed square
+MOBILITY_WEIGHT = 0.1
+
+# Number of nodes between checks of the clock
+CHECK_EVERY = 64
+
+# Kinds of transposition table entries
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+
+def bound_kind(value: float, alpha: float, beta: float) -> int:
+    """
+    Returns the kind of a result searched between alpha and beta:
+    UPPER if it is at most alpha (the true value may be lower),
+    LOWER if it is at least beta (it may be higher), else EXACT.
+    """
+    if value <= alpha:
+        return UPPER
+    if value >= beta:
+        return LOWER
+    return EXACT
+
+
+def settles(value: float, kind: int, alpha: float, beta: float) -> bool:
+    """
+    Returns whether a remembered result of the given kind settles
+    a search between alpha and beta, so it can be returned as is.
+    """
+    return (
+        kind == EXACT
+        or (kind == LOWER and value >= beta)
+        or (kind == UPPER and value <= alpha)
+    )
+
+
+class _Timeout(Exception):
+    """
+    Raised inside the search when the deadline has passed. The
+    search plays on a fork of the game, which is simply dropped.
+    """
+
+
+class TranspositionTable:
+    """
+    A fixed-size table of search results, indexed by position hash.
+    A slot is overwritten by a result searched at least as deeply,
+    or by any result of a newer search.
+    """
+
+    _slots: list[Optional[tuple[int, int, int, int, float, int, Optional[Move]]]]
+    _mask: int
+    generation: int
+
+    def __init__(self, size: int) -> None:
+        """
+        Create a table with size slots, rounded up to a power of two.
+        """
+        slots = 1
+        while slots < size:
+            slots *= 2
+        self._slots = [None] * slots
+        self._mask = slots - 1
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return sum(1 for entry in self._slots if entry is not None)
+
+    def lookup(
+        self, key: int, root: int
+    ) -> Optional[tuple[int, float, int, Optional[Move]]]:
+        """
+        Returns the depth, value, kind and best move stored for a
+        position searched for the given root player, if any.
+        """
+        entry = self._slots[key & self._mask]
+        if entry is None or entry[0] != key or entry[1] != root:
+            return None
+        return entry[3], entry[4], entry[5], entry[6]
+
+    def store(
+        self,
+        key: int,
+        root: int,
+        depth: int,
+        value: float,
+        kind: int,
+        move: Optional[Move],
+    ) -> None:
+        """
+        Store the result of searching a position to some depth.
+        """
+        index = key & self._mask
+        entry = self._slots[index]
+        if entry is None or entry[2] != self.generation or depth >= entry[3]:
+            self._slots[index] = (key, root, self.generation, depth, value, kind, move)
+
+
+class Search:
+    """
+    An iterative-deepening search, with statistics about the work
+    done so far across all searches.
+    """
+
+    rule: str
+    table: TranspositionTable
+    nodes: int
+    cutoffs: int
+    table_hits: int
+    depth: int
+    seconds: float
+    _deadline: float
+    _root: int
+    _best: Optional[Move]
+    _report: Optional[Callable[[Move], None]]
+
+    def __init__(self, rule: str = "paranoid", table_size: int = 1 << 16) -> None:
+        """
+        Constructor
+        Inputs:
+            rule [str]: "paranoid" or "maxn", for games with more
+                than two players
+            table_size [int]: the number of transposition table slots
+
+        Raises ValueError if the rule is not one of these.
+        """
+        if rule not in ("paranoid", "maxn"):
+            raise ValueError(f"Unknown search rule: {rule}")
+        self.rule = rule
+        self.table = TranspositionTable(table_size)
+        self.nodes = 0
+        self.cutoffs = 0
+        self.table_hits = 0
+        self.depth = 0
+        self.seconds = 0.0
+        self._deadline = 0.0
+        self._root = 0
+        self._best = None
+        self._report = None
+
+    def search(
+        self,
+        game: Blokus,
+        time_limit: float,
+        max_depth: Optional[int] = None,
+        moves: Optional[list[Move]] = None,
+        report: Optional[Callable[[Move], None]] = None,
+    ) -> Optional[Move]:
+        """
+        Search from the current position of the game (which is not
+        changed) until the time limit has passed or max_depth plies
+        have been searched.
+        Inputs:
+            game [Blokus]: the game to search
+            time_limit [float]: the time limit in seconds
+            max_depth [Optional[int]]: the deepest search to run
+            moves [Optional[list[Move]]]: the moves to choose from
+                (all legal moves if None)
+            report [Optional[Callable[[Move], None]]]: called with
+                the best move so far whenever it changes
+        Returns [Optional[Move]]: the best move found, or None if
+            the player to move has no moves and must retire
+
+        Raises ValueError if the game is over.
+        """
+        if game.game_over:
+            raise ValueError("Game is over")
+        start = time.perf_counter()
+        if moves is None:
+            moves = game.legal_move_list()
+        if not moves:
+            return None
+
+        self.table.generation += 1
+        self._root = game.curr_player
+        self._deadline = start + time_limit
+        self._report = report
+        board = game.fork()
+        self._best = self._order(board, moves)[0]
+        if report is not None:
+            report(self._best)
+        depth = 1
+        while max_depth is None or depth <= max_depth:
+            try:
+                self._search_root(board, moves, depth)
+            except _Timeout:
+                break
+            self.depth = max(self.depth, depth)
+            depth += 1
+        self.seconds += time.perf_counter() - start
+        return self._best
+
+    def _search_root(self, game: Blokus, moves: list[Move], depth: int) -> None:
+        """
+        Search every root move to the given depth, updating _best
+        whenever a move turns out better than those searched before.
+        The best move of the previous depth is searched first, so
+        even an unfinished search only improves on it.
+        """
+        player = game.curr_player
+        maxn = self.rule == "maxn" and game.num_players > 2
+        best_value = float("-inf")
+        for move in self._order(game, moves):
+            game.maybe_place(move)
+            if maxn:
+                value = self._maxn(game, depth - 1)[player]
+            else:
+                value = self._alphabeta(game, depth - 1, best_value, float("inf"))
+            game.undo()
+            if value > best_value:
+                if move != self._best and self._report is not None:
+                    self._report(move)
+                self._best, best_value = move, value
+                self.table.store(
+                    game.position_hash, self._root, depth, value, LOWER, move
+                )
+
+    def _tick(self) -> None:
+        """
+        Count a node, and raise _Timeout if the deadline has passed.
+        """
+        self.nodes += 1
+        if self.nodes % CHECK_EVERY == 0 and time.perf_counter() >= self._deadline:
+            raise _Timeout
+
+    def _evaluate(self, game: Blokus) -> list[float]:
+        """
+        Returns the static evaluation of every player, indexed by
+        player number.
+        """
+        values = [0.0] * (game.num_players + 1)
+        for player in range(1, game.num_players + 1):
+            values[player] = game.get_score(player)
+            if not game.game_over and player not in game.retired_players:
+                mobility = game.count_available_moves(player)
+                values[player] += MOBILITY_WEIGHT * mobility
+        return values
+
+    def _paranoid_value(self, values: list[float]) -> float:
+        """
+        Returns the root player's evaluation minus the best of the
+        other players' evaluations (if there are other players).
+        """
+        others = [v for p, v in enumerate(values) if p and p != self._root]
+        return values[self._root] - max(others, default=0.0)
+
+    def _order(
+        self, game: Blokus, moves: list[Move], first: Optional[Move] = None
+    ) -> list[Move]:
+        """
+        Returns the moves in the order to search them: the given
+        first move (or else the transposition table move), then by
+        decreasing size.
+        """
+        if first is None:
+            entry = self.table.lookup(game.position_hash, self._root)
+            if entry is not None:
+                first = entry[3]
+        ordered = sorted(moves, key=lambda move: -move.size)
+        if first is not None and first in moves:
+            ordered.remove(first)
+            ordered.insert(0, first)
+        return ordered
+
+    def _alphabeta(self, game: Blokus, depth: int, alpha: float, beta: float) -> float:
+        """
+        Returns the paranoid value of the position for the root
+        player, searched to the given depth, if it lies between
+        alpha and beta (otherwise a bound on it).
+        """
+        self._tick()
+        if depth == 0 or game.game_over:
+            return self._paranoid_value(self._evaluate(game))
+
+        key = game.position_hash
+        entry = self.table.lookup(key, self._root)
+        first: Optional[Move] = None
+        if entry is not None:
+            stored_depth, value, kind, first = entry
+            if stored_depth >= depth:
+                self.table_hits += 1
+                if settles(value, kind, alpha, beta):
+                    return value
+
+        moves = game.legal_move_list()
+        if not moves:
+            game.retire()
+            value = self._alphabeta(game, depth - 1, alpha, beta)
+            game.undo()
+            return value
+
+        maximizing = game.curr_player == self._root
+        original_alpha, original_beta = alpha, beta
+        best_move = None
+        best = float("-inf") if maximizing else float("inf")
+        for move in self._order(game, moves, first):
+            game.maybe_place(move)
+            value = self._alphabeta(game, depth - 1, alpha, beta)
+            game.undo()
+            if maximizing and value > best:
+                best, best_move = value, move
+                alpha = max(alpha, value)
+            elif not maximizing and value < best:
+                best, best_move = value, move
+                beta = min(beta, value)
+            if alpha >= beta:
+                self.cutoffs += 1
+                break
+
+        kind = bound_kind(best, original_alpha, original_beta)
+        self.table.store(key, self._root, depth, best, kind, best_move)
+        return best
+
+    def _maxn(self, game: Blokus, depth: int) -> list[float]:
+        """
+        Returns the max-n value of the position: the evaluation of
+        every player, after each player to move has chosen the move
+        that is best for themselves, searched to the given depth.
+        """
+        self._tick()
+        if depth == 0 or game.game_over:
+            return self._evaluate(game)
+
+        moves = game.legal_move_list()
+        if not moves:
+            game.retire()
+            values = self._maxn(game, depth - 1)
+            game.undo()
+            return values
+
+        player = game.curr_player
+        best: Optional[list[float]] = None
+        for move in self._order(game, moves):
+            game.maybe_place(move)
+            values = self._maxn(game, depth - 1)
+            game.undo()
+            if best is None or values[player] > best[player]:
+                best = values
+        assert best is not None
+        return best
@@ -0,0 +1,337 @@
+"""
+Round-robin tournaments between the bots registered in bot.py.
+
+Every ordered pair of strategies plays the same number of games on
+one of the BOARDS, so that each strategy gets each seat order. On
+boards with more than two players, the two strategies take turns
+around the table (A, B, A, B). A game counts as a win for the
+strategy holding every winning seat, and as a draw otherwise.
+
+The games are spread over a pool of worker processes and seeded
+as in bot.cmd, so the results depend only on --seed, not on
+--workers (unless the bots are given a time limit, with
+--time-limit or --move-time, since how far a bot gets in a given
+time depends on the machine and its load). The report
+gives each strategy's score, its win rate with a 95% Wilson
+confidence interval, and an Elo rating (fitted to all the games
+with the Bradley-Terry model) with a 95% bootstrap confidence
+interval.
+
+Run from the src directory, for example:
+
+    python tournament.py --board duo --games 20 --workers 4 --seed 1
+"""
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Optional
+
+import click
+
+from bot import BOTS, BOARDS, game_seed, play_seated_game
+
+# A pairing: the strategy in the first seat and the other strategy
+Pairing = tuple[str, str]
+
+# The result of one game: its pairing and the score of the first
+# strategy (1 for a win, 0.5 for a draw, 0 for a loss)
+Result = tuple[Pairing, float]
+
+ELO_BASE = 1500.0
+
+
+def seats(pairing: Pairing, num_players: int) -> list[str]:
+    """
+    Returns the strategy in each seat of a game of a pairing.
+    Inputs:
+        pairing [Pairing]: the strategies, first seat first
+        num_players [int]: the number of players in the game
+    Returns [list[str]]: the strategies, alternating around the table
+    """
+    return [pairing[i % 2] for i in range(num_players)]
+
+
+def play_pairing_game(
+    pairing: Pairing,
+    board: str,
+    seed: int,
+    settings: Optional[dict[str, Any]] = None,
+) -> Result:
+    """
+    Play one game of a pairing on a board.
+    Inputs:
+        pairing [Pairing]: the strategies, first seat first
+        board [str]: the name of the board (see bot.BOARDS)
+        seed [int]: the seed of the game
+        settings [Optional[dict[str, Any]]]: settings for the bots
+            (see bot.play_seated_game)
+    Returns [Result]: the pairing and the first strategy's score
+    """
+    players = seats(pairing, BOARDS[board][0])
+    winners = play_seated_game(players, board, seed, settings)
+    assert winners is not None
+    names = {players[winner - 1] for winner in winners}
+    if names == {pairing[0]}:
+        return pairing, 1.0
+    if names == {pairing[1]}:
+        return pairing, 0.0
+    return pairing, 0.5
+
+
+def play_tournament(
+    bots: list[str],
+    board: str,
+    games: int,
+    seed: int,
+    workers: int = 1,
+    settings: Optional[dict[str, Any]] = None,
+) -> list[Result]:
+    """
+    Play every ordered pairing of the given strategies the given
+    number of times.
+    Inputs:
+        bots [list[str]]: the names of the strategies
+        board [str]: the name of the board
+        games [int]: the number of games per ordered pairing
+        seed [int]: the seed of the tournament
+        workers [int]: the number of processes to play games in
+        settings [Optional[dict[str, Any]]]: settings for the bots
+            (see bot.play_seated_game)
+    Returns [list[Result]]: the result of every game, in a fixed order
+    """
+    pairings: list[Pairing] = [
+        (first, second) for first in bots for second in bots if first != second
+    ]
+    schedule: list[Pairing] = [p for p in pairings for _ in range(games)]
+    seeds: list[int] = [game_seed(seed, i) for i in range(len(schedule))]
+    boards: list[str] = [board] * len(schedule)
+    every: list[Optional[dict[str, Any]]] = [settings] * len(schedule)
+    if workers <= 1:
+        return list(map(play_pairing_game, schedule, boards, seeds, every))
+    chunksize: int = max(1, len(schedule) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(
+            pool.map(
+                play_pairing_game, schedule, boards, seeds, every, chunksize=chunksize
+            )
+        )
+
+
+def elo_ratings(bots: list[str], results: list[Result]) -> dict[str, float]:
+    """
+    Fit Elo ratings to game results with the Bradley-Terry model
+    (counting a draw as half a win for each side), averaging
+    ELO_BASE. Every pair of strategies is also credited with one
+    extra drawn game, which keeps the ratings finite when a strategy
+    wins or loses every game.
+    Inputs:
+        bots [list[str]]: the names of the strategies
+        results [list[Result]]: the results to fit
+    Returns [dict[str, float]]: the rating of each strategy
+    """
+    score: dict[str, float] = {bot: 0.0 for bot in bots}
+    played: dict[Pairing, float] = {}
+    for first in bots:
+        for second in bots:
+            if first != second:
+                played[(first, second)] = 1.0
+                score[first] += 0.5
+    for (first, second), result in results:
+        score[first] += result
+        score[second] += 1 - result
+        played[(first, second)] += 1
+        played[(second, first)] += 1
+
+    # Minorization-maximization updates of the strengths
+    strength: dict[str, float] = {bot: 1.0 for bot in bots}
+    for _ in range(500):
+        new: dict[str, float] = {}
+        for bot in bots:
+            total = sum(
+                played[(bot, other)] / (strength[bot] + strength[other])
+                for other in bots
+                if other != bot
+            )
+            new[bot] = score[bot] / total if total else 1.0
+        mean = math.exp(sum(math.log(s) for s in new.values()) / len(new))
+        new = {bot: s / mean for bot, s in new.items()}
+        done = all(abs(new[bot] - strength[bot]) < 1e-9 for bot in bots)
+        strength = new
+        if done:
+            break
+    return {bot: ELO_BASE + 400 * math.log10(strength[bot]) for bot in bots}
+
+
+def elo_intervals(
+    bots: list[str], results: list[Result], samples: int, seed: int
+) -> dict[str, tuple[float, float]]:
+    """
+    Estimate 95% confidence intervals for the Elo ratings by
+    refitting them to bootstrap resamples of the games.
+    Inputs:
+        bots [list[str]]: the names of the strategies
+        results [list[Result]]: the results of the games
+        samples [int]: the number of resamples
+        seed [int]: the seed of the resampling
+    Returns [dict[str, tuple[float, float]]]: the low and high end
+        of each strategy's interval
+    """
+    rng = random.Random(seed)
+    ratings: dict[str, list[float]] = {bot: [] for bot in bots}
+    for _ in range(samples):
+        resample = [rng.choice(results) for _ in results]
+        for bot, rating in elo_ratings(bots, resample).items():
+            ratings[bot].append(rating)
+    intervals: dict[str, tuple[float, float]] = {}
+    for bot, values in ratings.items():
+        values.sort()
+        low = values[int(0.025 * (len(values) - 1))]
+        high = values[int(math.ceil(0.975 * (len(values) - 1)))]
+        intervals[bot] = (low, high)
+    return intervals
+
+
+def wilson_interval(score: float, games: int) -> tuple[float, float]:
+    """
+    Returns the 95% Wilson score interval for a win rate.
+    Inputs:
+        score [float]: the number of games won (draws counting half)
+        games [int]: the number of games played
+    Returns [tuple[float, float]]: the low and high end of the interval
+    """
+    if games == 0:
+        return (0.0, 1.0)
+    z = 1.96
+    rate = score / games
+    centre = rate + z * z / (2 * games)
+    spread = z * math.sqrt(rate * (1 - rate) / games + z * z / (4 * games * games))
+    scale = 1 + z * z / games
+    return ((centre - spread) / scale, (centre + spread) / scale)
+
+
+def report(
+    bots: list[str], results: list[Result], samples: int, seed: int
+) -> list[str]:
+    """
+    Summarize the results of a tournament.
+    Inputs:
+        bots [list[str]]: the names of the strategies
+        results [list[Result]]: the results of the games
+        samples [int]: the number of bootstrap resamples for the
+            Elo confidence intervals
+        seed [int]: the seed of the resampling
+    Returns [list[str]]: the lines of the report
+    """
+    wins = {bot: 0 for bot in bots}
+    draws = {bot: 0 for bot in bots}
+    losses = {bot: 0 for bot in bots}
+    against: dict[Pairing, float] = {}
+    for (first, second), result in results:
+        if result == 1:
+            wins[first] += 1
+            losses[second] += 1
+        elif result == 0:
+            wins[second] += 1
+            losses[first] += 1
+        else:
+            draws[first] += 1
+            draws[second] += 1
+        against[(first, second)] = against.get((first, second), 0) + result
+        against[(second, first)] = against.get((second, first), 0) + 1 - result
+
+    ratings = elo_ratings(bots, results)
+    intervals = elo_intervals(bots, results, samples, seed)
+    lines = [
+        "Bot  | Games |   W |   D |   L | Win rate (95% CI)     | Elo (95% CI)",
+    ]
+    for bot in sorted(bots, key=lambda bot: -ratings[bot]):
+        games = wins[bot] + draws[bot] + losses[bot]
+        score = wins[bot] + draws[bot] / 2
+        low, high = wilson_interval(score, games)
+        rate = score / games if games else 0.0
+        elo_low, elo_high = intervals[bot]
+        lines.append(
+            f"{bot:4} | {games:5} | {wins[bot]:3} | {draws[bot]:3} | {losses[bot]:3}"
+            f" | {rate * 100:5.1f} % ({low * 100:5.1f}-{high * 100:5.1f})"
+            f" | {ratings[bot]:6.0f} ({elo_low:.0f} to {elo_high:.0f})"
+        )
+
+    lines.append("")
+    lines.append("Score of row against column")
+    lines.append("     | " + " | ".join(f"{bot:>5}" for bot in bots))
+    for bot in bots:
+        cells = [
+            "    -" if other == bot else f"{against.get((bot, other), 0):5.1f}"
+            for other in bots
+        ]
+        lines.append(f"{bot:4} | " + " | ".join(cells))
+    return lines
+
+
+@click.command()
+@click.option("-b", "--board",
+              type=click.Choice(list(BOARDS)),
+              default="bot")
+@click.option("-g", "--games",
+              type=click.IntRange(min=1),
+              default=10,
+              help="Number of games per pairing and seat order")
+@click.option("--bot", "bots",
+              type=click.Choice(list(BOTS)),
+              multiple=True,
+              help="Strategy to include (all registered bots by default)")
+@click.option("-w", "--workers",
+              type=click.IntRange(min=1),
+              default=1,
+              help="Number of processes to play games in")
+@click.option("-s", "--seed",
+              type=int,
+              default=None,
+              help="Seed that makes the results reproducible")
+@click.option("-t", "--time-limit",
+              type=float,
+              default=None,
+              help="Seconds per move for search bots")
+@click.option("-p", "--playouts",
+              type=click.IntRange(min=1),
+              default=None,
+              help="Playouts per move for search bots")
+@click.option("-m", "--move-time",
+              type=click.FloatRange(min=0, min_open=True),
+              default=None,
+              help="Most seconds a bot may take per move, enforced by the driver")
+@click.option("--bootstrap",
+              type=click.IntRange(min=1),
+              default=200,
+              help="Number of resamples for the Elo confidence intervals")
+def cmd(
+    board: str,
+    games: int,
+    bots: tuple[str, ...],
+    workers: int,
+    seed: Optional[int],
+    time_limit: Optional[float],
+    playouts: Optional[int],
+    move_time: Optional[float],
+    bootstrap: int,
+) -> None:
+    names: list[str] = list(dict.fromkeys(bots)) if bots else list(BOTS)
+    if len(names) < 2:
+        raise click.UsageError("A tournament needs at least two bots")
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+
+    settings: dict[str, Any] = {
+        "time_limit": time_limit,
+        "playouts": playouts,
+        "move_time": move_time,
+    }
+    results = play_tournament(names, board, games, seed, workers, settings)
+    print(f"Board {board}, {len(results)} games, seed {seed}")
+    print()
+    for line in report(names, results, bootstrap, seed):
+        print(line)
+
+
+if __name__ == "__main__":
+    cmd()
@@ -0,0 +1,258 @@
+"""
+NumPy versions of the bitboard legality checks.
+
+Rather than testing one placement at a time, legal_anchors slides
+an orientation's footprint over whole-board arrays: for each of
+its squares it takes a shifted view of the blocked and attachment
+arrays, and combines the views with a few vectorized ORs. The
+result says, for every position of the orientation at once,
+whether the placement is legal. legal_placements does the same for
+many orientations together, as one matrix product of a table of
+orientation footprints with the stacked shifted views.
+
+NumPy is an optional dependency. If it is not installed,
+HAVE_NUMPY is False and Blokus falls back to the bitboard move
+generator.
+"""
+import threading
+from functools import lru_cache
+from typing import Any, Collection
+
+from shape_definitions import ShapeKind
+from orientations import Orientation, ORIENTATIONS
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+HAVE_NUMPY = np is not None
+
+# np.ndarray when NumPy is installed
+BoolArray = Any
+
+# Every orientation fits in a FOOTPRINT x FOOTPRINT box
+FOOTPRINT = 5
+
+# The weight of an attach cell in legal_placements: small enough
+# that a piece covering every one of its squares with attach cells
+# weighs less than one blocked cell, and a power of two so that
+# the sums are exact
+ATTACH = 1 / 32
+
+
+def mask_array(mask: int, size: int) -> BoolArray:
+    """
+    Returns a (size x size) boolean array of the cells in a
+    bitboard mask (see bitboard.py), dropping the padding column.
+    """
+    width = size + 1
+    nbytes = (size * width + 7) // 8
+    bits = np.unpackbits(
+        np.frombuffer(mask.to_bytes(nbytes, "little"), dtype=np.uint8),
+        bitorder="little",
+    )
+    return bits[: size * width].reshape(size, width)[:, :size].astype(bool)
+
+
+def legal_anchors(
+    orientation: Orientation, blocked: BoolArray, attach: BoolArray
+) -> BoolArray:
+    """
+    Compute the legality of every placement of an orientation.
+
+    Inputs:
+        orientation [Orientation]: the orientation to place
+        blocked [BoolArray]: (size x size) array of the cells the
+            player may not cover (occupied or edge-adjacent to
+            their own pieces)
+        attach [BoolArray]: (size x size) array of the cells the
+            piece must cover at least one of
+
+    Returns [BoolArray]: a (size x size) boolean array whose entry
+        [i, j] is True if the placement whose topmost row is i and
+        leftmost column is j is legal. That placement has anchor
+        (i - orientation.min_row, j - orientation.min_col). Entries
+        for placements that would leave the board are False.
+    """
+    size = blocked.shape[0]
+    legal = np.zeros((size, size), dtype=bool)
+    height = size - (orientation.max_row - orientation.min_row)
+    width = size - (orientation.max_col - orientation.min_col)
+    if height <= 0 or width <= 0:
+        return legal
+
+    bad = np.zeros((height, width), dtype=bool)
+    touch = np.zeros((height, width), dtype=bool)
+    for r, c in orientation.squares:
+        dr = r - orientation.min_row
+        dc = c - orientation.min_col
+        bad |= blocked[dr : dr + height, dc : dc + width]
+        touch |= attach[dr : dr + height, dc : dc + width]
+    legal[:height, :width] = touch & ~bad
+    return legal
+
+
+# The orientation tables used by legal_placements: one row per
+# orientation in ORIENTATIONS order, built on first use (under
+# _TABLES_LOCK, since bots may generate moves in several threads)
+_ROWS: list[tuple[ShapeKind, int, int, int]] = []
+_FIRST_ROW: dict[ShapeKind, int] = {}
+_FOOTPRINTS: BoolArray = None
+_TABLES_LOCK = threading.Lock()
+
+
+def _footprints() -> BoolArray:
+    """
+    Returns the (orientations x FOOTPRINT**2) array whose row for
+    an orientation marks the cells of its top-left aligned box
+    that it covers, filling in _ROWS and _FIRST_ROW the first
+    time it is called. _ROWS gives each row's kind, orientation
+    index, min_row and min_col.
+    """
+    global _FOOTPRINTS
+    if _FOOTPRINTS is None:
+        with _TABLES_LOCK:
+            # Another thread may have built the tables while this
+            # one waited for the lock
+            if _FOOTPRINTS is None:
+                rows = []
+                for kind, orientations in ORIENTATIONS.items():
+                    _FIRST_ROW[kind] = len(_ROWS)
+                    for index, o in enumerate(orientations):
+                        _ROWS.append((kind, index, o.min_row, o.min_col))
+                        row = np.zeros(FOOTPRINT * FOOTPRINT, dtype=np.float32)
+                        for r, c in o.squares:
+                            row[(r - o.min_row) * FOOTPRINT + c - o.min_col] = 1
+                        rows.append(row)
+                # Set last, so that other threads only use the tables
+                # once they are complete
+                _FOOTPRINTS = np.stack(rows)
+    return _FOOTPRINTS
+
+
+def _shifted_views(blocked: BoolArray, attach: BoolArray) -> BoolArray:
+    """
+    Returns the (FOOTPRINT**2 x rows * cols) float array whose row
+    dr * FOOTPRINT + dc is the (rows x cols) board shifted up by
+    dr rows and left by dc columns, with blocked cells (and cells
+    off the board) set to 1 and attach cells set to ATTACH.
+    """
+    rows, cols = blocked.shape
+    padded = np.ones((rows + FOOTPRINT - 1, cols + FOOTPRINT - 1), dtype=np.float32)
+    padded[:rows, :cols] = blocked + attach * np.float32(ATTACH)
+    # windows[dr, dc] is padded[dr : dr + rows, dc : dc + cols]
+    windows = np.lib.stride_tricks.as_strided(
+        padded, (FOOTPRINT, FOOTPRINT, rows, cols), padded.strides * 2
+    )
+    return windows.reshape(FOOTPRINT * FOOTPRINT, rows * cols)
+
+
+def _crop(
+    blocked: BoolArray, attach: BoolArray
+) -> tuple[BoolArray, BoolArray, int, int]:
+    """
+    Crop blocked and attach to the cells that a piece covering one
+    of the attach cells can reach, which is all legal_placements
+    needs to look at. Treating the cells outside the cropped arrays
+    as blocked (as _shifted_views does) only rules out placements
+    that cannot cover an attach cell anyway.
+
+    Returns [tuple[BoolArray, BoolArray, int, int]]: the cropped
+        arrays, and the row and column of their top-left cell
+    """
+    rows = attach.any(axis=1).nonzero()[0]
+    cols = attach.any(axis=0).nonzero()[0]
+    top = max(int(rows[0]) - FOOTPRINT + 1, 0)
+    left = max(int(cols[0]) - FOOTPRINT + 1, 0)
+    bottom = int(rows[-1]) + FOOTPRINT
+    right = int(cols[-1]) + FOOTPRINT
+    return (
+        blocked[top:bottom, left:right],
+        attach[top:bottom, left:right],
+        top,
+        left,
+    )
+
+
+@lru_cache(maxsize=None)
+def _selection(kinds: frozenset[ShapeKind]) -> tuple[list[int], BoolArray, list[int]]:
+    """
+    Returns the _ROWS indices of every orientation of the given
+    shapes (in ORIENTATIONS order), their rows of _footprints(),
+    and the position in that list of the first orientation of
+    each shape.
+    """
+    footprints = _footprints()
+    rows: list[int] = []
+    starts: list[int] = []
+    for kind in ORIENTATIONS:
+        if kind in kinds:
+            starts.append(len(rows))
+            first = _FIRST_ROW[kind]
+            rows.extend(range(first, first + len(ORIENTATIONS[kind])))
+    return rows, footprints[rows], starts
+
+
+def _legal_matrix(
+    kinds: Collection[ShapeKind], blocked: BoolArray, attach: BoolArray
+) -> tuple[list[int], BoolArray, list[int]]:
+    """
+    Returns _selection(kinds), except that the footprints are
+    replaced by the (orientations x rows * cols) boolean array
+    whose row for each orientation is the flattened result of
+    legal_anchors on the (rows x cols) arrays given.
+    """
+    rows, footprints, starts = _selection(frozenset(kinds))
+    # Each entry is the number of blocked cells a placement covers
+    # plus ATTACH times the number of attach cells it covers
+    covered = footprints @ _shifted_views(blocked, attach)
+    return rows, (covered > 0) & (covered < 1), starts
+
+
+def legal_placements(
+    kinds: Collection[ShapeKind], blocked: BoolArray, attach: BoolArray
+) -> list[tuple[ShapeKind, int, int, int]]:
+    """
+    Find every legal placement of every orientation of the given
+    shapes at once.
+
+    Inputs:
+        kinds [Collection[ShapeKind]]: the shapes to place
+        blocked [BoolArray]: as for legal_anchors
+        attach [BoolArray]: as for legal_anchors
+
+    Returns [list[tuple[ShapeKind, int, int, int]]]: the kind,
+        orientation index and anchor row and column of each legal
+        placement
+    """
+    if not kinds or not attach.any():
+        return []
+    blocked, attach, top, left = _crop(blocked, attach)
+    rows, legal, _ = _legal_matrix(kinds, blocked, attach)
+    width = blocked.shape[1]
+    found, positions = legal.nonzero()
+    placements = []
+    for row, pos in zip(found.tolist(), positions.tolist()):
+        kind, index, min_row, min_col = _ROWS[rows[row]]
+        i, j = divmod(pos, width)
+        placements.append((kind, index, top + i - min_row, left + j - min_col))
+    return placements
+
+
+def count_placements(
+    kinds: Collection[ShapeKind], blocked: BoolArray, attach: BoolArray
+) -> dict[ShapeKind, int]:
+    """
+    Count the legal placements of each of the given shapes, as
+    found by legal_placements, without listing them.
+
+    Returns [dict[ShapeKind, int]]: the number of legal placements
+        of each shape, over all of its orientations
+    """
+    if not kinds or not attach.any():
+        return {kind: 0 for kind in kinds}
+    blocked, attach, _, _ = _crop(blocked, attach)
+    rows, legal, starts = _legal_matrix(kinds, blocked, attach)
+    totals = np.add.reduceat(legal.sum(axis=1), starts).tolist()
+    return {_ROWS[rows[start]][0]: total for start, total in zip(starts, totals)}
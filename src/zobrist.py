@@ -0,0 +1,95 @@
+"""
+Zobrist hashing of Blokus positions.
+
+A position is hashed by XOR-ing together one random 64-bit key
+for every occupied (cell, player) pair, one for every shape
+each player still has, one for every retired player, and one
+for the player to move (player 0 once the game is over). Since
+XOR is its own inverse, a move updates the hash by XOR-ing in
+and out just the keys it affects.
+
+The keys depend only on the board size and are generated from
+a fixed seed, so equal positions get equal hashes in every
+game and every process.
+"""
+import random
+from functools import lru_cache
+
+from shape_definitions import ShapeKind
+from base import BlokusBase
+
+MAX_PLAYERS = 4
+
+
+class ZobristKeys:
+    """
+    The random keys used to hash positions on a board of one size.
+
+    cells[player] is indexed by bitboard position (see bitboard.py),
+    so it has a (never used) key for the padding column too.
+    """
+
+    size: int
+    cells: dict[int, list[int]]
+    shapes: dict[tuple[int, ShapeKind], int]
+    retired: dict[int, int]
+    to_move: list[int]
+
+    def __init__(self, size: int) -> None:
+        """
+        Generate the keys for a (size x size) board.
+        """
+        rng = random.Random(f"blokus-zobrist-{size}")
+        width = size + 1
+        self.size = size
+        self.cells = {}
+        self.shapes = {}
+        self.retired = {}
+        for player in range(1, MAX_PLAYERS + 1):
+            self.cells[player] = [rng.getrandbits(64) for _ in range(size * width)]
+            for kind in ShapeKind:
+                self.shapes[(player, kind)] = rng.getrandbits(64)
+            self.retired[player] = rng.getrandbits(64)
+        self.to_move = [rng.getrandbits(64) for _ in range(MAX_PLAYERS + 1)]
+
+    def initial_hash(self, num_players: int) -> int:
+        """
+        Returns the hash of an empty board on which every player
+        has all their shapes and player 1 is to move.
+        """
+        h = self.to_move[1]
+        for player in range(1, num_players + 1):
+            for kind in ShapeKind:
+                h ^= self.shapes[(player, kind)]
+        return h
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(size: int) -> ZobristKeys:
+    """
+    Returns the keys for a (size x size) board, generating them
+    the first time they are needed.
+    """
+    return ZobristKeys(size)
+
+
+def position_hash(game: BlokusBase) -> int:
+    """
+    Compute the hash of a position from scratch, using only the
+    public BlokusBase interface. Blokus keeps the same value up
+    to date incrementally; this is the reference it is tested
+    against.
+    """
+    keys = zobrist_keys(game.size)
+    width = game.size + 1
+    h = keys.to_move[game.curr_player if not game.game_over else 0]
+    for r, row in enumerate(game.grid):
+        for c, cell in enumerate(row):
+            if cell is not None:
+                h ^= keys.cells[cell[0]][r * width + c]
+    for player in range(1, game.num_players + 1):
+        for kind in game.remaining_shapes(player):
+            h ^= keys.shapes[(player, kind)]
+        if player in game.retired_players:
+            h ^= keys.retired[player]
+    return h
@@ -0,0 +1,68 @@
+import pytest
+
+from blokus import Blokus
+
+np = pytest.importorskip("numpy")
+
+from batch import BatchGames
+
+
+@pytest.mark.parametrize(
+    "layout",
+    [
+        (2, 8, {(0, 0), (7, 7)}),
+        (3, 8, {(0, 0), (7, 7), (0, 7)}),
+        (4, 9, {(0, 0), (8, 8), (0, 8), (8, 0)}),
+        (2, 8, {(0, 0), (7, 7), (8, 8)}),
+    ],
+)
+def test_batch_matches_blokus(layout: tuple) -> None:
+    """Tests that batched games follow the rules of Blokus, turn by turn:
+    the same player to move and number of legal moves, only legal moves
+    and retirements, and the same final scores."""
+    num_players, size, starts = layout
+    batch = BatchGames(5, num_players, size, starts, seed=4, record=True)
+    games = [Blokus(num_players, size, starts) for _ in range(5)]
+    while not batch.done.all():
+        masks = batch.legal_masks()
+        for g, bk in enumerate(games):
+            assert batch.done[g] == bk.game_over
+            if not bk.game_over:
+                assert batch.curr_player[g] == bk.curr_player
+                assert masks[g].sum() == len(bk.legal_move_list())
+        batch.step()
+        assert batch.history is not None
+        for g in batch.history[-1][0].tolist():
+            move = batch.moves(g)[-1]
+            if move is None:
+                assert not games[g].has_any_move()
+                games[g].retire()
+            else:
+                assert games[g].maybe_place(move)
+
+    scores = batch.scores()
+    for g, bk in enumerate(games):
+        assert bk.game_over
+        assert scores[g, 1:].tolist() == [
+            bk.get_score(p) for p in range(1, num_players + 1)
+        ]
+
+
+def test_batch_is_reproducible() -> None:
+    """Tests that the games depend only on the seed, and that the games of
+    a batch are not all the same."""
+    starts = {(0, 0), (10, 10)}
+    first = BatchGames(40, 2, 11, starts, seed=9).play_out()
+    again = BatchGames(40, 2, 11, starts, seed=9).play_out()
+    assert (first == again).all()
+    assert len({tuple(row) for row in first.tolist()}) > 1
+
+
+def test_batch_errors() -> None:
+    """Tests the arguments that BatchGames rejects."""
+    with pytest.raises(ValueError):
+        BatchGames(0, 2, 11, {(0, 0), (10, 10)})
+    with pytest.raises(ValueError):
+        BatchGames(3, 2, 11, {(0, 0)})
+    with pytest.raises(ValueError):
+        BatchGames(3, 2, 11, {(0, 0), (10, 10)}).moves(0)
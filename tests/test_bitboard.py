@@ -0,0 +1,119 @@
+import random
+
+from piece import Point, Piece
+from base import Grid
+from blokus import Blokus
+from bitboard import (
+    board_mask,
+    points_mask,
+    iter_points,
+    edge_neighbors,
+    corner_neighbors,
+)
+from orientations import ORIENTATIONS, orientation_piece
+
+
+def reference_legal(bk: Blokus, grid: Grid, piece: Piece) -> bool:
+    """
+    Legality check that walks the grid cell by cell, the way
+    Blokus.legal_to_place did before the board became bitboards.
+    """
+    player = bk.curr_player
+    for r, c in piece.squares():
+        if not (0 <= r < bk.size and 0 <= c < bk.size) or grid[r][c] is not None:
+            return False
+    if len(bk.remaining_shapes(player)) == 21:
+        return any(square in bk.start_positions for square in piece.squares())
+    for r, c in piece.cardinal_neighbors(bk.size):
+        cell = grid[r][c]
+        if cell is not None and cell[0] == player:
+            return False
+    for r, c in piece.intercardinal_neighbors(bk.size):
+        cell = grid[r][c]
+        if cell is not None and cell[0] == player:
+            return True
+    return False
+
+
+def test_masks_round_trip() -> None:
+    """Tests that points survive a round trip through a mask, and that the
+    neighbor masks do not wrap around the edges of the board."""
+    size = 5
+    width = size + 1
+    board = board_mask(size)
+    points: list[Point] = [(0, 0), (0, 4), (2, 3), (4, 0), (4, 4)]
+    assert sorted(iter_points(points_mask(points, width), width)) == sorted(points)
+
+    right_edge = points_mask([(1, 4)], width)
+    assert sorted(iter_points(edge_neighbors(right_edge, width, board), width)) == [
+        (0, 4), (1, 3), (2, 4)
+    ]
+    left_edge = points_mask([(1, 0)], width)
+    assert sorted(iter_points(corner_neighbors(left_edge, width, board), width)) == [
+        (0, 1), (2, 1)
+    ]
+
+
+def test_bitboard_legality_matches_grid() -> None:
+    """Plays random games and checks, at every turn, that legal_to_place
+    agrees with a cell-by-cell check on the grid for a sample of pieces,
+    and that the lazily built grid matches the pieces that were placed."""
+    rng = random.Random(142)
+    for _ in range(3):
+        bk = Blokus(2, 9, {(0, 0), (8, 8)})
+        expected: Grid = [[None] * 9 for _ in range(9)]
+        for _ in range(12):
+            grid = bk.grid
+            assert grid == expected
+            player = bk.curr_player
+            for _ in range(150):
+                kind = rng.choice(bk.remaining_shapes(player))
+                index = rng.randrange(len(ORIENTATIONS[kind]))
+                anchor = (rng.randrange(-1, 10), rng.randrange(-1, 10))
+                piece = orientation_piece(kind, index, anchor)
+                assert bk.legal_to_place(piece) == reference_legal(bk, grid, piece)
+
+            moves = list(bk.available_moves())
+            if not moves:
+                bk.retire()
+                if bk.game_over:
+                    break
+                continue
+            move = rng.choice(moves)
+            assert bk.maybe_place(move)
+            for r, c in move.squares():
+                expected[r][c] = (player, move.shape.kind)
+
+
+def test_incremental_frontier_matches_recomputation() -> None:
+    """Plays random four-player games and checks after every move that the
+    forbidden and corner cells maintained by maybe_place (both the sets and
+    the bitboards) match a from-scratch computation over the whole board."""
+    rng = random.Random(7)
+    size = 12
+    width = size + 1
+    board = board_mask(size)
+    for _ in range(2):
+        bk = Blokus(4, size, {(0, 0), (0, 11), (11, 0), (11, 11)})
+        for _ in range(40):
+            if bk.game_over:
+                break
+            moves = list(bk.available_moves())
+            if not moves:
+                bk.retire()
+                continue
+            assert bk.maybe_place(rng.choice(moves))
+
+            union = bk._union
+            for player in range(1, 5):
+                cells = []
+                for r in range(size):
+                    for c in range(size):
+                        cell = bk.grid[r][c]
+                        if cell is not None and cell[0] == player:
+                            cells.append((r, c))
+                own = points_mask(cells, width)
+                forbidden = edge_neighbors(own, width, board)
+                corners = corner_neighbors(own, width, board) & ~forbidden & ~union
+                assert bk._forbidden[player] == forbidden
+                assert bk._corners[player] == corners
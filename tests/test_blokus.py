@@ -7,6 +7,7 @@ from piece import Shape, Piece
 from base import BlokusBase
 from blokus import Blokus
 from fakes import BlokusFake
+from move import Move
 
 def test_inheritance() -> None:
     """Test that Blokus inherits from BlokusBase"""
@@ -849,3 +850,205 @@ def test_20_points() -> None:
     
 
 
+
+def test_incremental_score_and_cached_winners() -> None:
+    """
+    Tests that get_score matches a count of the squares of the remaining
+    shapes throughout a game, that winners is None until the game is over,
+    and that the winners computed at the end of the game are cached.
+    """
+    bk = Blokus(2, 10, {(0, 0), (9, 9)})
+    pieces = [(ShapeKind.C, (0, 0)), (ShapeKind.FOUR, (9, 7)),
+              (ShapeKind.SEVEN, (3, 2)), (ShapeKind.F, (7, 5))]
+    for kind, anchor in pieces:
+        assert bk.winners is None
+        piece = Piece(bk.shapes[kind])
+        piece.set_anchor(anchor)
+        assert bk.maybe_place(piece)
+        for player in (1, 2):
+            expected = -sum(len(bk.shapes[k].squares) for k in bk.remaining_shapes(player))
+            assert bk.get_score(player) == expected
+
+    assert bk.get_score(1) == -82
+    assert bk.get_score(2) == -80
+    bk.retire()
+    assert bk.winners is None
+    bk.retire()
+    assert bk.game_over
+    assert bk.winners == [2]
+    assert bk._winners == [2]
+    assert bk.winners == [2]
+
+def test_turns_skip_retired_and_finished_players() -> None:
+    """
+    Tests that, with three players, the turn passes over a player who has
+    retired, and that game_over and curr_player follow the active players
+    as they retire one by one.
+    """
+    bk = Blokus(3, 10, {(0, 0), (9, 9), (0, 9)})
+    one = Piece(bk.shapes[ShapeKind.ONE])
+    one.set_anchor((0, 0))
+    assert bk.maybe_place(one)
+    assert bk.curr_player == 2
+    bk.retire()
+    assert bk.curr_player == 3
+    three = Piece(bk.shapes[ShapeKind.THREE])
+    three.set_anchor((0, 8))
+    assert bk.maybe_place(three)
+    assert bk.curr_player == 1
+    two = Piece(bk.shapes[ShapeKind.TWO])
+    two.set_anchor((1, 1))
+    assert bk.maybe_place(two)
+    assert bk.curr_player == 3
+    bk.retire()
+    assert bk.curr_player == 1
+    assert not bk.game_over
+    bk.retire()
+    assert bk.game_over
+    assert bk.retired_players == {1, 2, 3}
+    assert bk.curr_player == 0
+
+def game_state(bk: Blokus) -> tuple:
+    """
+    Helper that captures every piece of (private) game state that
+    maybe_place, retire and undo touch, for comparisons in tests.
+    """
+    return (
+        [row[:] for row in bk.grid],
+        bk.curr_player,
+        bk.game_over,
+        set(bk.retired_players),
+        list(bk._active),
+        {p: set(s) for p, s in bk._shapes_left.items()},
+        {p: set(s) for p, s in bk._shapes_placed.items()},
+        dict(bk._last_moves),
+        {p: bk.get_score(p) for p in range(1, bk.num_players + 1)},
+        dict(bk._occupied),
+        bk._union,
+        dict(bk._forbidden),
+        dict(bk._corners),
+        bk._num_moves,
+    )
+
+def test_undo_restores_state() -> None:
+    """
+    Plays random three-player games to completion (with retirements),
+    then undoes every move and checks that each earlier state, including
+    the incremental caches, is restored exactly. Also checks that undo
+    raises a ValueError once there is nothing left to undo.
+    """
+    import random
+    rng = random.Random(8)
+    for _ in range(3):
+        bk = Blokus(3, 9, {(0, 0), (8, 8), (0, 8)})
+        states = [game_state(bk)]
+        while not bk.game_over:
+            moves = list(bk.available_moves())
+            if moves and rng.random() > 0.03:
+                assert bk.maybe_place(rng.choice(moves))
+            else:
+                bk.retire()
+            states.append(game_state(bk))
+        assert bk.winners is not None
+
+        for state in reversed(states[:-1]):
+            bk.undo()
+            assert game_state(bk) == state
+        assert bk.winners is None
+        with pytest.raises(ValueError):
+            bk.undo()
+
+def test_piece_equality_and_hash() -> None:
+    """
+    Tests that pieces are equal (and hash equally) exactly when they have
+    the same kind of shape and cover the same squares, however they were
+    transformed, and that the cached hash follows the piece when it is
+    re-anchored or transformed.
+    """
+    bk = Blokus(1, 7, {(0, 0)})
+    o_piece = Piece(bk.shapes[ShapeKind.LETTER_O])
+    o_piece.set_anchor((2, 2))
+    moved = Piece(bk.shapes[ShapeKind.LETTER_O])
+    moved.set_anchor((3, 3))
+    assert o_piece != moved
+
+    z_piece = Piece(bk.shapes[ShapeKind.Z])
+    z_piece.set_anchor((3, 3))
+    z_twice = Piece(bk.shapes[ShapeKind.Z], rotation=2)
+    z_twice.set_anchor((3, 3))
+    assert z_piece == z_twice
+    assert len({z_piece, z_twice}) == 1
+
+    hash(o_piece)
+    o_piece.set_anchor((3, 3))
+    assert o_piece == moved and hash(o_piece) == hash(moved)
+    hash(z_piece)
+    z_piece.flip_horizontally()
+    assert z_piece != z_twice
+    z_piece.flip_horizontally()
+    assert hash(z_piece) == hash(z_twice)
+
+    one = Piece(bk.shapes[ShapeKind.ONE])
+    assert one == Piece(bk.shapes[ShapeKind.ONE])
+    one.set_anchor((0, 0))
+    assert one != Piece(bk.shapes[ShapeKind.ONE])
+    assert o_piece != moved.shape
+
+    # Every legal placement of every orientation collapses to one
+    # element per distinct move
+    placements = set()
+    count = 0
+    for kind in bk.remaining_shapes(1):
+        for face_up in [True, False]:
+            for rotation in range(4):
+                piece = Piece(bk.shapes[kind], face_up, rotation)
+                piece.set_anchor((1, 1))
+                if bk.legal_to_place(piece):
+                    placements.add(piece)
+                    count += 1
+    assert count > len(placements)
+    assert len(placements) == len({Move.from_piece(p) for p in placements})
+
+def test_fork_is_independent() -> None:
+    """
+    Forks random four-player games part way through and plays both games
+    on to the end with different moves, checking that neither game ever
+    sees the other's moves, that a fork can undo moves made before it was
+    forked, and that a snapshot keeps its position.
+    """
+    import random
+    rng = random.Random(15)
+    for turns in [0, 5, 17]:
+        bk = Blokus(4, 10, {(0, 0), (0, 9), (9, 0), (9, 9)})
+        for _ in range(turns):
+            moves = sorted(bk.legal_moves(), key=lambda m: m.encode())
+            if moves:
+                bk.maybe_place(rng.choice(moves))
+            else:
+                bk.retire()
+        forked = bk.fork()
+        saved = bk.snapshot()
+        state = game_state(bk)
+        assert game_state(forked) == state
+        assert forked.position_hash == bk.position_hash
+
+        histories: list[list[tuple]] = [[], []]
+        for game, history in [(bk, histories[0]), (forked, histories[1])]:
+            while not game.game_over:
+                moves = sorted(game.legal_moves(), key=lambda m: m.encode())
+                if moves and rng.random() > 0.05:
+                    game.maybe_place(rng.choice(moves))
+                else:
+                    game.retire()
+                history.append(game_state(game))
+            assert game_state(saved) == state
+
+        for game, history in [(bk, histories[0]), (forked, histories[1])]:
+            for expected in reversed(history[:-1]):
+                game.undo()
+                assert game_state(game) == expected
+            game.undo()
+            assert game_state(game) == state
+        if turns:
+            forked.undo()
+            assert game_state(bk) == state
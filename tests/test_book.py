@@ -0,0 +1,64 @@
+import os
+import pathlib
+import random
+
+import pytest
+
+from blokus import Blokus
+from book import OpeningBook, book_key, default_book, write_book
+from bot import SearchBot
+from build_book import build_entries
+from move import Move
+from shape_definitions import ShapeKind
+
+
+def test_book_round_trip(tmp_path: pathlib.Path) -> None:
+    """Tests that every entry written to a book, including ones that land
+    in the same slot, is found again, and that missing keys are not."""
+    entries = {
+        key: Move(kind, 0, (key % 7, 1))
+        for key, kind in zip([3, 11, 19, 2**64 - 1], ShapeKind)
+    }
+    path = os.path.join(tmp_path, "test.book")
+    write_book(path, entries)
+    book = OpeningBook(path)
+    assert len(book) == 4
+    for key, move in entries.items():
+        assert book.lookup(key) == move
+    assert book.lookup(4) is None
+    book.close()
+
+    with open(path, "wb") as file:
+        file.write(b"not a book")
+    with pytest.raises(ValueError):
+        OpeningBook(path)
+
+
+def test_book_keys_depend_on_layout() -> None:
+    """Tests that empty boards of the same size with different numbers of
+    players or start positions get different keys."""
+    corners = {(0, 0), (19, 19), (0, 19), (19, 0)}
+    keys = {
+        book_key(Blokus(2, 20, corners)),
+        book_key(Blokus(4, 20, corners)),
+        book_key(Blokus(2, 20, {(0, 0), (19, 19)})),
+    }
+    assert len(keys) == 3
+
+
+def test_built_book_is_played() -> None:
+    """Tests that a book built for a board holds a legal move for the first
+    position and each reply, and that a SearchBot plays the default book's
+    move without searching."""
+    layout = (2, 11, {(0, 0), (10, 10)})
+    entries = build_entries(layout, 2, 0.01, max_depth=1)
+    bk = Blokus(*layout)
+    assert len(entries) == 1 + len(bk.legal_move_list())
+    assert entries[book_key(bk)] in bk.legal_moves()
+
+    if default_book() is None:
+        pytest.skip("no default opening book")
+    bot = SearchBot(bk, 1, random.Random(5))
+    bot.make_move()
+    assert bot.stats()["book_moves"] == 1
+    assert bot.stats()["nodes"] == 0
@@ -0,0 +1,76 @@
+import random
+import time
+
+from blokus import Blokus
+from bot import BestMove, MCTSBot, Player, SearchBot, game_seed, play_game, play_games, run_game
+
+
+def test_games_are_reproducible() -> None:
+    """Tests that a game's result depends only on its seed, and that a
+    simulation gives the same results whatever the number of workers."""
+    seed = game_seed(11, 0)
+    assert seed == game_seed(11, 0)
+    assert seed != game_seed(11, 1)
+    assert play_game("N", "N", seed) == play_game("N", "N", seed)
+
+    sequential = play_games("N", "S", 6, 11)
+    assert len(sequential) == 6
+    assert play_games("N", "S", 6, 11, workers=2) == sequential
+
+
+class SlowBot(Player):
+    """A bot that offers one move and then thinks far past its deadline."""
+
+    def think(self, game: Blokus, deadline: float, best: BestMove) -> None:
+        best.offer(game.legal_move_list()[-1])
+        time.sleep(1.0)
+        best.offer(game.legal_move_list()[0])
+
+
+class SilentBot(Player):
+    """A bot that never offers a move."""
+
+    def think(self, game: Blokus, deadline: float, best: BestMove) -> None:
+        time.sleep(1.0)
+
+
+def test_timed_move_enforces_budget() -> None:
+    """Tests that the driver takes the best move offered by the deadline, or
+    a legal fallback if none was offered, without waiting for the bot."""
+    bk = Blokus(2, 11, {(0, 0), (10, 10)})
+    start = time.perf_counter()
+    move = SlowBot(bk, 1).timed_move(0.1)
+    assert time.perf_counter() - start < 0.5
+    assert move == bk.legal_move_list()[-1]
+
+    calls: list[float] = []
+    move = SilentBot(bk, 1).timed_move(0.1, lambda: calls.append(1.0))
+    assert move in bk.legal_moves()
+    assert calls
+
+    bot = SearchBot(bk, 1, random.Random(7), book=False, time_limit=60.0)
+    start = time.perf_counter()
+    bot.make_move(0.2)
+    assert time.perf_counter() - start < 0.6
+    assert bk.curr_player == 2
+
+
+def test_move_time_setting() -> None:
+    """Tests that bots of every kind play a whole game under a move budget."""
+    winners, stats = run_game(["A", "M"], "bot", 8, {"move_time": 0.02})
+    assert winners is not None
+    assert stats[0]["nodes"] > 0 and stats[1]["playouts"] > 0
+    winners, _ = run_game(["S", "N"], "bot", 8, {"move_time": 0.02})
+    assert winners is not None
+
+
+def test_timed_search_uses_budget() -> None:
+    """Tests that search bots without limits of their own think for the
+    whole budget, and that their statistics include the last move."""
+    for bot_type in [MCTSBot, SearchBot]:
+        bk = Blokus(2, 11, {(0, 0), (10, 10)})
+        bot = bot_type(bk, 1, random.Random(3), book=False)
+        start = time.perf_counter()
+        bot.timed_move(0.4)
+        assert time.perf_counter() - start > 0.3
+        assert bot.stats()["seconds"] > 0.3
@@ -0,0 +1,93 @@
+import random
+from typing import Any
+
+import pytest
+
+from blokus import Blokus
+from bot import BOTS, Player, SBot, with_endgame
+from endgame import EndgameSolver
+
+
+def minimax(bk: Blokus, root: int) -> int:
+    """Returns the final margin of root by plain minimax, as a reference."""
+    if bk.game_over:
+        others = [bk.get_score(p) for p in range(1, bk.num_players + 1) if p != root]
+        return bk.get_score(root) - max(others)
+    moves = bk.legal_move_list()
+    if not moves:
+        bk.retire()
+        value = minimax(bk, root)
+        bk.undo()
+        return value
+    values = []
+    for move in moves:
+        bk.maybe_place(move)
+        values.append(minimax(bk, root))
+        bk.undo()
+    return max(values) if bk.curr_player == root else min(values)
+
+
+def endgame(seed: int, num_players: int) -> Blokus:
+    """Plays random moves on a small board until the players have few
+    moves left between them."""
+    rng = random.Random(seed)
+    starts = {(0, 0), (5, 5), (0, 5), (5, 0)}
+    bk = Blokus(num_players, 6, starts)
+    while not bk.game_over:
+        left = sum(
+            len(bk.legal_move_list(p))
+            for p in range(1, num_players + 1)
+            if p not in bk.retired_players
+        )
+        if left <= 10:
+            break
+        moves = bk.legal_move_list()
+        if moves:
+            bk.maybe_place(rng.choice(moves))
+        else:
+            bk.retire()
+    return bk
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_solver_matches_minimax(seed: int) -> None:
+    """Tests that the solver finds the exact final margin, and a move that
+    achieves it, without changing the game."""
+    bk = endgame(seed, 2 + seed % 2)
+    if bk.game_over:
+        pytest.skip("game ended early")
+    before = bk.position_hash
+    result = EndgameSolver(10**6).solve(bk)
+    assert result is not None
+    move, margin = result
+    assert bk.position_hash == before
+    assert margin == minimax(bk, bk.curr_player)
+    if move is not None:
+        player = bk.curr_player
+        bk.maybe_place(move)
+        assert minimax(bk, player) == margin
+
+
+def test_solver_gives_up_at_node_limit() -> None:
+    """Tests that a search larger than the node limit is abandoned."""
+    bk = Blokus(2, 8, {(0, 0), (7, 7)})
+    solver = EndgameSolver(50)
+    assert solver.solve(bk) is None
+    assert solver.abandoned == 1 and solver.solved == 0
+
+
+def test_endgame_player_plays_a_game() -> None:
+    """Tests that any strategy can be given an endgame solver, which then
+    solves the last moves of a game."""
+    bot: type[Player] = with_endgame(SBot)
+    assert "endgame_plies" in bot.OPTIONS and "E" in BOTS
+    bk = Blokus(2, 8, {(0, 0), (7, 7)})
+    rng = random.Random(6)
+    # Settings are passed by name, as make_bot does
+    settings: dict[str, Any] = {"endgame_plies": 20}
+    bots = [bot(bk, 1, rng, **settings), SBot(bk, 2, rng)]
+    while not bk.game_over:
+        for player in bots:
+            player.make_move()
+    assert bk.winners is not None
+    assert bots[0].stats()["endgame_solved"] > 0
@@ -0,0 +1,66 @@
+import random
+from typing import Optional
+
+import pytest
+
+from blokus import Blokus
+from bot import MCTSBot, SBot
+from mcts import MCTS, score_rewards
+from move import Move
+from playout import playout
+
+
+def test_playout_rewards_winners() -> None:
+    """Tests that the rewards of a playout's final scores share 1 among the
+    winners of the game it played."""
+    bk = Blokus(3, 8, {(0, 0), (7, 7), (0, 7)})
+    record: list[Optional[Move]] = []
+    rewards = score_rewards(playout(bk, random.Random(1), record))
+    for move in record:
+        if move is None:
+            bk.retire()
+        else:
+            assert bk.maybe_place(move)
+    assert bk.game_over
+    assert sum(rewards) == pytest.approx(1)
+    assert bk.winners is not None
+    assert {p for p in range(1, 4) if rewards[p] > 0} == set(bk.winners)
+
+
+def test_search_leaves_game_unchanged_and_reuses_tree() -> None:
+    """Tests that a search returns a legal move without changing the game,
+    stops after the requested number of playouts, and that the next search
+    starts from the part of the tree it already explored."""
+    bk = Blokus(2, 8, {(0, 0), (7, 7)})
+    search = MCTS(random.Random(2))
+    before = bk.position_hash
+    move = search.search(bk, playouts=60)
+    assert move is not None and move in bk.legal_moves()
+    assert bk.position_hash == before
+    assert search.playouts == 60
+
+    root = search._root
+    assert root is not None
+    child = next(c for c in root.children if c.move == move)
+    visits = child.visits
+    bk.maybe_place(move)
+    search.search(bk, playouts=1)
+    assert search._root is child and child.parent is None
+    assert child.visits == visits + 1
+
+    with pytest.raises(ValueError):
+        search.search(bk)
+
+
+def test_mcts_bot_plays_a_game() -> None:
+    """Tests that an MCTSBot plays legal moves through a whole game and
+    reports how many playouts it ran."""
+    bk = Blokus(2, 7, {(0, 0), (6, 6)})
+    rng = random.Random(3)
+    bots = [MCTSBot(bk, 1, rng, playouts=15), SBot(bk, 2, rng)]
+    while not bk.game_over:
+        for bot in bots:
+            bot.make_move()
+    stats = bots[0].stats()
+    assert stats["playouts"] > 0 and stats["seconds"] > 0
+    assert bots[1].stats() == {}
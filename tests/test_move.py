@@ -0,0 +1,70 @@
+import pytest
+
+from shape_definitions import ShapeKind
+from piece import Piece
+from blokus import Blokus
+from move import Move
+from orientations import ORIENTATIONS
+
+
+def test_move_is_a_value() -> None:
+    """Tests that moves compare and hash by value, cannot be modified, and
+    survive a round trip through their int encoding."""
+    move = Move(ShapeKind.L, 3, (4, 5))
+    assert move == Move(ShapeKind.L, 3, (4, 5))
+    assert move != Move(ShapeKind.L, 2, (4, 5))
+    assert len({move, Move(ShapeKind.L, 3, (4, 5))}) == 1
+    with pytest.raises(AttributeError):
+        move.anchor = (0, 0)
+    with pytest.raises(ValueError):
+        Move(ShapeKind.X, 1, (0, 0))
+
+    for kind, orientations in ORIENTATIONS.items():
+        for index in range(len(orientations)):
+            for anchor in [(0, 0), (-2, 19), (13, -1)]:
+                move = Move(kind, index, anchor)
+                assert Move.decode(move.encode()) == move
+
+
+def test_move_piece_conversion() -> None:
+    """Tests that converting between Moves and Pieces preserves the squares
+    covered, including for pieces transformed with flips and rotations."""
+    bk = Blokus(1, 7, {(0, 0)})
+    piece = Piece(bk.shapes[ShapeKind.F])
+    piece.set_anchor((3, 3))
+    piece.flip_horizontally()
+    piece.rotate_left()
+    move = Move.from_piece(piece)
+    assert sorted(move.squares()) == sorted(piece.squares())
+    assert sorted(move.to_piece().squares()) == sorted(piece.squares())
+    assert move.size == 5
+
+    # The "O" piece rotated about its corner lands on different anchors
+    o_piece = Piece(bk.shapes[ShapeKind.LETTER_O])
+    o_piece.set_anchor((3, 3))
+    o_piece.rotate_right()
+    o_move = Move.from_piece(o_piece)
+    assert sorted(o_move.squares()) == sorted(o_piece.squares())
+
+
+def test_legal_moves_and_placing_moves() -> None:
+    """Tests that legal_moves describes the same placements as
+    available_moves, and that maybe_place and legal_to_place accept Moves."""
+    bk = Blokus(2, 8, {(0, 0), (7, 7)})
+    moves = bk.legal_moves()
+    pieces = bk.available_moves()
+    assert {frozenset(m.squares()) for m in moves} == {
+        frozenset(p.squares()) for p in pieces
+    }
+    assert len(moves) == len(pieces)
+
+    move = Move(ShapeKind.TWO, 0, (0, 0))
+    assert move in moves
+    assert bk.legal_to_place(move)
+    assert bk.maybe_place(move)
+    assert bk.grid[0][1] == (1, ShapeKind.TWO)
+    assert not bk.maybe_place(Move(ShapeKind.ONE, 0, (3, 3)))
+    assert bk.curr_player == 2
+    assert bk.maybe_place(Move(ShapeKind.ONE, 0, (7, 7)))
+    with pytest.raises(ValueError):
+        bk.maybe_place(Move(ShapeKind.TWO, 0, (1, 2)))
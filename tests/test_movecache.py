@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from blokus import Blokus
+from move import Move
+from movecache import MoveCache, moves_bytes
+from shape_definitions import ShapeKind
+
+
+def moves(n: int) -> tuple[Move, ...]:
+    """Returns n distinct moves, to store in a cache."""
+    return tuple(Move(ShapeKind.ONE, 0, (0, c)) for c in range(n))
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    """Tests that the cache keeps at most max_entries entries, evicting the
+    least recently used, and counts hits, misses and evictions."""
+    cache = MoveCache(max_entries=2)
+    cache.put((1, 0, 1, True), moves(1))
+    cache.put((2, 0, 1, True), moves(2))
+    assert cache.get((1, 0, 1, True)) == moves(1)
+    cache.put((3, 0, 1, True), moves(3))
+    assert cache.get((2, 0, 1, True)) is None
+    assert cache.get((1, 0, 1, True)) == moves(1)
+    assert cache.get((3, 0, 1, True)) == moves(3)
+    assert len(cache) == 2
+    assert cache.stats() == {
+        "entries": 2,
+        "bytes": moves_bytes(moves(1)) + moves_bytes(moves(3)),
+        "hits": 3,
+        "misses": 1,
+        "evictions": 1,
+    }
+    cache.clear()
+    assert len(cache) == 0 and cache.bytes == 0
+
+
+def test_cache_is_bounded_by_memory() -> None:
+    """Tests that entries are evicted to keep under max_bytes, and that an
+    entry larger than max_bytes is not stored."""
+    cache = MoveCache(max_bytes=moves_bytes(moves(10)) * 2)
+    for key in range(5):
+        cache.put((key, 0, 1, True), moves(10))
+    assert len(cache) == 2 and cache.evictions == 3
+    cache.put((9, 0, 1, True), moves(100))
+    assert cache.get((9, 0, 1, True)) is None and len(cache) == 2
+    with pytest.raises(ValueError):
+        MoveCache(max_entries=0)
+
+
+def test_blokus_consults_cache() -> None:
+    """Tests that a game with a move cache finds the same moves as one
+    without, that positions seen again (and in forks) are cache hits, and
+    that games with other start positions get their own entries."""
+    starts = {(0, 0), (9, 9), (0, 9), (9, 0)}
+    plain = Blokus(3, 10, starts)
+    bk = Blokus(3, 10, starts)
+    cache = MoveCache()
+    bk.move_cache = cache
+    rng = random.Random(5)
+    turns = 0
+    while not bk.game_over:
+        turns += 1
+        listed = bk.legal_move_list()
+        assert listed == plain.legal_move_list()
+        assert bk.legal_moves() == plain.legal_moves()
+        for player in range(1, 4):
+            assert bk.count_available_moves(
+                player, by_shape=True
+            ) == plain.count_available_moves(player, by_shape=True)
+        if listed:
+            move = rng.choice(listed)
+            bk.maybe_place(move)
+            plain.maybe_place(move)
+        else:
+            bk.retire()
+            plain.retire()
+    assert cache.hits > 0 and cache.misses > 0
+
+    for _ in range(turns):
+        bk.undo()
+    hits = cache.hits
+    assert bk.fork().legal_move_list() == Blokus(3, 10, starts).legal_move_list()
+    assert cache.hits == hits + 1
+
+    other = Blokus(3, 10, {(4, 4), (5, 5), (4, 5)})
+    other.move_cache = cache
+    assert other.position_hash == bk.position_hash
+    assert set(other.legal_move_list()) != set(bk.legal_move_list())
+
+
+def test_cache_keeps_generator_order() -> None:
+    """Tests that games with different move generators sharing a cache each
+    list their moves in their own generator's order."""
+    starts = {(0, 0), (9, 9)}
+    cache = MoveCache()
+    for vectorized in [True, False, True, False]:
+        bk = Blokus(2, 10, starts)
+        bk.vectorized = vectorized
+        expected = bk.legal_move_list()
+        bk.move_cache = cache
+        assert bk.legal_move_list() == expected
+    assert cache.hits == 2
@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from blokus import Blokus
+from vectorized import HAVE_NUMPY
+
+
+def random_game(seed: int, num_players: int, size: int, turns: int) -> Blokus:
+    """
+    Helper that plays up to the given number of uniformly random moves
+    on a board with start positions in the corners.
+    """
+    rng = random.Random(seed)
+    last = size - 1
+    bk = Blokus(num_players, size, {(0, 0), (last, last), (0, last), (last, 0)})
+    for _ in range(turns):
+        if bk.game_over:
+            break
+        moves = list(bk.available_moves())
+        if moves:
+            assert bk.maybe_place(rng.choice(moves))
+        else:
+            bk.retire()
+    return bk
+
+
+def test_frontier_matches_full_scan() -> None:
+    """Tests that the corner-frontier generator finds exactly the legal
+    placements that an exhaustive scan of the board finds, while trying
+    far fewer candidate placements."""
+    for seed, turns in [(1, 0), (2, 6), (3, 14), (4, 30)]:
+        bk = random_game(seed, 3, 12, turns)
+        if bk.game_over:
+            continue
+        player = bk.curr_player
+        scan = list(bk._scan_candidates(player))
+        frontier = list(bk._frontier_candidates(player))
+        assert len(frontier) < len(scan)
+        assert len({c[:3] for c in frontier}) == len(frontier)
+
+        legal_scan = {c[:3] for c in scan if bk._legal_mask(player, c[3])}
+        legal_frontier = {c[:3] for c in frontier if bk._legal_mask(player, c[3])}
+        assert legal_scan == legal_frontier
+
+
+def test_count_available_moves() -> None:
+    """Tests that count_available_moves agrees with the moves available to
+    every player (not just the current one), both in total and by shape,
+    with either move generator."""
+    for seed, turns in [(5, 0), (6, 8), (7, 20), (8, 44)]:
+        bk = random_game(seed, 4, 14, turns)
+        if bk.game_over:
+            continue
+        for vectorized in [False, True]:
+            bk.vectorized = vectorized and HAVE_NUMPY
+            assert bk.count_available_moves() == len(bk.available_moves())
+            for player in range(1, 5):
+                expected = {kind: 0 for kind in bk.remaining_shapes(player)}
+                for c in bk._frontier_candidates(player):
+                    if bk._legal_mask(player, c[3]):
+                        expected[c[0]] += 1
+                assert bk.count_available_moves(player, by_shape=True) == expected
+                assert bk.count_available_moves(player) == sum(expected.values())
+
+    bk = random_game(9, 2, 8, 0)
+    with pytest.raises(ValueError):
+        bk.count_available_moves(3)
+
+
+def test_iter_available_moves_and_has_any_move() -> None:
+    """Tests that iter_available_moves yields exactly the available moves,
+    in order of shape size when asked to, and that has_any_move agrees with
+    whether each player has any moves."""
+    for seed, turns in [(10, 0), (11, 7), (12, 19), (13, 40), (14, 60)]:
+        bk = random_game(seed, 4, 11, turns)
+        if bk.game_over:
+            continue
+        expected = {frozenset(p.squares()) for p in bk.available_moves()}
+        for order in [None, "largest", "smallest"]:
+            pieces = list(bk.iter_available_moves(order))
+            assert {frozenset(p.squares()) for p in pieces} == expected
+            assert len(pieces) == len(expected)
+            sizes = [len(p.shape.squares) for p in pieces]
+            if order == "largest":
+                assert sizes == sorted(sizes, reverse=True)
+            elif order == "smallest":
+                assert sizes == sorted(sizes)
+
+        for player in range(1, 5):
+            assert bk.has_any_move(player) == (bk.count_available_moves(player) > 0)
+        assert bk.has_any_move() == bool(expected)
+
+    bk = random_game(15, 2, 8, 0)
+    with pytest.raises(ValueError):
+        next(bk.iter_available_moves("random"))
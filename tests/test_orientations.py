@@ -0,0 +1,85 @@
+import pytest
+
+from shape_definitions import ShapeKind
+from piece import Piece
+from blokus import Blokus
+from orientations import (
+    SHAPES,
+    ORIENTATIONS,
+    normalize,
+    orientation_index,
+    orientation_piece,
+)
+
+
+def test_orientation_counts() -> None:
+    """Tests that every shape has between one and eight distinct orientations,
+    that symmetric shapes are deduplicated, and that there are 91 orientations
+    in total (the standard number for the 21 Blokus shapes)."""
+    assert len(ORIENTATIONS) == 21
+    for kind, orientations in ORIENTATIONS.items():
+        assert 1 <= len(orientations) <= 8
+        assert len({normalize(o.squares) for o in orientations}) == len(orientations)
+
+    assert len(ORIENTATIONS[ShapeKind.ONE]) == 1
+    assert len(ORIENTATIONS[ShapeKind.LETTER_O]) == 1
+    assert len(ORIENTATIONS[ShapeKind.X]) == 1
+    assert len(ORIENTATIONS[ShapeKind.FIVE]) == 2
+    assert len(ORIENTATIONS[ShapeKind.F]) == 8
+    assert sum(len(o) for o in ORIENTATIONS.values()) == 91
+
+
+def test_orientations_match_pieces() -> None:
+    """Tests that each orientation's offsets are the squares of a Piece built
+    with the same face_up and rotation arguments, and that orientation_index
+    recognizes transformed pieces."""
+    bk = Blokus(1, 5, {(0, 0)})
+    for kind, orientations in ORIENTATIONS.items():
+        for index, orientation in enumerate(orientations):
+            piece = Piece(bk.shapes[kind], orientation.face_up, orientation.rotation)
+            assert sorted(piece.shape.squares) == list(orientation.squares)
+            assert orientation_index(kind, piece.shape.squares) == index
+
+            built = orientation_piece(kind, index, (2, 2))
+            assert built.anchor == (2, 2)
+            assert sorted(built.squares()) == sorted(
+                (2 + r, 2 + c) for r, c in orientation.squares
+            )
+
+
+def test_available_moves_all_orientations() -> None:
+    """Tests that available_moves considers every distinct orientation and
+    never returns two moves covering the same cells."""
+    bk = Blokus(1, 5, {(0, 0)})
+    moves = bk.available_moves()
+    cells = [(move.shape.kind, frozenset(move.squares())) for move in moves]
+    assert len(cells) == len(set(cells))
+
+    # Six of the eight orientations of the "7" shape have a square
+    # in their top-left corner, so only those can cover (0, 0)
+    sevens = [move for move in moves if move.shape.kind == ShapeKind.SEVEN]
+    assert len(sevens) == 6
+    for move in moves:
+        assert bk.legal_to_place(move)
+
+
+def test_shape_registry_is_read_only() -> None:
+    """Tests that the shared shape registry cannot be modified, and that
+    transforming a shape returned by Blokus.shapes (or a Piece built from
+    the registry) leaves the registry untouched."""
+    z_shape = SHAPES[ShapeKind.Z]
+    original = list(z_shape.squares)
+    with pytest.raises(TypeError):
+        z_shape.flip_horizontally()
+    with pytest.raises(AttributeError):
+        z_shape.squares = []
+
+    bk = Blokus(1, 5, {(0, 0)})
+    copied = bk.shapes[ShapeKind.Z]
+    copied.rotate_right()
+    piece = Piece(SHAPES[ShapeKind.Z])
+    piece.set_anchor((2, 2))
+    piece.flip_horizontally()
+
+    assert list(SHAPES[ShapeKind.Z].squares) == original
+    assert set(bk.shapes[ShapeKind.Z].squares) == set(original)
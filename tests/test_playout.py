@@ -0,0 +1,106 @@
+import random
+import sys
+import threading
+
+import pytest
+
+from blokus import Blokus
+from move import Move
+from playout import playout
+
+LAYOUTS = [
+    (2, 11, {(0, 0), (10, 10)}),
+    (3, 8, {(0, 0), (7, 7), (0, 7)}),
+    (4, 20, {(0, 0), (19, 19), (0, 19), (19, 0)}),
+]
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+@pytest.mark.parametrize("seed", range(3))
+def test_playout_follows_the_rules(layout: tuple, seed: int) -> None:
+    """Tests that a playout from any position plays legal moves, retires
+    players only when they have none, and scores the game like Blokus,
+    without changing the game."""
+    num_players, size, starts = layout
+    bk = Blokus(num_players, size, starts)
+    rng = random.Random(seed)
+    for _ in range(seed * 5):
+        moves = bk.legal_move_list()
+        if moves:
+            bk.maybe_place(rng.choice(moves))
+        else:
+            bk.retire()
+    before = bk.position_hash
+
+    record: list = []
+    scores = playout(bk, rng, record)
+    assert bk.position_hash == before
+
+    replay = bk.fork()
+    for move in record:
+        if move is None:
+            assert not replay.has_any_move()
+            replay.retire()
+        else:
+            assert isinstance(move, Move)
+            assert replay.maybe_place(move)
+    assert replay.game_over
+    assert scores[1:] == [replay.get_score(p) for p in range(1, num_players + 1)]
+
+
+def test_playout_is_uniform_over_moves() -> None:
+    """Tests that the first move of a playout is drawn from every legal move
+    (in all orientations), not only some of them."""
+    bk = Blokus(2, 5, {(0, 0), (4, 4)})
+    rng = random.Random(3)
+    seen = set()
+    for _ in range(3000):
+        record: list = []
+        playout(bk, rng, record)
+        seen.add(record[0])
+    assert seen == set(bk.legal_moves())
+
+
+def test_playout_of_finished_game() -> None:
+    """Tests that a playout of a finished game just returns its scores."""
+    bk = Blokus(2, 5, {(0, 0), (4, 4)})
+    while not bk.game_over:
+        bk.retire()
+    assert playout(bk, random.Random(0)) == [0] + [bk.get_score(p) for p in (1, 2)]
+
+
+def test_playouts_in_threads() -> None:
+    """Tests that playouts in several threads, filling in the placement
+    tables of new board sizes together, all follow the rules."""
+    errors: list[BaseException] = []
+
+    def run(size: int, seed: int) -> None:
+        try:
+            bk = Blokus(2, size, {(0, 0), (size - 1, size - 1)})
+            record: list = []
+            scores = playout(bk, random.Random(seed), record)
+            replay = bk.fork()
+            for move in record:
+                if move is None:
+                    replay.retire()
+                else:
+                    assert replay.maybe_place(move)
+            assert scores[1:] == [replay.get_score(p) for p in (1, 2)]
+        except BaseException as error:
+            errors.append(error)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [
+            threading.Thread(target=run, args=(size, seed))
+            for size in range(41, 47)
+            for seed in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert not errors
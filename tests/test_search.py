@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from blokus import Blokus
+from bot import SearchBot, SBot
+from move import Move
+from search import Search, TranspositionTable
+from shape_definitions import ShapeKind
+
+
+def test_search_finds_legal_move_and_leaves_game_unchanged() -> None:
+    """Tests that a fixed-depth search returns a legal move of the largest
+    size available, counts its work, and does not change the game."""
+    bk = Blokus(2, 8, {(0, 0), (7, 7)})
+    search = Search()
+    before = bk.position_hash
+    move = search.search(bk, 60.0, max_depth=2)
+    assert move is not None and move in bk.legal_moves()
+    assert move.size == 5
+    assert bk.position_hash == before
+    assert search.depth == 2
+    assert search.nodes > 0 and search.cutoffs > 0
+
+    bk.maybe_place(move)
+    assert search.search(bk, 60.0, max_depth=2) in bk.legal_moves()
+
+
+def test_search_respects_deadline() -> None:
+    """Tests that a search with no depth limit stops at its deadline and
+    still returns a legal move, on a four-player board."""
+    bk = Blokus(4, 20, {(0, 0), (19, 19), (0, 19), (19, 0)})
+    for rule in ("paranoid", "maxn"):
+        search = Search(rule)
+        move = search.search(bk, 0.2)
+        assert move is not None and move in bk.legal_moves()
+        assert search.seconds < 1.0
+
+    with pytest.raises(ValueError):
+        Search("minimax")
+
+
+def test_transposition_table_replacement() -> None:
+    """Tests that the table has a bounded number of slots, and that a slot
+    keeps the deeper result within a search but any result of a newer
+    search."""
+    table = TranspositionTable(3)
+    move = Move(ShapeKind.ONE, 0, (0, 0))
+    for key in range(10):
+        table.store(key, 1, 1, 0.0, 0, move)
+    assert len(table) == 4
+
+    table.store(16, 1, 3, 1.0, 0, None)
+    table.store(16, 1, 2, 2.0, 0, None)
+    assert table.lookup(16, 1) == (3, 1.0, 0, None)
+    assert table.lookup(16, 2) is None
+    table.generation += 1
+    table.store(16, 1, 2, 2.0, 0, None)
+    assert table.lookup(16, 1) == (2, 2.0, 0, None)
+
+
+def test_search_bot_plays_a_game() -> None:
+    """Tests that a SearchBot plays legal moves through a whole game and
+    reports its search statistics."""
+    bk = Blokus(2, 7, {(0, 0), (6, 6)})
+    rng = random.Random(4)
+    bots = [SearchBot(bk, 1, rng, time_limit=0.05), SBot(bk, 2, rng)]
+    while not bk.game_over:
+        for bot in bots:
+            bot.make_move()
+    stats = bots[0].stats()
+    assert stats["nodes"] > 0 and stats["seconds"] > 0
@@ -0,0 +1,74 @@
+from typing import Any, Optional
+
+import pytest
+
+import tournament
+from tournament import (
+    ELO_BASE,
+    seats,
+    play_tournament,
+    elo_ratings,
+    wilson_interval,
+    report,
+)
+
+
+def test_ratings_and_intervals() -> None:
+    """Tests that Elo ratings average ELO_BASE, order strategies by their
+    results, stay finite for a strategy that wins every game, and that
+    Wilson intervals contain the observed win rate."""
+    bots = ["A", "B", "C"]
+    results = [(("A", "B"), 1.0)] * 6 + [(("B", "C"), 0.5)] * 4
+    results += [(("C", "A"), 0.0)] * 5 + [(("B", "C"), 1.0)] * 2
+    ratings = elo_ratings(bots, results)
+    assert sum(ratings.values()) / 3 == pytest.approx(ELO_BASE)
+    assert ratings["A"] > ratings["B"] > ratings["C"]
+
+    even = elo_ratings(["A", "B"], [(("A", "B"), 1.0), (("B", "A"), 1.0)])
+    assert even["A"] == pytest.approx(even["B"])
+
+    low, high = wilson_interval(7, 10)
+    assert 0 <= low < 0.7 < high <= 1
+    assert wilson_interval(0, 10)[0] == pytest.approx(0, abs=1e-12)
+
+
+def test_tournament_is_reproducible() -> None:
+    """Tests that every ordered pairing plays the requested number of games,
+    that strategies alternate seats on four-player boards, and that results
+    do not depend on the number of workers."""
+    assert seats(("S", "U"), 4) == ["S", "U", "S", "U"]
+    results = play_tournament(["N", "S", "U"], "bot", 2, 5)
+    assert len(results) == 12
+    assert {pairing for pairing, _ in results} == {
+        ("N", "S"), ("N", "U"), ("S", "N"), ("S", "U"), ("U", "N"), ("U", "S")
+    }
+    assert play_tournament(["N", "S", "U"], "bot", 2, 5, workers=2) == results
+    lines = report(["N", "S", "U"], results, 20, 5)
+    assert lines[0].startswith("Bot")
+
+
+def test_tournament_passes_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tests that a tournament hands its bot settings to every game, and
+    that MCTS games with a fixed number of playouts are reproducible."""
+    seen: list[Optional[dict[str, Any]]] = []
+
+    def play(
+        players: list[str],
+        board: str,
+        seed: int,
+        settings: Optional[dict[str, Any]] = None,
+    ) -> list[int]:
+        seen.append(settings)
+        return [1]
+
+    settings = {"playouts": 4, "time_limit": None, "move_time": None}
+    with monkeypatch.context() as patch:
+        patch.setattr(tournament, "play_seated_game", play)
+        results = play_tournament(["N", "S"], "bot", 2, 5, settings=settings)
+    assert seen == [settings] * 4
+    assert [result for _, result in results] == [1.0] * 4
+
+    results = play_tournament(["M", "N"], "bot", 1, 5, settings={"playouts": 4})
+    assert play_tournament(
+        ["M", "N"], "bot", 1, 5, workers=2, settings={"playouts": 4}
+    ) == results
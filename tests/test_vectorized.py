@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+
+from shape_definitions import ShapeKind
+from move import Move
+from orientations import ORIENTATIONS
+from test_movegen import random_game
+
+np = pytest.importorskip("numpy")
+
+
+def test_legal_anchor_mask_matches_legal_to_place() -> None:
+    """Tests that legal_anchor_mask marks exactly the placements of an
+    orientation that legal_to_place accepts, for every anchor on the board,
+    and is all False for a shape the player has already played."""
+    for seed, turns in [(5, 0), (6, 9), (7, 21)]:
+        bk = random_game(seed, 4, 10, turns)
+        if bk.game_over:
+            continue
+        player = bk.curr_player
+        for kind in [ShapeKind.ONE, ShapeKind.L, ShapeKind.F, ShapeKind.X]:
+            if kind not in bk.remaining_shapes(player):
+                continue
+            for index, o in enumerate(ORIENTATIONS[kind]):
+                legal = bk.legal_anchor_mask(kind, index, player)
+                assert legal.shape == (10, 10)
+                for i in range(10):
+                    for j in range(10):
+                        move = Move(kind, index, (i - o.min_row, j - o.min_col))
+                        assert legal[i, j] == bk.legal_to_place(move)
+
+    bk = random_game(8, 2, 8, 1)
+    played = bk._last_moves[1]
+    assert played is not None
+    assert not bk.legal_anchor_mask(played, 0, 1).any()
+    with pytest.raises(ValueError):
+        bk.legal_anchor_mask(ShapeKind.X, 1, 1)
+
+
+def test_vectorized_moves_match_bitboard_moves() -> None:
+    """Tests that the NumPy move generator finds the same moves as the
+    bitboard generator over random two- and four-player games, including
+    on the 20x20 classic board."""
+    for seed, players, size, turns in [(1, 2, 7, 4), (2, 2, 14, 10), (3, 4, 20, 30)]:
+        bk = random_game(seed, players, size, turns)
+        while not bk.game_over:
+            bk.vectorized = True
+            vectorized = bk.legal_moves()
+            bk.vectorized = False
+            assert vectorized == bk.legal_moves()
+            if not vectorized:
+                bk.retire()
+                continue
+            bk.maybe_place(min(vectorized, key=lambda m: m.encode()))
+
+
+def test_tables_are_built_once_across_threads(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tests that threads generating moves together for the first time
+    build the orientation tables only once."""
+    import vectorized
+
+    monkeypatch.setattr(vectorized, "_ROWS", [])
+    monkeypatch.setattr(vectorized, "_FIRST_ROW", {})
+    monkeypatch.setattr(vectorized, "_FOOTPRINTS", None)
+    vectorized._selection.cache_clear()
+    threads = [threading.Thread(target=vectorized._footprints) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    total = sum(len(orientations) for orientations in ORIENTATIONS.values())
+    assert len(vectorized._ROWS) == total
+    assert vectorized._FOOTPRINTS.shape[0] == total
+    vectorized._selection.cache_clear()
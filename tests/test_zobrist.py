@@ -0,0 +1,56 @@
+import random
+
+from shape_definitions import ShapeKind
+from piece import Piece
+from blokus import Blokus
+from zobrist import position_hash, zobrist_keys
+
+
+def test_incremental_hash_matches_recomputation() -> None:
+    """Plays random games with retirements and checks after every move,
+    and after every undo, that the incrementally maintained hash equals
+    the hash recomputed from scratch."""
+    rng = random.Random(9)
+    for num_players in (2, 4):
+        bk = Blokus(num_players, 10, {(0, 0), (9, 9), (0, 9), (9, 0)})
+        assert bk.position_hash == position_hash(bk)
+        hashes = [bk.position_hash]
+        while not bk.game_over:
+            moves = list(bk.available_moves())
+            if moves and rng.random() > 0.05:
+                assert bk.maybe_place(rng.choice(moves))
+            else:
+                bk.retire()
+            assert bk.position_hash == position_hash(bk)
+            hashes.append(bk.position_hash)
+        assert len(set(hashes)) == len(hashes)
+
+        for expected in reversed(hashes[:-1]):
+            bk.undo()
+            assert bk.position_hash == expected == position_hash(bk)
+
+
+def test_hash_is_canonical() -> None:
+    """Tests that the same position reached in two different games, and
+    via two different move orders, has the same hash."""
+    first = Blokus(2, 8, {(0, 0), (7, 7), (1, 2)})
+    second = Blokus(2, 8, {(0, 0), (7, 7), (1, 2)})
+    assert first.position_hash == second.position_hash
+    assert zobrist_keys(8) is zobrist_keys(8)
+
+    def place(bk: Blokus, kind: ShapeKind, anchor: tuple[int, int]) -> None:
+        piece = Piece(bk.shapes[kind])
+        piece.set_anchor(anchor)
+        assert bk.maybe_place(piece)
+
+    place(first, ShapeKind.ONE, (0, 0))
+    assert first.position_hash != second.position_hash
+    place(first, ShapeKind.ONE, (7, 7))
+    place(first, ShapeKind.THREE, (1, 2))
+
+    place(second, ShapeKind.THREE, (1, 2))
+    place(second, ShapeKind.ONE, (7, 7))
+    place(second, ShapeKind.ONE, (0, 0))
+
+    assert first.grid == second.grid
+    assert first.position_hash == second.position_hash